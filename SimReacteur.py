@@ -14,35 +14,747 @@ import numpy as np
 from scipy.integrate import solve_ivp
 
 # Local module imports
-from odefunction import odefunction
+import constants as c
+import odejit
+from odefunction import odefunction, jacobian, kinetics
 
 
 # %% [1] Main Code
-def calculConcentrationsIVP(x_int, y0):
-    sol = solve_ivp(odefunction, x_int, y0, dense_output=True, rtol=0.5e-6)
-    return [sol.t, sol.y]
+# Butcher tableaux (A, b, c) of the explicit Runge-Kutta methods available in
+# calculConcentrationsRK().
+BUTCHER = {
+    'euler': ([[0]], [1], [0]),
+    'heun': ([[0, 0], [1, 0]], [1/2, 1/2], [0, 1]),
+    'midpoint': ([[0, 0], [1/2, 0]], [0, 1], [0, 1/2]),
+    'ralston': ([[0, 0], [2/3, 0]], [1/4, 3/4], [0, 2/3]),
+    'rk3': ([[0, 0, 0], [1/2, 0, 0], [-1, 2, 0]], [1/6, 2/3, 1/6],
+            [0, 1/2, 1]),
+    'rk4': ([[0, 0, 0, 0], [1/2, 0, 0, 0], [0, 1/2, 0, 0], [0, 0, 1, 0]],
+            [1/6, 1/3, 1/3, 1/6], [0, 1/2, 1/2, 1])}
 
 
-def calculConcentrationsEuler(x_int, y0, step=5e-8):
+class Solution:
+    """Solution of the differential equation.
+
+    Returned by the integrators of this module. It holds the recorded steps
+    and evaluates the state, and the quantities derived from it, at any
+    position on demand. It unpacks as the arrays returned by the
+    integrators: ``x, y = calculConcentrationsIVP(...)``.
+
+    Parameters
+    ----------
+    x : array, shape(n)
+        Positions of the steps.
+    y : array, shape(8, n) or shape(8, N, n)
+        States at the steps.
+    interpolant : function, *optional*
+        Dense interpolant ``interpolant(z)`` of the solution (the
+        ``OdeSolution`` of ``solve_ivp``). The default is the linear
+        interpolation between the steps.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    extra : tuple, *optional*
+        Values following ``x`` and ``y`` when the solution is unpacked.
+    """
+
+    __slots__ = ('x', 'y', 'interpolant', 'p', 'extra')
+
+    def __init__(self, x, y, interpolant=None, p=None, extra=()):
+        self.x = x
+        self.y = y
+        self.interpolant = interpolant
+        self.p = c.DEFAULT if p is None else p
+        self.extra = tuple(extra)
+
+    def __iter__(self):
+        return iter((self.x, self.y) + self.extra)
+
+    def __len__(self):
+        return 2 + len(self.extra)
+
+    def __getitem__(self, i):
+        return list(self)[i]
+
+    def __repr__(self):
+        if self.x.size == 0:
+            return 'Solution(0 steps)'
+        return ('Solution(' + str(self.x.size) + ' steps, z = ['
+                + str(self.x[0]) + ', ' + str(self.x[-1]) + '], '
+                + ('dense' if self.interpolant is not None else 'linear')
+                + ')')
+
+    @property
+    def outlet(self):
+        """State at the last step."""
+        return self.y[..., -1]
+
+    @property
+    def ts(self):
+        """Positions of the steps of the solver (see
+        ``root.denseRoots()``)."""
+        if self.interpolant is not None and hasattr(self.interpolant, 'ts'):
+            return self.interpolant.ts
+        return self.x
+
+    def __call__(self, z):
+        """States at positions.
+
+        Parameters
+        ----------
+        z : numeric or array, shape(m)
+            Positions.
+
+        Returns
+        -------
+        array, shape(8) or shape(8, m)
+            Returns the states at ``z`` (shape(8, N) or shape(8, N, m) for
+            a batch of states).
+        """
+        if np.size(z) == 0:
+            return np.empty(self.y.shape[:-1] + (0,))
+        if self.interpolant is not None:
+            return self.interpolant(z)
+        x = self.x
+        if x.size == 1:
+            # A single point (see the callback of _collect()): constant.
+            i = np.zeros(np.shape(z), dtype=int)
+            return self.y[..., i]
+        i = np.clip(np.searchsorted(x, z, side='right') - 1, 0, x.size - 2)
+        w = (z - x[i]) / (x[i + 1] - x[i])
+        return self.y[..., i] * (1 - w) + self.y[..., i + 1] * w
+
+    def states(self, z=None):
+        """States at positions, at the steps if ``z`` is not given."""
+        return self.y if z is None else self(z)
+
+    def partialPressures(self, z=None):
+        """Partial pressures of CH4, H2O, H2, CO and CO2.
+
+        Parameters
+        ----------
+        z : numeric or array, shape(m), *optional*
+            Positions. The default is the steps.
+
+        Returns
+        -------
+        array, shape(5, ...)
+            Returns the partial pressures (see ``odefunction.kinetics()``).
+        """
+        C = self.states(z)
+        return C[7] * C[:5] / C[:5].sum(axis=0)
+
+    def purity(self, z=None):
+        """Purity of the hydrogen, on a dry basis.
+
+        Parameters
+        ----------
+        z : numeric or array, shape(m), *optional*
+            Positions. The default is the steps.
+
+        Returns
+        -------
+        array
+            Returns the mole fraction of H2 in the gas without H2O.
+        """
+        C = self.states(z)
+        return C[2] / (C[0] + C[2] + C[3] + C[4])
+
+    def rates(self, z=None):
+        """Speeds of the reactions 1, 2 and 3.
+
+        Parameters
+        ----------
+        z : numeric or array, shape(m), *optional*
+            Positions. The default is the steps.
+
+        Returns
+        -------
+        array, shape(3, ...)
+            Returns the values of ``odefunction.R()`` for the three
+            reactions.
+        """
+        return kinetics(self.states(z), self.p).R
+
+
+def calculConcentrationsIVP(x_int, y0, method='RK45', rtol=0.5e-6, p=None,
+                            events=None, full_output=False, backend='numpy',
+                            dense_output=True, **kwargs):
+    """Solution of the differential equation with scipy's solve_ivp.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : array, shape(8)
+        Initial state.
+    method : string, *default* ``RK45``
+        Method of ``solve_ivp``. ``Radau``, ``BDF`` and ``LSODA`` are given
+        the analytic Jacobian ``odefunction.jacobian``.
+    rtol : numeric, *default* 0.5e-6
+        Relative tolerance.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    events : function or list, *optional*
+        Events to locate during the integration, see ``threshold()``.
+    full_output : bool, *default* False
+        Whether to also return the result of ``solve_ivp``.
+    backend : string, *default* ``numpy``
+        ``numpy`` or ``numba`` to evaluate odefunction with its compiled
+        version (see ``odejit.py``).
+    dense_output : bool, *default* True
+        Whether to build the dense interpolant of the solution. Without it,
+        the solution is interpolated linearly between the steps, which
+        saves memory and time when only the steps (or the outlet) are
+        needed.
+    **kwargs : dict, *optional*
+        Extra parameters of ``solve_ivp``.
+
+    Returns
+    -------
+    Solution
+        Returns the solution, which unpacks as: first value the array of
+        the positions of the steps, second value the array of the states,
+        shape(8, n). If ``full_output`` is ``True``, third value is the
+        result of ``solve_ivp``, with the events (``t_events`` and
+        ``y_events``).
+        Returns ``None`` if an incorrect backend is passed through.
+    """
+    fun = _odefunction(backend)
+    if fun is None:
+        return None
+    # The parameters (constants.Parameters) are resolved once for the whole
+    # integration and handed to odefunction at every evaluation.
+    if p is None:
+        p = c.DEFAULT
+    # The implicit (stiff) solvers are given the analytic Jacobian of
+    # odefunction instead of approximating it by finite differences.
+    if method in ('Radau', 'BDF', 'LSODA'):
+        kwargs.setdefault('jac', jacobian)
+    # odefunction accepts a batch of states, which lets the solvers build a
+    # finite-difference Jacobian in a single call when none is given.
+    sol = solve_ivp(fun, x_int, y0, method=method, dense_output=dense_output,
+                    rtol=rtol, vectorized=True, args=(p,), events=events,
+                    **kwargs)
+    return Solution(sol.t, sol.y, sol.sol, p, (sol,) if full_output else ())
+
+
+def threshold(value, index=None, quantity=None, direction=0,
+              terminal=False):
+    """Event of a threshold crossing.
+
+    Parameters
+    ----------
+    value : numeric
+        Value of the threshold.
+    index : int, *optional*
+        Index of the state to follow (for example 5 for the conversion X).
+    quantity : function, *optional*
+        Derived quantity ``quantity(z, y, p)`` to follow instead, for
+        example ``moleFraction('H2')``.
+    direction : numeric, *default* 0
+        Only crossings from below (positive) or from above (negative), or
+        both (0).
+    terminal : bool, *default* False
+        Whether to stop the integration at the first crossing.
+
+    Returns
+    -------
+    function
+        Returns the event function ``event(z, y, p=None)``, to be passed to
+        ``calculConcentrationsIVP(..., events=...)`` or to
+        ``root.denseRoots()``.
+        Returns ``None`` if neither ``index`` nor ``quantity`` is given.
+    """
+    if quantity is None and index is None:
+        print("Error: threshold() needs an index or a quantity.")
+        return None
+
+    def event(z, y, p=None):
+        if quantity is None:
+            return y[index] - value
+        return quantity(z, y, c.DEFAULT if p is None else p) - value
+
+    event.direction = direction
+    event.terminal = terminal
+    return event
+
+
+def moleFraction(name):
+    """Mole fraction of a gas, as a derived quantity.
+
+    Parameters
+    ----------
+    name : string
+        ``CH4``, ``H2O``, ``H2``, ``CO`` or ``CO2``.
+
+    Returns
+    -------
+    function
+        Returns the function ``quantity(z, y, p)`` of the mole fraction of
+        ``name`` (see ``threshold()``).
+        Returns ``None`` if an incorrect parameter is passed through.
+    """
+    species = ['CH4', 'H2O', 'H2', 'CO', 'CO2']
+    if str(name) not in species:
+        print("Error: value for '" + str(name) + "' not found in "
+              "moleFraction().")
+        return None
+    i = species.index(str(name))
+
+    def quantity(z, y, p):
+        return y[i] / np.sum(y[:5], axis=0)
+
+    return quantity
+
+
+def calculConcentrationsEuler(x_int, y0, step=5e-8, p=None, every=1,
+                              x_out=None, callback=None, chunk=4096,
+                              backend='numpy'):
+    """Solution of the differential equation with Euler's method.
+
+    The state is advanced with the explicit Euler method, only the current
+    state is kept in memory and the points to return are recorded as the
+    integration goes (see ``streamConcentrationsEuler()``).
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : numeric or array, shape(8) or shape(8, N)
+        Initial state. A batch of N states is advanced in lock-step.
+    step : numeric, *default* 5e-8
+        Size of the steps.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    every : int, *default* 1
+        Records one step every ``every`` steps (and the last one).
+    x_out : array, *optional*
+        Positions to record instead, see ``streamConcentrationsEuler()``.
+    callback : function, *optional*
+        If given, every chunk ``[x, y]`` is handed to ``callback(x, y)``
+        instead of being kept, and only the last recorded point is returned.
+    chunk : int, *default* 4096
+        Maximum number of points in a chunk.
+    backend : string, *default* ``numpy``
+        ``numpy`` or ``numba``, see ``streamConcentrationsEuler()``.
+
+    Returns
+    -------
+    Solution
+        Returns the solution, which unpacks as: first value the array of
+        the recorded positions, shape(n), second value the array of the
+        recorded states, shape(8, n) (or shape(8, N, n) for a batch of
+        states).
+        Returns ``None`` if an incorrect backend is passed through.
+    """
+    stream = streamConcentrationsEuler(x_int, y0, step, p, every, x_out,
+                                       chunk, backend)
+    if stream is None:
+        return None
+    return _collect(stream, callback, p, y0)
+
+
+def streamConcentrationsEuler(x_int, y0, step=5e-8, p=None, every=1,
+                              x_out=None, chunk=4096, backend='numpy'):
+    """Solution of the differential equation with Euler's method, by chunks.
+
+    Generator version of ``calculConcentrationsEuler()``: the memory used
+    does not depend on the number of steps.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : numeric or array, shape(8) or shape(8, N)
+        Initial state. A batch of N states is advanced in lock-step.
+    step : numeric, *default* 5e-8
+        Size of the steps.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    every : int, *default* 1
+        Records one step every ``every`` steps (and the last one).
+    x_out : array, *optional*
+        Positions to record instead. The state at each of them is linearly
+        interpolated between the two steps around it; positions outside of
+        the steps are ignored.
+    chunk : int, *default* 4096
+        Maximum number of points in a chunk.
+    backend : string, *default* ``numpy``
+        ``numpy`` or ``numba``. With ``numba``, odefunction is evaluated with
+        its compiled version (see ``odejit.py``) and, for a single state
+        without ``x_out``, the whole loop is compiled. If Numba is not
+        installed, ``numpy`` is used instead.
+
+    Yields
+    ------
+    array
+        First value is the array of the positions of the chunk, shape(m).
+        Second value is the array of the states of the chunk, shape(8, m)
+        (or shape(8, N, m) for a batch of states).
+        Returns ``None`` if an incorrect backend is passed through.
+    """
+    # Parameters of the reactor (constants.Parameters), resolved once.
+    if p is None:
+        p = c.DEFAULT
+    fun = _odefunction(backend)
+    if fun is None:
+        return None
+    if fun is odejit.odefunction and x_out is None and np.shape(y0) == (8,):
+        return odejit.stream(x_int, y0, step, every, 'euler', p, chunk)
+
+    def euler(x, y, h):
+        # Equation from the course for an approximation of the solution:
+        # x_i+1 = x_i + h * f(x_i, t_i)
+        return y + h*fun(x, y, p)
+
+    return _march(euler, x_int, y0, step, every, x_out, chunk)
+
+
+def calculConcentrationsRK(x_int, y0, step=1e-5, tableau='rk4', p=None,
+                           every=1, x_out=None, callback=None, chunk=4096,
+                           backend='numpy'):
+    """Solution of the differential equation with a Runge-Kutta method.
+
+    Explicit Runge-Kutta method with fixed steps, given by its Butcher
+    tableau. Takes the same parameters and returns the same arrays as
+    ``calculConcentrationsEuler()``.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : numeric or array, shape(8) or shape(8, N)
+        Initial state. A batch of N states is advanced in lock-step.
+    step : numeric, *default* 1e-5
+        Size of the steps.
+    tableau : string or tuple, *default* ``rk4``
+        Name of a method of ``BUTCHER`` (``euler``, ``heun``, ``midpoint``,
+        ``ralston``, ``rk3`` or ``rk4``) or its Butcher tableau ``(A, b,
+        c)``, ``A`` being strictly lower triangular.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    every, x_out, callback, chunk, backend
+        See ``calculConcentrationsEuler()``. With ``numba``, the whole loop
+        is compiled for the ``euler`` and ``rk4`` tableaux.
+
+    Returns
+    -------
+    Solution
+        Returns the solution, see ``calculConcentrationsEuler()``.
+        Returns ``None`` if an incorrect tableau or backend is passed
+        through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    fun = _odefunction(backend)
+    if fun is None:
+        return None
+    if isinstance(tableau, str):
+        if tableau.lower() not in BUTCHER:
+            print("Error: method '" + tableau + "' not found in BUTCHER.")
+            return None
+        if (fun is odejit.odefunction and tableau.lower() in ('euler', 'rk4')
+                and x_out is None and np.shape(y0) == (8,)):
+            return _collect(odejit.stream(x_int, y0, step, every,
+                                          tableau.lower(), p, chunk),
+                            callback, p, y0)
+        tableau = BUTCHER[tableau.lower()]
+    return _collect(_march(_rk(tableau, fun, p), x_int, y0, step, every,
+                           x_out, chunk), callback, p, y0)
+
+
+def calculConcentrationsHeun(x_int, y0, step=1e-5, **kwargs):
+    """Solution of the differential equation with Heun's method.
+
+    Second order method, see ``calculConcentrationsRK()``.
+    """
+    return calculConcentrationsRK(x_int, y0, step, 'heun', **kwargs)
+
+
+def calculConcentrationsRK4(x_int, y0, step=1e-5, **kwargs):
+    """Solution of the differential equation with the classic RK4 method.
+
+    Fourth order method, see ``calculConcentrationsRK()``.
+    """
+    return calculConcentrationsRK(x_int, y0, step, 'rk4', **kwargs)
+
+
+def calculConcentrationsImplicit(x_int, y0, step=1e-4, method='bdf2', p=None,
+                                 jac=None, rtol=1e-8, atol=1e-10, max_i=10,
+                                 every=1, x_out=None, callback=None,
+                                 chunk=4096, history=False):
+    """Solution of the differential equation with an implicit method.
+
+    Fixed steps of the backward Euler method or of the second order
+    backward differentiation formula (BDF2, started with one backward Euler
+    step). The implicit equation of every step is solved with Newton's
+    method, which keeps the integration stable with steps much larger than
+    what the explicit methods need.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : numeric or array, shape(8) or shape(8, N)
+        Initial state. A batch of N states is advanced in lock-step.
+    step : numeric, *default* 1e-4
+        Size of the steps.
+    method : string, *default* ``bdf2``
+        ``euler`` (backward Euler) or ``bdf2``.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    jac : function or string, *optional*
+        Jacobian ``jac(x, y, p)`` of odefunction used by Newton's method,
+        ``fd`` for finite differences. The default is
+        ``odefunction.jacobian``.
+    rtol, atol : numeric, *default* 1e-8 and 1e-10
+        Newton's method stops when every correction is smaller than
+        ``atol + rtol * abs(y)``.
+    max_i : int, *default* 10
+        Maximum number of Newton itirations per step, at least 1. If it is
+        reached, the step is counted as failed and the last approximation
+        is kept. If the Jacobian of Newton's method is singular or an
+        approximation is not finite, the step also fails and the last
+        finite approximation is kept.
+    every, x_out, callback, chunk
+        See ``calculConcentrationsEuler()``.
+    history : bool, *default* False
+        Whether to keep the number of itirations and the failure of every
+        step (the memory used then grows with the number of steps).
+
+    Returns
+    -------
+    Solution
+        Returns the solution, which unpacks as: first value the array of
+        the recorded positions, shape(n), second value the array of the
+        recorded states, shape(8, n) (or shape(8, N, n) for a batch of
+        states), third value a dict with the number of steps (``steps``),
+        the total and maximum numbers of Newton itirations of a step
+        (``iterations`` and ``max_iterations``), the number of steps which
+        took k itirations (``histogram[k]``, shape(max_i + 1)) and the
+        number of failed steps (``failures``), and, if ``history`` is True,
+        for every step, the number of itirations (``step_iterations``) and
+        whether it failed (``failed``).
+        Returns ``None`` if an incorrect method or ``max_i`` is passed
+        through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    if str(method).lower() not in ('euler', 'bdf2'):
+        print("Error: method '" + str(method) + "' not found in "
+              "calculConcentrationsImplicit().")
+        return None
+    if not max_i >= 1:
+        print("Error: max_i must be at least 1 in "
+              "calculConcentrationsImplicit().")
+        return None
+    if jac is None:
+        jac = jacobian
+    elif jac == 'fd':
+        jac = _jacobianFD
+    bdf2 = str(method).lower() == 'bdf2'
+    # Totals over the steps, in constant memory.
+    stats = {'steps': 0, 'iterations': 0, 'max_iterations': 0,
+             'histogram': np.zeros(int(max_i) + 1, dtype=int),
+             'failures': 0}
+    iterations = []
+    failed = []
+    # Previous state, used by BDF2.
+    previous = []
+
+    def implicit(x, y, h):
+        # Equation to solve for the next state (y1):
+        # backward Euler:  y1 - y - h*f(x + h, y1) = 0
+        # BDF2:            y1 - 4/3*y + 1/3*y_-1 - 2/3*h*f(x + h, y1) = 0
+        if bdf2 and previous:
+            rhs = 4/3*y - 1/3*previous[0]
+            beta = 2/3*h
+        else:
+            rhs = y
+            beta = h
+        previous[:] = [y]
+        y1 = y.copy()
+        I_ = np.eye(y.shape[0]).reshape((y.shape[0],)*2 + (1,)*(y.ndim - 1))
+        converged = False
+        for i in range(1, max_i + 1):
+            with np.errstate(all='ignore'):
+                G = y1 - rhs - beta*odefunction(x + h, y1, p)
+                JG = I_ - beta*jac(x + h, y1, p)
+            try:
+                dy = _solve(JG, -G)
+            except np.linalg.LinAlgError:
+                # Singular Jacobian: the step fails.
+                break
+            if not np.all(np.isfinite(y1 + dy)):
+                # The last finite approximation is kept.
+                break
+            y1 = y1 + dy
+            if np.all(np.abs(dy) <= atol + rtol*np.abs(y1)):
+                converged = True
+                break
+        stats['steps'] += 1
+        stats['iterations'] += i
+        stats['max_iterations'] = max(stats['max_iterations'], i)
+        stats['histogram'][i] += 1
+        stats['failures'] += not converged
+        if history:
+            iterations.append(i)
+            failed.append(not converged)
+        return y1
+
+    x, y = _collect(_march(implicit, x_int, y0, step, every, x_out, chunk),
+                    callback, p, y0)
+    if history:
+        stats['step_iterations'] = np.array(iterations, dtype=int)
+        stats['failed'] = np.array(failed, dtype=bool)
+    return Solution(x, y, p=p, extra=(stats,))
+
+
+def _rk(tableau, fun, p):
+    # Function advancing a state by one step of the Runge-Kutta method of a
+    # Butcher tableau (A, b, c), see calculConcentrationsRK().
+    A, b, c_ = tableau
+
+    def rk(x, y, h):
+        # Stages of the method: k_i = f(x + c_i*h, y + h*sum(A_ij*k_j)).
+        k = []
+        for i in range(len(b)):
+            yi = y
+            for j in range(i):
+                if A[i][j] != 0:
+                    yi = yi + h*A[i][j]*k[j]
+            k.append(fun(x + c_[i]*h, yi, p))
+        # y_i+1 = y_i + h * sum(b_i*k_i)
+        for i in range(len(b)):
+            if b[i] != 0:
+                y = y + h*b[i]*k[i]
+        return y
+
+    return rk
+
+
+def _odefunction(backend):
+    # Function of the differential equation evaluated by a backend, None if
+    # the backend does not exist.
+    if str(backend).lower() == 'numba':
+        if odejit.AVAILABLE:
+            return odejit.odefunction
+        print("Warning: numba is not installed, backend 'numpy' is used "
+              "instead.")
+        return odefunction
+    if str(backend).lower() == 'numpy':
+        return odefunction
+    print("Error: backend '" + str(backend) + "' not found, use 'numpy' or "
+          "'numba'.")
+    return None
+
+
+def _jacobianFD(x, y, p):
+    # Jacobian of odefunction by forward finite differences, for a single
+    # state or a batch of states.
+    f0 = odefunction(x, y, p)
+    J = np.zeros((y.shape[0],) + y.shape)
+    for j in range(y.shape[0]):
+        h = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y[j]), 1e-3)
+        yj = y.copy()
+        yj[j] = y[j] + h
+        J[:, j] = (odefunction(x, yj, p) - f0) / h
+    return J
+
+
+def _solve(A, b):
+    # Solves A x = b for a single system, A shape(n, n), or for a batch of
+    # systems, A shape(n, n, N) and b shape(n, N).
+    if A.ndim == 2:
+        return np.linalg.solve(A, b)
+    return np.linalg.solve(np.moveaxis(A, -1, 0),
+                           np.moveaxis(b, -1, 0)[..., None])[..., 0].T
+
+
+def _collect(stream, callback=None, p=None, y0=None):
+    # Solution from the chunks [x, y] of a stream, concatenated, or handed
+    # to callback(x, y) with only the last point kept. Empty (shape(0) and
+    # shape(8, 0), or the shape of y0) if no point is recorded.
+    xs = []
+    ys = []
+    for x, y in stream:
+        if callback is None:
+            xs.append(x)
+            ys.append(y)
+        elif x.size:
+            callback(x, y)
+            xs = [x[-1:]]
+            ys = [y[..., -1:]]
+    if not xs:
+        shape = (8,) if y0 is None else np.shape(y0)
+        return Solution(np.empty(0), np.empty(shape + (0,)), p=p)
+    return Solution(np.concatenate(xs), np.concatenate(ys, axis=-1), p=p)
+
+
+def _march(advance, x_int, y0, step, every=1, x_out=None, chunk=4096,
+           start=0, stop=None):
+    # Generator advancing the state y0 with fixed steps, advance(x, y, step)
+    # returning the next state, on the same grid as
+    # np.arange(x_int[0], x_int[1], step). Only the current state and a chunk
+    # of recorded points are kept in memory. With start and stop, only the
+    # steps [start, stop) of the grid are done, y0 being the state at the
+    # point start (see checkpoint.py).
     # Generalisation to work with a system of equations:
     # Makes sure that y0 is a numpy array.
     if type(y0) is int:
-        y0 = np.array([y0])
+        y = np.array([y0], dtype=float)
     else:
-        y0 = np.array(y0)
-    # Initiates the x-axis array.
-    x = np.arange(x_int[0], x_int[1], step)
-    # The number of itirations to do (x's size).
-    n = x.size
-    # Initiates the y-axis array (the solution).
-    # The matrix is created in it's transposed state to optimise for speed.
-    y = np.zeros((n, y0.shape[0]))
-    y[0] = y0
-    # Loop ends at n - 1 beacause y[0] is already initialised.
-    for i in range(n - 1):
-        # Equation from the course for an approximation of the solution:
-        # x_i+1 = x_i + h * f(x_i, t_i)
-        y[i + 1] = y[i] + step*odefunction(x[i], y[i])
-    # Returns the array of the x-axis (x) and the transposed of the y-axis (y).
-    # See why above.
-    return [x, y.T]
+        y = np.array(y0, dtype=float)
+    # The number of points of the grid (the size of np.arange()).
+    n = max(int(np.ceil((x_int[1] - x_int[0]) / step)), 1)
+    if stop is None:
+        stop = n
+    x = x_int[0] + start*step if start else x_int[0]
+    if x_out is not None:
+        x_out = np.sort(np.asarray(x_out, dtype=float))
+        # Index of the next position of x_out to record.
+        j = np.searchsorted(x_out, x)
+    # Buffer of the recorded points. The matrix is created in it's
+    # transposed state to optimise for speed.
+    xb = np.empty(chunk)
+    yb = np.empty((chunk,) + y.shape)
+    m = 0
+    for i in range(start, stop):
+        last = i == n - 1
+        if not last:
+            x_next = x_int[0] + (i + 1)*step
+            y_next = advance(x, y, step)
+        if x_out is None:
+            if i % every == 0 or last:
+                xb[m] = x
+                yb[m] = y
+                m += 1
+        else:
+            # Records the positions of x_out in [x, x_next) (or x itself for
+            # the last point) by linear interpolation.
+            while j < x_out.size and (x_out[j] < x_next if not last
+                                      else x_out[j] == x):
+                w = 0 if last else (x_out[j] - x) / (x_next - x)
+                xb[m] = x_out[j]
+                yb[m] = y if last else (1 - w)*y + w*y_next
+                m += 1
+                j += 1
+                if m == chunk:
+                    yield [xb.copy(), np.moveaxis(yb, 0, -1).copy()]
+                    m = 0
+        if m == chunk:
+            yield [xb.copy(), np.moveaxis(yb, 0, -1).copy()]
+            m = 0
+        if not last:
+            x = x_next
+            y = y_next
+    if m > 0:
+        # The x-axis is moved last so that a batch of reactors gives a
+        # shape(8, N, m).
+        yield [xb[:m].copy(), np.moveaxis(yb[:m], 0, -1).copy()]
@@ -0,0 +1,316 @@
+"""Module to benchmark the reactor model.
+
+This module contains a suite of benchmarks of the reactor model, to follow
+its performance: the latency of odefunction, the time of the integrators,
+the throughput of Euler's method, the cost of the root finding methods and
+the peak memory of a simulation. The results can be stored as a baseline
+(JSON) and compared to it, the regressions beyond a threshold being flagged.
+
++----------------+-----------------------------------------------------------+
+| function       | description                                               |
++================+===========================================================+
+| ``run()``      | Runs the benchmarks and returns their metrics.            |
++----------------+-----------------------------------------------------------+
+| ``compare()``  | Returns the metrics that regressed compared to a          |
+|                | baseline.                                                 |
++----------------+-----------------------------------------------------------+
+| ``save()``     | Stores results (as a baseline) in a JSON file.            |
++----------------+-----------------------------------------------------------+
+| ``load()``     | Loads results from a JSON file.                           |
++----------------+-----------------------------------------------------------+
+
+From the command line::
+
+    python benchmark.py --save            # stores the baseline
+    python benchmark.py --threshold 0.2   # compares to it
+
+The second command exits with the status 1 if a metric regressed by more
+than 20 %. Times depend on the machine: a baseline is only meaningful on the
+machine it was recorded on.
+
+Credits
+-------
+Created on Sun Oct 18 04:44:56 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+# Third-party librairy imports.
+import numpy as np
+import scipy
+
+# Local module imports
+import constants as c
+import root
+from odefunction import odefunction
+from SimReacteur import calculConcentrationsEuler, calculConcentrationsIVP
+
+
+# %% [1] Main Code
+# Initial state and interval of the benchmarked simulations.
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+X_INT = [0, 0.29]
+
+# Metrics for which a higher value is better; for all of the others (times,
+# evaluations and memory) a lower value is better.
+HIGHER = {'steps_per_s', 'states_per_s'}
+
+# Metrics compared to the baseline. The other ones (the number of steps,
+# the roots, ...) are only given for information.
+TRACKED = {'time', 'time_per_call', 'time_per_state', 'states_per_s',
+           'steps_per_s', 'nfev', 'peak_bytes'}
+
+
+def _best(function, repeat):
+    # Shortest time out of `repeat` calls of function(), with its last result.
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def _rhs(repeat):
+    # Latency of a single evaluation of odefunction.
+    number = 1000
+    t, _ = _best(lambda: [odefunction(0, Y0) for _ in range(number)], repeat)
+    return {'time_per_call': t / number}
+
+
+def _rhsBatch(repeat):
+    # Throughput of odefunction on a batch of states.
+    n = 10000
+    Y = Y0[:, None] * np.linspace(0.9, 1.1, n)
+    t, _ = _best(lambda: odefunction(0, Y), repeat)
+    return {'time_per_state': t / n, 'states_per_s': n / t}
+
+
+def _ivp(method):
+    # Time of a full solution with a method of solve_ivp.
+    def benchmark(repeat):
+        t, result = _best(lambda: calculConcentrationsIVP(
+            X_INT, Y0, method=method, full_output=True), repeat)
+        sol = result[2]
+        return {'time': t, 'nfev': int(sol.nfev), 'njev': int(sol.njev),
+                'steps': len(sol.t) - 1}
+    return benchmark
+
+
+def _euler(repeat):
+    # Throughput of Euler's method, in steps per second.
+    step = 1e-5
+    t, result = _best(lambda: calculConcentrationsEuler(
+        X_INT, Y0, step=step, every=1000), repeat)
+    steps = int(np.ceil((X_INT[1] - X_INT[0]) / step)) - 1
+    return {'time': t, 'steps': steps, 'steps_per_s': steps / t}
+
+
+def _root(method, **kwargs):
+    # Cost of finding the temperature at which the equilibrium constant of
+    # the reaction 1 is 1, in evaluations of the function.
+    def fun(T):
+        return c.DEFAULT.eq(T)[0] - 1
+
+    def benchmark(repeat):
+        t, result = _best(lambda: method(fun, 850, 1000, 1e-6, **kwargs),
+                          repeat)
+        return {'time': t, 'nfev': result.nfev, 'root': result.root}
+    return benchmark
+
+
+def _memory(function):
+    # Peak memory allocated by a simulation.
+    def benchmark(repeat):
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {'peak_bytes': peak}
+    return benchmark
+
+
+# Benchmarks of the suite, by name.
+BENCHMARKS = {
+    'rhs': _rhs,
+    'rhs_batch': _rhsBatch,
+    'ivp_RK45': _ivp('RK45'),
+    'ivp_RK23': _ivp('RK23'),
+    'ivp_Radau': _ivp('Radau'),
+    'ivp_BDF': _ivp('BDF'),
+    'ivp_LSODA': _ivp('LSODA'),
+    'euler': _euler,
+    'root_secant': _root(root.secant, full_output=True),
+    'root_bisection': _root(root.bisection, full_output=True),
+    'root_brent': _root(root.brent),
+    'memory_ivp': _memory(lambda: calculConcentrationsIVP(X_INT, Y0)),
+    'memory_euler': _memory(lambda: calculConcentrationsEuler(
+        X_INT, Y0, step=1e-5, every=1000))}
+
+
+def run(names=None, repeat=5):
+    """Runs the benchmarks.
+
+    Parameters
+    ----------
+    names : list, *optional*
+        Names of the benchmarks to run (see ``BENCHMARKS``). The default is
+        all of them.
+    repeat : int, *default* 5
+        Number of times each benchmark is run, the shortest time being kept.
+
+    Returns
+    -------
+    dict
+        Returns a dict with the metrics of every benchmark (``benchmarks``)
+        and the versions of Python, NumPy and SciPy (``meta``).
+        Returns ``None`` if an incorrect name is passed through.
+    """
+    if names is None:
+        names = list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print("Error: benchmark '" + str(name) + "' not found in "
+                  "BENCHMARKS.")
+            return None
+    # Warms up the caches (and the compilation of the imports) so that the
+    # first benchmark is not penalised.
+    odefunction(0, Y0)
+    return {'meta': {'python': platform.python_version(),
+                     'numpy': np.__version__, 'scipy': scipy.__version__,
+                     'machine': platform.machine(), 'repeat': repeat,
+                     'date': time.strftime('%Y-%m-%d %H:%M:%S')},
+            'benchmarks': {name: BENCHMARKS[name](repeat)
+                           for name in names}}
+
+
+def compare(results, baseline, threshold=0.2):
+    """Metrics that regressed compared to a baseline.
+
+    Parameters
+    ----------
+    results : dict
+        Results of ``run()``.
+    baseline : dict
+        Results of ``run()`` to compare to (see ``load()``).
+    threshold : numeric, *default* 0.2
+        Relative change beyond which a metric is a regression (0.2 for
+        20 % slower, more evaluations, more memory, ...).
+
+    Returns
+    -------
+    list
+        Returns the list of the regressions, as tuples ``(benchmark,
+        metric, baseline, value, change)``, ``change`` being the relative
+        change in the bad direction.
+    """
+    regressions = []
+    for name, metrics in results['benchmarks'].items():
+        reference = baseline['benchmarks'].get(name, {})
+        for metric, value in metrics.items():
+            if metric not in TRACKED or not reference.get(metric):
+                continue
+            if metric in HIGHER:
+                change = reference[metric] / value - 1
+            else:
+                change = value / reference[metric] - 1
+            if change > threshold:
+                regressions.append((name, metric, reference[metric], value,
+                                    change))
+    return regressions
+
+
+def save(results, path='benchmark_baseline.json'):
+    """Stores results in a JSON file.
+
+    Parameters
+    ----------
+    results : dict
+        Results of ``run()``.
+    path : string, *default* ``benchmark_baseline.json``
+        Path of the file.
+    """
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def load(path='benchmark_baseline.json'):
+    """Loads results from a JSON file.
+
+    Parameters
+    ----------
+    path : string, *default* ``benchmark_baseline.json``
+        Path of the file.
+
+    Returns
+    -------
+    dict
+        Returns the results stored by ``save()``.
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def _table(results, baseline=None):
+    # Text table of the results, with the change compared to the baseline.
+    lines = []
+    for name, metrics in results['benchmarks'].items():
+        for metric, value in metrics.items():
+            line = '{:<16}{:<16}{:>14.6g}'.format(name, metric, value)
+            reference = (baseline or {}).get('benchmarks', {}).get(
+                name, {}).get(metric)
+            if reference:
+                line += '{:>+10.1%}'.format(value / reference - 1)
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Command line interface, see the documentation of the module."""
+    parser = argparse.ArgumentParser(description='Benchmarks of the reactor '
+                                     'model.')
+    parser.add_argument('names', nargs='*', help='benchmarks to run '
+                        '(default: all)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default='benchmark_baseline.json')
+    parser.add_argument('--save', action='store_true',
+                        help='store the results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(args.names or None, args.repeat)
+    if results is None:
+        return 2
+    if args.save:
+        save(results, args.baseline)
+        print(_table(results))
+        return 0
+    try:
+        baseline = load(args.baseline)
+    except FileNotFoundError:
+        baseline = None
+    print(_table(results, baseline))
+    if baseline is None:
+        print("No baseline found at '" + args.baseline + "'.")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, metric, reference, value, change in regressions:
+        print('Regression: {} {} {:.6g} -> {:.6g} ({:+.1%})'.format(
+            name, metric, reference, value, change))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""Module containing a persistent cache of the simulations' results.
+
+This module contains the class ``ResultCache`` which stores the results of
+the integrators of ``SimReacteur.py`` on the disk, as compressed ``.npz``
+files named after a hash of everything the result depends on: the function,
+its parameters (``x_int``, ``y0``, ``constants.Parameters``, method,
+tolerances, ...) and the version of the model (``MODEL_VERSION``, a hash of
+the source of ``constants.py``, ``odefunction.py``, ``odejit.py`` and
+``SimReacteur.py``).
+Changing the constants or the equations thus automatically invalidates the
+results computed before. The least recently used results are removed when
+the size of the cache goes over its limit.
+
+Exemple
+-------
+::
+
+    >>> cache = ResultCache('.simcache', max_bytes=2**30)
+    >>> x, y = cache(calculConcentrationsIVP, [0, 0.29], y0)
+
+Credits
+-------
+Created on Sat Oct 17 14:37:05 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import functools
+import hashlib
+import inspect
+import os
+import tempfile
+import types
+
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+import constants as c
+import odefunction
+import odejit
+import SimReacteur
+
+
+# %% [1] Main Code
+def _modelVersion():
+    # Hash of the source files of the model.
+    digest = hashlib.sha256()
+    for module in (c, odefunction, odejit, SimReacteur):
+        with open(module.__file__, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+# Version of the model, changes whenever one of its source files does.
+MODEL_VERSION = _modelVersion()
+
+
+class ResultCache:
+    """Persistent cache of the simulations' results.
+
+    Parameters
+    ----------
+    directory : string, *default* ``.simcache``
+        Directory where the results are stored.
+    max_bytes : int, *default* 2**30
+        Maximum size of the stored results, in bytes. The least recently
+        used results are removed to stay under it.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Number of results found and not found in the cache.
+    bypassed : int
+        Number of results computed without the cache, because one of their
+        parameters (an object or a function depending on one) can not be
+        fingerprinted, or because they can not be stored as arrays (the
+        ``OdeResult`` of ``full_output=True``, ...).
+    """
+
+    def __init__(self, directory='.simcache', max_bytes=2**30):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, function, *args, **kwargs):
+        """Result of ``function(*args, **kwargs)``, computed if not cached.
+
+        Parameters
+        ----------
+        function : function
+            Integrator, for example ``calculConcentrationsIVP``. Its result
+            must be a ``SimReacteur.Solution`` or a list of arrays and dicts
+            of arrays. The dense interpolant of a solution is not stored: a
+            cached solution is interpolated linearly between its steps.
+        *args, **kwargs
+            Parameters of ``function``.
+
+        Returns
+        -------
+        Solution or list
+            Returns the result of ``function``.
+        """
+        try:
+            key = self.key(function, *args, **kwargs)
+        except _Uncacheable:
+            self.bypassed += 1
+            return function(*args, **kwargs)
+        result = self.get(key)
+        if result is None:
+            result = function(*args, **kwargs)
+            if result is not None and not self.put(key, result):
+                # Counted as bypassed rather than as a miss.
+                self.misses -= 1
+                self.bypassed += 1
+        elif isinstance(result, SimReacteur.Solution):
+            # The parameters of the reactor are not stored with the result.
+            try:
+                p = inspect.signature(function).bind(
+                    *args, **kwargs).arguments.get('p')
+            except (TypeError, ValueError):
+                p = None
+            result.p = c.DEFAULT if p is None else p
+        return result
+
+    def key(self, function, *args, **kwargs):
+        """Key of a result.
+
+        Parameters
+        ----------
+        function : function
+            Integrator.
+        *args, **kwargs
+            Parameters of ``function``.
+
+        Returns
+        -------
+        string
+            Returns the hash of the function, its parameters and
+            ``MODEL_VERSION``. The functions (``events``, ``callback``,
+            ...) are identified by their code, defaults, attributes and the
+            values they capture.
+
+        Raises
+        ------
+        _Uncacheable
+            If a parameter can not be fingerprinted (see ``bypassed``).
+        """
+        token = (MODEL_VERSION, _token(function), _token(args),
+                 _token(kwargs))
+        return hashlib.sha256(repr(token).encode()).hexdigest()
+
+    def get(self, key):
+        """Cached result.
+
+        Parameters
+        ----------
+        key : string
+            Key of the result (see ``key()``).
+
+        Returns
+        -------
+        Solution or list
+            Returns the result, ``None`` if it is not in the cache.
+        """
+        path = self._path(key)
+        try:
+            with np.load(path) as data:
+                result = _unpack(data)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        # Marks the result as recently used.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        """Stores a result.
+
+        Parameters
+        ----------
+        key : string
+            Key of the result (see ``key()``).
+        result : Solution or list
+            Solution or list of arrays and dicts of arrays.
+
+        Returns
+        -------
+        bool
+            Returns ``False`` if the result can not be stored as arrays
+            (it is then not stored).
+        """
+        arrays = _pack(result)
+        if arrays is None:
+            return False
+        # The file is written under a temporary name (which evict() and
+        # clear() ignore) and then renamed, so that an interrupted write
+        # never leaves a corrupted result.
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                np.savez_compressed(file, **arrays)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.evict()
+        return True
+
+    def evict(self):
+        """Removes the least recently used results above ``max_bytes``."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.npz'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Removed by another process in the meantime.
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        size = sum(file[1] for file in files)
+        for _, file_size, path in files:
+            if size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= file_size
+
+    def clear(self):
+        """Removes all of the results."""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+
+class _Uncacheable(Exception):
+    # A parameter of a simulation can not be fingerprinted.
+    pass
+
+
+def _token(obj, seen=()):
+    # Canonical and hashable representation of the parameters of a
+    # simulation. Raises _Uncacheable for the objects which can not be
+    # represented (whose repr is their address).
+    if isinstance(obj, c.Parameters):
+        return ('Parameters', _token(obj.overrides, seen),
+                _token(obj.table, seen))
+    if isinstance(obj, dict):
+        return ('dict', tuple((str(k), _token(v, seen))
+                              for k, v in sorted(obj.items())))
+    if callable(obj):
+        return _function(obj, seen)
+    if isinstance(obj, types.CodeType):
+        return ('code', hashlib.sha256(obj.co_code).hexdigest(),
+                obj.co_names, _token(obj.co_consts, seen))
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        try:
+            array = np.asarray(obj, dtype=float)
+        except (TypeError, ValueError):
+            return (type(obj).__name__, tuple(_token(v, seen) for v in obj))
+        return ('array', array.shape,
+                hashlib.sha256(np.ascontiguousarray(array)).hexdigest())
+    if isinstance(obj, (int, float, np.number)) and not isinstance(obj, bool):
+        return ('number', repr(float(obj)))
+    text = repr(obj)
+    if ' at 0x' in text:
+        raise _Uncacheable(text)
+    return (type(obj).__name__, text)
+
+
+def _function(obj, seen):
+    # Fingerprint of a function: its name, its code, its defaults, its
+    # attributes (terminal and direction of an event, ...) and the values
+    # of its closure, so that two closures of the same function (two
+    # thresholds, ...) are told apart.
+    if isinstance(obj, type):
+        return ('type', obj.__module__, obj.__qualname__)
+    if isinstance(obj, functools.partial):
+        return ('partial', _token(obj.func, seen), _token(obj.args, seen),
+                _token(obj.keywords, seen))
+    if isinstance(obj, types.MethodType):
+        return ('method', _token(obj.__func__, seen),
+                _token(obj.__self__, seen))
+    if isinstance(obj, types.BuiltinFunctionType) or isinstance(
+            obj, np.ufunc):
+        return ('builtin', getattr(obj, '__module__', None),
+                getattr(obj, '__qualname__', obj.__name__))
+    if not isinstance(obj, types.FunctionType):
+        # Other callable objects (instances with a __call__ method, ...).
+        raise _Uncacheable(repr(obj))
+    name = (obj.__module__, obj.__qualname__)
+    if id(obj) in seen:
+        # Recursive function (in its own closure).
+        return ('function', name)
+    seen = seen + (id(obj),)
+    cells = []
+    for cell in obj.__closure__ or ():
+        try:
+            cells.append(_token(cell.cell_contents, seen))
+        except ValueError:
+            # Empty cell.
+            cells.append(None)
+    return ('function', name, _token(obj.__code__, seen),
+            _token(obj.__defaults__ or (), seen),
+            _token(obj.__kwdefaults__ or {}, seen),
+            _token(obj.__dict__, seen), tuple(cells))
+
+
+def _pack(result):
+    # Arrays of a result, to be saved in a .npz file: r<i> for an array and
+    # r<i>_<name> for the items of a dict, plus "solution" for a Solution.
+    # None if an item is not a numeric array (it could only be saved with
+    # pickle, which np.load() refuses).
+    arrays = {}
+    if isinstance(result, SimReacteur.Solution):
+        arrays['solution'] = np.array(True)
+    for i, value in enumerate(result):
+        if isinstance(value, dict):
+            arrays['d' + str(i)] = np.array(list(value))
+            for name, item in value.items():
+                arrays['r' + str(i) + '_' + name] = np.asarray(item)
+        else:
+            arrays['r' + str(i)] = np.asarray(value)
+    if any(array.dtype == object for array in arrays.values()):
+        return None
+    return arrays
+
+
+def _unpack(data):
+    # Inverse of _pack().
+    result = []
+    i = 0
+    while 'r' + str(i) in data or 'd' + str(i) in data:
+        if 'd' + str(i) in data:
+            result.append({str(name): _item(data['r' + str(i) + '_' + name])
+                           for name in data['d' + str(i)]})
+        else:
+            result.append(data['r' + str(i)])
+        i += 1
+    if 'solution' in data:
+        return SimReacteur.Solution(result[0], result[1],
+                                    extra=result[2:])
+    return result
+
+
+def _item(array):
+    # Scalars are stored as 0-d arrays.
+    return array[()] if array.ndim == 0 else array
@@ -0,0 +1,396 @@
+"""Module to checkpoint and resume long integrations.
+
+This module contains versions of the integrators of ``SimReacteur.py``
+which save their state to a file at regular intervals, so that an
+integration interrupted (a killed process, a preempted worker, ...) can be
+resumed from its last checkpoint instead of being started over.
+
++-----------------+----------------------------------------------------------+
+| function        | description                                              |
++=================+==========================================================+
+| ``fixedStep()`` | Fixed-step Runge-Kutta integration (Euler's method by    |
+|                 | default), see ``SimReacteur.calculConcentrationsRK()``.  |
++-----------------+----------------------------------------------------------+
+| ``ivp()``       | Integration with a solver of ``solve_ivp``, see          |
+|                 | ``SimReacteur.calculConcentrationsIVP()``.               |
++-----------------+----------------------------------------------------------+
+| ``resume()``    | Resumes the integration of a checkpoint file.            |
++-----------------+----------------------------------------------------------+
+
+Calling ``fixedStep()`` or ``ivp()`` again with the same file and the same
+parameters also resumes from the checkpoint. The checkpoint file only holds
+the state needed to resume: the points recorded between two checkpoints
+are appended to numbered files next to it (``<path>.0.npz``,
+``<path>.1.npz``, ...), so that a checkpoint costs the same at any point of
+the integration. The files are removed once the integration is done.
+
+A resumed fixed-step integration gives exactly the same result as an
+uninterrupted one. So does a resumed ``ivp()`` with the explicit
+Runge-Kutta methods (``RK23``, ``RK45``, ``DOP853``), which restart from the
+saved state and step size. The implicit methods (``Radau``, ``BDF``,
+``LSODA``) lose the history of their previous steps when resumed and agree
+with an uninterrupted integration to its accuracy only.
+
+Credits
+-------
+Created on Sun Oct 18 04:51:27 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import glob
+import os
+import pickle
+import tempfile
+import time
+
+# Third-party librairy imports.
+import numpy as np
+import scipy.integrate
+
+# Local module imports
+import constants as c
+import SimReacteur
+from cache import MODEL_VERSION
+from odefunction import jacobian
+
+
+# %% [1] Main Code
+# Solvers of solve_ivp available in ivp().
+METHODS = {'RK23': scipy.integrate.RK23, 'RK45': scipy.integrate.RK45,
+           'DOP853': scipy.integrate.DOP853, 'Radau': scipy.integrate.Radau,
+           'BDF': scipy.integrate.BDF, 'LSODA': scipy.integrate.LSODA}
+
+
+def fixedStep(x_int, y0, path, step=5e-8, tableau='euler', p=None, every=1,
+              x_out=None, interval=60.0, segment=1000, backend='numpy'):
+    """Fixed-step integration, with checkpoints.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : array, shape(8) or shape(8, N)
+        Initial state.
+    path : string
+        Checkpoint file. If it exists and was written with the same
+        parameters, the integration is resumed from it.
+    step : numeric, *default* 5e-8
+        Size of the steps.
+    tableau : string or tuple, *default* ``euler``
+        Method, see ``SimReacteur.calculConcentrationsRK()``.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    every, x_out
+        See ``SimReacteur.calculConcentrationsEuler()``.
+    interval : numeric, *default* 60
+        Minimum time between two checkpoints, in seconds.
+    segment : int, *default* 1000
+        Number of steps between two checks of the time.
+    backend : string, *default* ``numpy``
+        ``numpy`` or ``numba``, see
+        ``SimReacteur.calculConcentrationsEuler()``.
+
+    Returns
+    -------
+    Solution
+        Returns the solution, see ``SimReacteur.calculConcentrationsEuler()``.
+        Returns ``None`` if an incorrect tableau or backend is passed
+        through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    args = {'x_int': list(x_int), 'y0': np.asarray(y0, dtype=float),
+            'step': step, 'tableau': tableau, 'p': p, 'every': every,
+            'x_out': x_out, 'interval': interval, 'segment': segment,
+            'backend': backend}
+    fun = SimReacteur._odefunction(backend)
+    if fun is None:
+        return None
+    if isinstance(tableau, str):
+        if tableau.lower() not in SimReacteur.BUTCHER:
+            print("Error: method '" + tableau + "' not found in BUTCHER.")
+            return None
+        tableau = SimReacteur.BUTCHER[tableau.lower()]
+    advance = SimReacteur._rk(tableau, fun, p)
+
+    # State of the integration: index of the next point of the grid, state
+    # at that point, number of chunk files and points recorded since the
+    # last checkpoint.
+    state = _load(path, 'fixedStep', args)
+    if state is None:
+        state = {'i': 0, 'y': args['y0'], 'chunks': 0, 'x': [], 'ys': []}
+    n = max(int(np.ceil((x_int[1] - x_int[0]) / step)), 1)
+    last = [None]
+
+    def tracked(x, y, h):
+        # Keeps the state at the end of a segment.
+        last[0] = advance(x, y, h)
+        return last[0]
+
+    saved = time.perf_counter()
+    try:
+        while state['i'] < n:
+            stop = min(state['i'] + segment, n)
+            chunks = list(SimReacteur._march(tracked, x_int, state['y'], step,
+                                             every, x_out, start=state['i'],
+                                             stop=stop))
+            # The state is replaced at once, so that an interruption never
+            # leaves a half-done segment in it.
+            state = {'i': stop, 'y': last[0] if stop < n else None,
+                     'chunks': state['chunks'],
+                     'x': state['x'] + [xs for xs, _ in chunks],
+                     'ys': state['ys'] + [ys for _, ys in chunks]}
+            if time.perf_counter() - saved >= interval and stop < n:
+                state = _save(path, 'fixedStep', args, state)
+                saved = time.perf_counter()
+    except BaseException:
+        # Interrupted (KeyboardInterrupt, ...): the progress is kept.
+        _save(path, 'fixedStep', args, state)
+        raise
+    x, y = _gather(path, state, args['y0'].shape)
+    _remove(path)
+    return SimReacteur.Solution(x, y, p=p)
+
+
+def ivp(x_int, y0, path, method='RK45', rtol=0.5e-6, p=None, interval=60.0,
+        backend='numpy', **kwargs):
+    """Integration with a solver of solve_ivp, with checkpoints.
+
+    The solver is advanced step by step, as in ``solve_ivp``, and its
+    position, state and step size are saved at regular intervals.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : array, shape(8)
+        Initial state.
+    path : string
+        Checkpoint file. If it exists and was written with the same
+        parameters, the integration is resumed from it.
+    method : string, *default* ``RK45``
+        Solver, see ``METHODS``. ``Radau``, ``BDF`` and ``LSODA`` are given
+        the analytic Jacobian ``odefunction.jacobian``.
+    rtol : numeric, *default* 0.5e-6
+        Relative tolerance.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    interval : numeric, *default* 60
+        Minimum time between two checkpoints, in seconds.
+    backend : string, *default* ``numpy``
+        ``numpy`` or ``numba``, see
+        ``SimReacteur.calculConcentrationsEuler()``.
+    **kwargs : dict, *optional*
+        Extra parameters of the solver (``atol``, ``max_step``, ...). They
+        must be picklable.
+
+    Returns
+    -------
+    Solution
+        Returns the solution at the steps of the solver (without dense
+        interpolant), see ``SimReacteur.calculConcentrationsIVP()``.
+        Returns ``None`` if an incorrect method or backend is passed
+        through, or if the solver fails (the checkpoint is then kept).
+    """
+    if p is None:
+        p = c.DEFAULT
+    args = {'x_int': list(x_int), 'y0': np.asarray(y0, dtype=float),
+            'method': method, 'rtol': rtol, 'p': p, 'interval': interval,
+            'backend': backend, **kwargs}
+    fun = SimReacteur._odefunction(backend)
+    if fun is None:
+        return None
+    if method not in METHODS:
+        print("Error: method '" + str(method) + "' not found in METHODS.")
+        return None
+    if method in ('Radau', 'BDF', 'LSODA'):
+        kwargs.setdefault('jac', lambda t, y: jacobian(t, y, p))
+
+    # State of the integration: position, state and size of the next step
+    # of the solver, number of chunk files, and steps done since the last
+    # checkpoint (the first n of xs and ys).
+    saved = _load(path, 'ivp', args)
+    if saved is None:
+        xs = [x_int[0]]
+        ys = [args['y0']]
+        t, y, h, n, chunks = x_int[0], args['y0'], None, 1, 0
+    else:
+        xs = []
+        ys = []
+        t, y, h, n, chunks = (saved['t'], saved['y'], saved['h'], 0,
+                              saved['chunks'])
+    if h is not None:
+        h = min(h, abs(x_int[1] - t))
+    solver = METHODS[method](lambda t, y: fun(t, y, p), t, y, x_int[1],
+                             rtol=rtol, vectorized=True, first_step=h,
+                             **kwargs)
+
+    def checkpoint():
+        # Appends the steps done since the last checkpoint to a chunk file.
+        state = _save(path, 'ivp', args, {
+            't': t, 'y': y, 'h': h, 'chunks': chunks,
+            'x': [np.array(xs[:n])] if n else [],
+            'ys': [np.stack(ys[:n], axis=-1)] if n else []})
+        del xs[:n], ys[:n]
+        return state['chunks']
+
+    saved = time.perf_counter()
+    try:
+        while solver.status == 'running':
+            message = solver.step()
+            if solver.status == 'failed':
+                print("Error: " + str(message))
+                break
+            xs.append(solver.t)
+            ys.append(solver.y)
+            # The state is replaced at once, so that an interruption never
+            # leaves it half updated.
+            t, y, h, n = (solver.t, solver.y, getattr(
+                solver, 'h_abs', solver.step_size), len(xs))
+            if time.perf_counter() - saved >= interval:
+                chunks = checkpoint()
+                n = 0
+                saved = time.perf_counter()
+    except BaseException:
+        # Interrupted (KeyboardInterrupt, ...): the progress is kept.
+        checkpoint()
+        raise
+    if solver.status == 'failed':
+        checkpoint()
+        return None
+    x, y = _gather(path, {'chunks': chunks, 'x': [np.array(xs)],
+                          'ys': [np.stack(ys, axis=-1)] if ys else []},
+                   args['y0'].shape)
+    _remove(path)
+    return SimReacteur.Solution(x, y, p=p)
+
+
+def resume(path):
+    """Resumes the integration of a checkpoint file.
+
+    Parameters
+    ----------
+    path : string
+        Checkpoint file written by ``fixedStep()`` or ``ivp()``.
+
+    Returns
+    -------
+    Solution
+        Returns the solution of the whole integration.
+        Returns ``None`` if the file can not be read.
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError) as error:
+        print("Error: checkpoint '" + str(path) + "' can not be read ("
+              + str(error) + ").")
+        return None
+    args = dict(data['args'])
+    if data['kind'] == 'fixedStep':
+        return fixedStep(path=path, **args)
+    return ivp(path=path, **args)
+
+
+def _save(path, kind, args, state):
+    # Writes the points recorded since the last checkpoint (state['x'] and
+    # state['ys']) to the next chunk file, and then the rest of the state to
+    # the checkpoint. Returns the state with no point left to write.
+    if state['x']:
+        _write(_chunk(path, state['chunks']), lambda file: np.savez(
+            file, x=np.concatenate(state['x']),
+            y=np.concatenate(state['ys'], axis=-1)))
+        state = dict(state, chunks=state['chunks'] + 1)
+    state = dict(state, x=[], ys=[])
+    data = {'kind': kind, 'args': args, 'model': _model(args),
+            'state': {name: value for name, value in state.items()
+                      if name not in ('x', 'ys')}}
+    _write(path, lambda file: pickle.dump(data, file))
+    return state
+
+
+def _write(path, write):
+    # Writes a file, under a temporary name first so that an interruption
+    # never leaves a corrupted file.
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            write(file)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _chunk(path, k):
+    # Name of the k-th chunk file of a checkpoint.
+    return path + '.' + str(k) + '.npz'
+
+
+def _gather(path, state, shape):
+    # Points of the whole integration: the ones of the chunk files followed
+    # by the ones recorded since the last checkpoint. Empty (shape(0) and
+    # shape + (0,)) if no point is recorded (x_out outside of x_int, ...).
+    xs = []
+    ys = []
+    for k in range(state['chunks']):
+        with np.load(_chunk(path, k)) as data:
+            xs.append(data['x'])
+            ys.append(data['y'])
+    xs += state['x']
+    ys += state['ys']
+    if not ys:
+        return np.empty(0), np.empty(shape + (0,))
+    return np.concatenate(xs), np.concatenate(ys, axis=-1)
+
+
+def _load(path, kind, args):
+    # State saved in a checkpoint, None if there is none or if it was
+    # written with other parameters.
+    try:
+        with open(path, 'rb') as file:
+            data = pickle.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError):
+        print("Warning: checkpoint '" + str(path) + "' can not be read, the "
+              "integration is started over.")
+        return None
+    if data['kind'] != kind or data['model'] != _model(args):
+        print("Warning: checkpoint '" + str(path) + "' was written with "
+              "other parameters, the integration is started over.")
+        return None
+    state = data['state']
+    if not all(os.path.exists(_chunk(path, k))
+               for k in range(state['chunks'])):
+        print("Warning: a chunk file of checkpoint '" + str(path) + "' is "
+              "missing, the integration is started over.")
+        return None
+    return dict(state, x=[], ys=[])
+
+
+def _model(args):
+    # Fingerprint of the parameters of an integration and of the version of
+    # the model.
+    return pickle.dumps([MODEL_VERSION] + sorted(
+        (name, value.tolist() if isinstance(value, np.ndarray) else value)
+        for name, value in args.items()
+        if name not in ('interval', 'segment')))
+
+
+def _remove(path):
+    # Removes the checkpoint of a finished integration and its chunk files.
+    chunks = [name for name in glob.glob(glob.escape(path) + '.*.npz')
+              if name[len(path) + 1:-4].isdigit()]
+    for name in [path] + chunks:
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
@@ -4,6 +4,10 @@ This module contains all values that are given in the project's
 documentation. They are all accessible through the different functions of
 the module (see table below).
 
+The class ``Parameters`` resolves all of them once (together with the
+quantities derived from them) and allows to override any of them for a given
+simulation. ``DEFAULT`` is the set of parameters with the values below.
+
 +-----------+------------+-----------------------------------------------+
 | function  | parameters | description                                   |
 +===========+============+===============================================+
@@ -15,6 +19,12 @@ the module (see table below).
 |           |            | ``name``, 8.45 for ``g`` and 0.98 for ``s``   |
 |           |            | in kJ/kg/K.                                   |
 +-----------+------------+-----------------------------------------------+
+| ``dab()`` | ``name``,  | Returns the derivative of ``ab()`` with       |
+|           | ``T``      | respect to the temperature ``T``.             |
++-----------+------------+-----------------------------------------------+
+| ``deq()`` | ``name``,  | Returns the derivative of ``eq()`` with       |
+|           | ``T``      | respect to the temperature ``T``.             |
++-----------+------------+-----------------------------------------------+
 | ``dim()`` | ``name``   | Returns the value of the reactors ``name``,   |
 |           |            | 2.4e-2 for ``radius`` (can be shortened) and  |
 |           |            | 0.29 for ``length`` (can be shortened) in m.  |
@@ -22,6 +32,9 @@ the module (see table below).
 | ``dp()``  | *none*     | Returns the diameter of the pellets of CaO,   |
 |           |            | 3e-3 in m.                                    |
 +-----------+------------+-----------------------------------------------+
+| ``dvit()``| ``name``,  | Returns the derivative of ``vit()`` with      |
+|           | ``T``      | respect to the temperature ``T``.             |
++-----------+------------+-----------------------------------------------+
 | ``ep()``  | *none*     | Returns the value of epsilon, 0.5.            |
 +-----------+------------+-----------------------------------------------+
 | ``eq()``  | ``name``,  | Returns the value of the ``name`` reaction's  |
@@ -87,11 +100,31 @@ Created on Thu Feb 22 15:04:20 2024
 """
 
 # %% [0] Imports
+# First-party imports
+from collections import namedtuple
+
 # Third-party librairy imports.
 import numpy as np
 
 
 # %% [1] Main Code
+# Coefficients of the Arrhenius-type constants, shared by ab(), vit(), eq(),
+# their derivatives and the Parameters class.
+# Absorption constants: (pre-exponential factor, enthalpy, reference
+# temperature) of A * exp((E / R) * (1/T - 1/Tref)).
+AB = {'CH4': (0.179, 38280, 823), 'H2O': (0.4152, -88680, 823),
+      'H2': (0.0296, 82900, 648), 'CO': (40.91, 70650, 648)}
+# Equilibrium constants: (pre-exponential factor, energy) of
+# A * exp(-E / (R * T)). The second reaction's constant is the product of
+# the two others.
+EQ = {'1': (4.707e12, 224000), '3': (1.142e-2, -37300)}
+# Speed constants: (pre-exponential factor, activation energy, reference
+# temperature) of A * exp((-E / R) * (1/T - 1/Tref)).
+VIT = {'1': (1.842e-4 / 3600, 240100, 648),
+       '2': (2.193e-5 / 3600, 243900, 648),
+       '3': (7.558 / 3600, 67130, 648)}
+
+
 def ab(name, T):
     """Values of the reactions' absorption constant.
 
@@ -109,14 +142,9 @@ def ab(name, T):
         based on the temperature ``T``.
         Returns ``None`` if an incorrect parameter is passed through.
     """
-    if str(name) == 'CH4':
-        return 0.179 * np.exp((38280 / R()) * (1/T - 1/823))
-    elif str(name) == 'H2O':
-        return 0.4152 * np.exp((-88680 / R()) * (1/T - 1/823))
-    elif str(name) == 'H2':
-        return 0.0296 * np.exp((82900 / R()) * (1/T - 1/648))
-    elif str(name) == 'CO':
-        return 40.91 * np.exp((70650 / R()) * (1/T - 1/648))
+    if str(name) in AB:
+        A, E, Tref = AB[str(name)]
+        return A * np.exp((E / R()) * (1/T - 1/Tref))
     else:
         print("Error: value for '" + str(name) + "' not found in ab().")
         print("The value for the temperature (T) was '" + str(T) + "'.")
@@ -147,6 +175,58 @@ def Cp(name):
         return None
 
 
+def dab(name, T):
+    """Derivatives of the reactions' absorption constant.
+
+    Parameters
+    ----------
+    name : string
+        ``CH4``, ``H2O``, ``H2`` or ``CO``.
+    T : numeric
+        Value of the temperature.
+
+    Returns
+    -------
+    numeric
+        Returns the derivative of ``ab(name, T)`` with respect to the
+        temperature ``T``.
+        Returns ``None`` if an incorrect parameter is passed through.
+    """
+    if str(name) in AB:
+        return -ab(name, T) * AB[str(name)][1] / (R() * T**2)
+    else:
+        print("Error: value for '" + str(name) + "' not found in dab().")
+        print("The value for the temperature (T) was '" + str(T) + "'.")
+        return None
+
+
+def deq(name, T):
+    """Derivatives of the reactions' equilibrium constant.
+
+    Parameters
+    ----------
+    name : string
+        ``1``, ``2`` or ``3``.
+    T : numeric
+        Value of the temperature.
+
+    Returns
+    -------
+    numeric
+        Returns the derivative of ``eq(name, T)`` with respect to the
+        temperature ``T``.
+        Returns ``None`` if an incorrect parameter is passed through.
+    """
+    if str(name) in EQ:
+        return eq(name, T) * EQ[str(name)][1] / (R() * T**2)
+    elif str(name) == '2':
+        return deq(1, T) * eq(3, T) + eq(1, T) * deq(3, T)
+    else:
+        print("Error: value for '" + str(name) + "' not found in deq().")
+        print("The value for the temperature (T) was '" + str(T) + "'.")
+        return None
+
+
 def dim(name):
     """Values of the reactor's dimensions.
 
@@ -182,6 +262,31 @@ def dp():
     return 3e-3
 
 
+def dvit(name, T):
+    """Derivatives of the reactions' speed constant.
+
+    Parameters
+    ----------
+    name : string
+        ``1``, ``2`` or ``3``.
+    T : numeric
+        Value of the temperature.
+
+    Returns
+    -------
+    numeric
+        Returns the derivative of ``vit(name, T)`` with respect to the
+        temperature ``T``.
+        Returns ``None`` if an incorrect parameter is passed through.
+    """
+    if str(name) in VIT:
+        return vit(name, T) * VIT[str(name)][1] / (R() * T**2)
+    else:
+        print("Error: value for '" + str(name) + "' not found in dvit().")
+        print("The value for the temperature (T) was '" + str(T) + "'.")
+        return None
+
+
 def ep():
     """Value of epsilon.
 
@@ -210,12 +315,11 @@ def eq(name, T):
         based on the temperature ``T``.
         Returns ``None`` if an incorrect parameter is passed through.
     """
-    if str(name) == '1':
-        return 4.707e12 * np.exp(-224000 / (R() * T))
+    if str(name) in EQ:
+        A, E = EQ[str(name)]
+        return A * np.exp(-E / (R() * T))
     elif str(name) == '2':
         return eq(1, T) * eq(3, T)
-    elif str(name) == '3':
-        return 1.142e-2 * np.exp(37300 / (R() * T))
     else:
         print("Error: value for '" + str(name) + "' not found in eq().")
         print("The value for the temperature (T) was '" + str(T) + "'.")
@@ -508,12 +612,9 @@ def vit(name, T):
         on the temperature ``T``.
         Returns ``None`` if an incorrect parameter is passed through.
     """
-    if str(name) == '1':
-        return 1.842e-4 / 3600 * np.exp((-240100 / R()) * (1/T - 1/648))
-    elif str(name) == '2':
-        return 2.193e-5 / 3600 * np.exp((-243900 / R()) * (1/T - 1/648))
-    elif str(name) == '3':
-        return 7.558 / 3600 * np.exp((-67130 / R()) * (1/T - 1/648))
+    if str(name) in VIT:
+        A, E, Tref = VIT[str(name)]
+        return A * np.exp((-E / R()) * (1/T - 1/Tref))
     else:
         print("Error: value for '" + str(name) + "' not found in vit().")
         print("The value for the temperature (T) was '" + str(T) + "'.")
@@ -542,3 +643,394 @@ def W(name):
     else:
         print("Error: value for '" + str(name) + "' not found in W().")
         return None
+
+
+# Values returned by Parameters.coefficients().
+Coefficients = namedtuple('Coefficients', ['ab', 'eq', 'vit', 'kc', 'b'])
+
+
+class Parameters:
+    """Resolved set of the reactor's parameters.
+
+    All of the constants above are read once, when the object is created,
+    together with the quantities derived from them, so that the equations
+    in ``odefunction.py`` do not have to look them up at every evaluation.
+    The object is frozen; use ``replace()`` to get a modified copy.
+
+    Parameters
+    ----------
+    **overrides : dict, *optional*
+        Values replacing the defaults of this module for this set of
+        parameters, for example ``Parameters(TW=1000, u_g=2)``. See table
+        below. Any of them can also be an array, shape(N), to evaluate N
+        reactors at once with a batch of states, shape(8, N) (the kinetic
+        ones then have a shape(3, N) or shape(4, N)).
+
+    +-------------+-------------------------------------------------------+
+    | Name        | Description                                           |
+    +=============+=======================================================+
+    | ``TW``      | ``TW()``.                                             |
+    +-------------+-------------------------------------------------------+
+    | ``u_g``,    | ``u('g')`` and ``u('s')``.                            |
+    | ``u_s``     |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``W_CaO``,  | ``W('CaO')`` and ``W('cat')``.                        |
+    | ``W_cat``   |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``rho_CaO``,| ``rho('CaO')`` and ``rho('cat')``.                    |
+    | ``rho_cat`` |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``Cp_g``,   | ``Cp('g')`` and ``Cp('s')``.                          |
+    | ``Cp_s``    |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``k_g``,    | ``k('g')`` and ``k('s')``.                            |
+    | ``k_s``     |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``ep``,     | ``ep()``, ``eta()``, ``dp()``, ``mu()`` and ``R()``.  |
+    | ``eta``,    |                                                       |
+    | ``dp``,     |                                                       |
+    | ``mu``,     |                                                       |
+    | ``R``       |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``radius``, | ``dim('r')`` and ``dim('l')``.                        |
+    | ``length``  |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``H``,      | ``[H(1), H(2), H(3)]`` and ``H('cbn')``.              |
+    | ``H_cbn``   |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``MM_CaO``, | ``MM('CaO')`` and the molar masses of CH4, H2O, H2,   |
+    | ``MM_g``    | CO and CO2.                                           |
+    +-------------+-------------------------------------------------------+
+    | ``M_k``,    | ``M('k')``, ``N('k')``, ``M('b')`` and ``N('b')``.    |
+    | ``N_k``,    |                                                       |
+    | ``M_b``,    |                                                       |
+    | ``N_b``     |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``vit_A``,  | Pre-exponential factors, activation energies and      |
+    | ``vit_E``,  | reference temperatures of reactions 1, 2 and 3 (see   |
+    | ``vit_T``   | ``VIT``).                                             |
+    +-------------+-------------------------------------------------------+
+    | ``ab_A``,   | Pre-exponential factors, enthalpies and reference     |
+    | ``ab_E``,   | temperatures of CH4, H2O, H2 and CO (see ``AB``).     |
+    | ``ab_T``    |                                                       |
+    +-------------+-------------------------------------------------------+
+    | ``eq_A``,   | Pre-exponential factors and energies of reactions 1   |
+    | ``eq_E``    | and 3 (see ``EQ``).                                   |
+    +-------------+-------------------------------------------------------+
+
+    The derived quantities ``rho_s`` (equation (19) bis), ``ep_s``
+    (``1 - ep``), ``wall`` (``4 / radius``), ``Rep_g`` (particle Reynolds
+    number per unit of gas density), ``kz0`` (stagnant conductivity of the
+    bed), ``hW_lam`` and ``hW_turb`` (the two correlations of
+    ``odefunction.hW()`` without their dependence on the state) are computed
+    from the values above and can not be overridden.
+
+    The temperature dependent constants are all evaluated together by
+    ``coefficients()``, which keeps the values of the last temperature.
+    ``tabulate()`` returns a copy of the parameters which interpolates them
+    in a table instead, to a given accuracy.
+    """
+
+    # Values that can be overridden.
+    INPUTS = ('TW', 'u_g', 'u_s', 'W_CaO', 'W_cat', 'rho_CaO', 'rho_cat',
+              'Cp_g', 'Cp_s', 'k_g', 'k_s', 'ep', 'eta', 'dp', 'mu', 'R',
+              'radius', 'length', 'H', 'H_cbn', 'MM_CaO', 'MM_g', 'M_k',
+              'N_k', 'M_b', 'N_b', 'vit_A', 'vit_E', 'vit_T', 'ab_A', 'ab_E',
+              'ab_T', 'eq_A', 'eq_E')
+    # Values computed from the inputs.
+    DERIVED = ('rho_s', 'ep_s', 'wall', 'Rep_g', 'kz0', 'hW_lam', 'hW_turb')
+    __slots__ = INPUTS + DERIVED + ('overrides', '_arrhenius', '_last',
+                                    '_table')
+
+    def __init__(self, **overrides):
+        for name in overrides:
+            if name not in self.INPUTS:
+                raise TypeError("Parameters() got an unexpected parameter '"
+                                + str(name) + "'.")
+        # Default values, read from the functions of this module.
+        values = {
+            'TW': TW(), 'u_g': u('g'), 'u_s': u('s'), 'W_CaO': W('CaO'),
+            'W_cat': W('cat'), 'rho_CaO': rho('CaO'), 'rho_cat': rho('cat'),
+            'Cp_g': Cp('g'), 'Cp_s': Cp('s'), 'k_g': k('g'), 'k_s': k('s'),
+            'ep': ep(), 'eta': eta(), 'dp': dp(), 'mu': mu(), 'R': R(),
+            'radius': dim('r'), 'length': dim('l'),
+            'H': [H(1), H(2), H(3)], 'H_cbn': H('cbn'), 'MM_CaO': MM('CaO'),
+            'MM_g': [MM('CH4'), MM('H2O'), MM('H2'), MM('CO'), MM('CO2')],
+            'M_k': M('k'), 'N_k': N('k'), 'M_b': M('b'), 'N_b': N('b'),
+            'vit_A': [VIT[i][0] for i in ('1', '2', '3')],
+            'vit_E': [VIT[i][1] for i in ('1', '2', '3')],
+            'vit_T': [VIT[i][2] for i in ('1', '2', '3')],
+            'ab_A': [AB[i][0] for i in ('CH4', 'H2O', 'H2', 'CO')],
+            'ab_E': [AB[i][1] for i in ('CH4', 'H2O', 'H2', 'CO')],
+            'ab_T': [AB[i][2] for i in ('CH4', 'H2O', 'H2', 'CO')],
+            'eq_A': [EQ[i][0] for i in ('1', '3')],
+            'eq_E': [EQ[i][1] for i in ('1', '3')]}
+        values.update(overrides)
+        for name in self.INPUTS:
+            value = values[name]
+            if not np.isscalar(value):
+                value = np.array(value, dtype=float)
+                value.flags.writeable = False
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, 'overrides', dict(overrides))
+
+        # Derived quantities.
+        set_ = object.__setattr__
+        # Equation (19) bis
+        set_(self, 'rho_s', (self.W_cat + self.W_CaO) / (
+            self.W_cat/self.rho_cat + self.W_CaO/self.rho_CaO))
+        set_(self, 'ep_s', 1 - self.ep)
+        set_(self, 'wall', 4 / self.radius)
+        set_(self, 'Rep_g', self.u_g * self.ep * self.dp / self.mu)
+        set_(self, 'kz0', (self.k_g * (self.ep + (1 - self.ep)/(
+            0.139*self.ep - 0.0339 + 2/3*(self.k_g / self.k_s)))))
+        set_(self, 'hW_lam', 6.15 * (self.kz0 / self.radius))
+        set_(self, 'hW_turb', (2.03 * self.k_g / self.radius
+                               * np.exp(-6 * self.dp / self.radius)))
+        # Every temperature dependent constant written as
+        # A * exp(a + B / T), see coefficients(): the absorption constants
+        # of CH4, H2O, H2 and CO, the equilibrium constants of reactions 1
+        # and 3, the speed constants of reactions 1, 2 and 3, kc and b.
+        rows = ([(self.ab_A[i], -self.ab_E[i] / (self.R * self.ab_T[i]),
+                  self.ab_E[i] / self.R) for i in range(4)]
+                + [(self.eq_A[i], 0, -self.eq_E[i] / self.R)
+                   for i in range(2)]
+                + [(self.vit_A[i], self.vit_E[i] / (self.R * self.vit_T[i]),
+                    -self.vit_E[i] / self.R) for i in range(3)]
+                + [(self.M_k, 0, self.N_k), (self.M_b, 0, self.N_b)])
+        set_(self, '_arrhenius', [np.array(np.broadcast_arrays(*column),
+                                           dtype=float)
+                                  for column in zip(*rows)])
+        set_(self, '_last', (None, None))
+        set_(self, '_table', None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Parameters objects are frozen, use replace().")
+
+    def __delattr__(self, name):
+        raise AttributeError("Parameters objects are frozen, use replace().")
+
+    def __reduce__(self):
+        return (_parameters, (self.overrides, self.table))
+
+    def __repr__(self):
+        items = [name + '=' + repr(value)
+                 for name, value in self.overrides.items()]
+        if self._table is not None:
+            items.append('table=' + repr(self.table))
+        return 'Parameters(' + ', '.join(items) + ')'
+
+    @property
+    def table(self):
+        """Range and accuracy ``(T_min, T_max, rtol)`` of the table of the
+        temperature dependent constants (see ``tabulate()``), ``None`` if
+        they are evaluated exactly."""
+        return None if self._table is None else self._table[:3]
+
+    def replace(self, **overrides):
+        """Copy of the parameters with some values replaced.
+
+        Parameters
+        ----------
+        **overrides : dict
+            Values to replace, see ``Parameters``.
+
+        Returns
+        -------
+        Parameters
+            Returns a new set of parameters, with a table of the same range
+            and accuracy as this one (see ``tabulate()``) unless the new
+            parameters are a batch.
+        """
+        p = Parameters(**{**self.overrides, **overrides})
+        if self._table is not None and p._arrhenius[0].ndim == 1:
+            p = p.tabulate(*self.table)
+        return p
+
+    def tabulate(self, T_min=800, T_max=1100, rtol=1e-6):
+        """Copy of the parameters with a table of the temperature dependent
+        constants.
+
+        The constants of ``coefficients()`` are then interpolated linearly
+        in a table of temperatures between ``T_min`` and ``T_max`` instead
+        of being evaluated with an exponential (the exact values are still
+        used outside of the table). The step of the table is chosen from
+        the curvature of the constants and then halved until the error,
+        checked against the exact values in the middle of every interval,
+        is below ``rtol``.
+
+        Parameters
+        ----------
+        T_min, T_max : numeric, *default* 800 and 1100
+            Range of the table, in K.
+        rtol : numeric, *default* 1e-6
+            Bound of the relative error of every constant.
+
+        Returns
+        -------
+        Parameters
+            Returns a new set of parameters.
+            Returns ``None`` if the parameters are a batch or if an
+            incorrect range or accuracy is passed through.
+        """
+        if self._arrhenius[0].ndim > 1:
+            print("Error: a batch of parameters can not be tabulated.")
+            return None
+        if not 0 < T_min < T_max or not rtol > 0:
+            print("Error: incorrect range or accuracy in tabulate().")
+            return None
+        A, a, B = self._arrhenius
+        # The error of the linear interpolation is h**2/8 times the second
+        # derivative, which is (B**2/T**4 + 2B/T**3) times the constant.
+        curvature = np.max(B**2 / T_min**4 + 2*np.abs(B) / T_min**3)
+        n = int(np.ceil((T_max - T_min) / np.sqrt(8 * rtol / curvature)))
+        while True:
+            T = np.linspace(T_min, T_max, n + 1)
+            values = _arrhenius(*_columns(T, A, a, B), T)
+            middle = (T[:-1] + T[1:]) / 2
+            exact = _arrhenius(*_columns(middle, A, a, B), middle)
+            approx = (values[:, :-1] + values[:, 1:]) / 2
+            # K2 = K1 K3 is included.
+            exact = np.vstack([exact, exact[4] * exact[5]])
+            approx = np.vstack([approx, approx[4] * approx[5]])
+            if np.max(np.abs(approx / exact - 1)) <= rtol:
+                break
+            n *= 2
+        values.flags.writeable = False
+        p = Parameters(**self.overrides)
+        object.__setattr__(p, '_table', (T_min, T_max, rtol,
+                                         (T_max - T_min) / n, values))
+        return p
+
+    def coefficients(self, T):
+        """Values of all of the temperature dependent constants.
+
+        The constants are evaluated together, with a single exponential,
+        and the values of the last temperature are kept so that the
+        equations evaluated at the same state (odefunction, its Jacobian,
+        ...) do not compute them again.
+
+        Parameters
+        ----------
+        T : numeric or array, shape(N)
+            Value of the temperature.
+
+        Returns
+        -------
+        Coefficients
+            Returns a named tuple with the values of ``ab()``, shape(4)
+            or shape(4, N), ``eq()`` and ``vit()``, shape(3) or shape(3, N),
+            and of ``odefunction.kc()`` and ``odefunction.b()``,
+            interpolated if the parameters have a table (see
+            ``tabulate()``) and ``T`` is in its range.
+        """
+        # The temperature and its values are read (and replaced below) as a
+        # single tuple, so that concurrent threads never mix the two.
+        T0, cached = self._last
+        if T0 is not None and np.shape(T0) == np.shape(T) and (
+                np.all(T0 == T)):
+            return cached
+        table = self._table
+        if table is not None and np.all((table[0] <= T) & (T <= table[1])):
+            T_min, _, _, h, grid = table
+            u = (np.asarray(T, dtype=float) - T_min) / h
+            i = np.minimum(u.astype(int), grid.shape[1] - 2)
+            values = grid.take(i, axis=1)
+            values += (grid.take(i + 1, axis=1) - values) * (u - i)
+        else:
+            values = _arrhenius(*_columns(T, *self._arrhenius), T)
+        K1 = values[4]
+        K3 = values[5]
+        eq = np.array([K1, K1 * K3, K3])
+        # The values are shared by every caller at this temperature.
+        values.flags.writeable = False
+        eq.flags.writeable = False
+        coefficients = Coefficients(values[0:4], eq, values[6:9], values[9],
+                                    values[10])
+        object.__setattr__(self, '_last', (np.array(T, dtype=float),
+                                           coefficients))
+        return coefficients
+
+    def ab(self, T):
+        """Values of the absorption constants of CH4, H2O, H2 and CO.
+
+        Parameters
+        ----------
+        T : numeric or array, shape(N)
+            Value of the temperature.
+
+        Returns
+        -------
+        array, shape(4) or shape(4, N)
+            Returns the values of ``ab()`` for CH4, H2O, H2 and CO.
+        """
+        return self.coefficients(T).ab
+
+    def dab(self, T):
+        """Derivatives of ``ab()`` with respect to the temperature."""
+        E, = _columns(T, self.ab_E)
+        return -self.ab(T) * E / (self.R * T**2)
+
+    def eq(self, T):
+        """Values of the equilibrium constants of reactions 1, 2 and 3.
+
+        Parameters
+        ----------
+        T : numeric or array, shape(N)
+            Value of the temperature.
+
+        Returns
+        -------
+        array, shape(3) or shape(3, N)
+            Returns the values of ``eq()`` for reactions 1, 2 and 3.
+        """
+        return self.coefficients(T).eq
+
+    def deq(self, T):
+        """Derivatives of ``eq()`` with respect to the temperature."""
+        E, = _columns(T, self.eq_E)
+        K1, K2, K3 = self.eq(T)
+        dK1, dK3 = np.array([K1, K3]) * E / (self.R * T**2)
+        return np.array([dK1, dK1 * K3 + K1 * dK3, dK3])
+
+    def vit(self, T):
+        """Values of the speed constants of reactions 1, 2 and 3.
+
+        Parameters
+        ----------
+        T : numeric or array, shape(N)
+            Value of the temperature.
+
+        Returns
+        -------
+        array, shape(3) or shape(3, N)
+            Returns the values of ``vit()`` for reactions 1, 2 and 3.
+        """
+        return self.coefficients(T).vit
+
+    def dvit(self, T):
+        """Derivatives of ``vit()`` with respect to the temperature."""
+        E, = _columns(T, self.vit_E)
+        return self.vit(T) * E / (self.R * T**2)
+
+
+def _parameters(overrides, table=None):
+    # Rebuilds a Parameters object when unpickling it (see __reduce__).
+    p = Parameters(**overrides)
+    return p if table is None else p.tabulate(*table)
+
+
+def _arrhenius(A, a, B, T):
+    # Values of the constants A * exp(a + B / T).
+    return A * np.exp(a + B / T)
+
+
+def _columns(T, *arrays):
+    # Adds a trailing axis to the arrays of coefficients, shape(n), when T is
+    # an array, so that they broadcast against it column-wise.
+    return [a if np.ndim(a) > np.ndim(T) else
+            np.reshape(a, np.shape(a) + (1,) * np.ndim(T)) for a in arrays]
+
+
+# Parameters used by the equations when none are given.
+DEFAULT = Parameters()
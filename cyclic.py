@@ -0,0 +1,184 @@
+"""Module to simulate the cyclic operation of the reactor.
+
+This module contains the driver of the cyclic sorption-enhanced reforming:
+the sorbent leaves the reactor with the conversion X of its outlet, is
+regenerated (its CaCO3 is partly calcined back to CaO) and is fed back to
+the inlet of the next pass. The periodic (cyclic steady) state is the inlet
+conversion X which the cycle gives back unchanged, the fixed point of
+
+    X(n+1) = G(X(n)),    G(X) = regeneration of the outlet of a pass
+
+which is found with an accelerated iteration (Anderson's mixing or
+Aitken's extrapolation) instead of cycling until it settles.
+
++--------------------------+-------------------------------------------------+
+| function                 | description                                     |
++==========================+=================================================+
+| ``cyclicSteadyState()``  | Returns the cyclic steady state, with the       |
+|                          | number of cycles and the history of the         |
+|                          | residual.                                       |
++--------------------------+-------------------------------------------------+
+
+Exemple
+-------
+::
+
+    >>> out = cyclicSteadyState(y0, regeneration=0.2)
+    >>> out['X'], out['cycles'], out['residuals']
+    >>> out['solution'].purity()[-1]
+
+Credits
+-------
+Created on Sun Oct 18 05:10:16 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+import constants as c
+from odefunction import kc, b
+from SimReacteur import calculConcentrationsIVP
+
+
+# %% [1] Main Code
+def cyclicSteadyState(y0, regeneration=0.9, x_int=None, p=None,
+                      acceleration='anderson', memory=3, tol=1e-8,
+                      max_cycles=200, method='RK45', rtol=0.5e-6, **kwargs):
+    """Cyclic steady state of the reactor.
+
+    Parameters
+    ----------
+    y0 : array, shape(8)
+        Inlet state. Its conversion (``y0[5]``) is the one of the sorbent
+        fed to the first cycle.
+    regeneration : numeric or function, *default* 0.9
+        Fraction of the CaCO3 calcined between two cycles, the inlet
+        conversion of a cycle being ``(1 - regeneration)`` times the outlet
+        conversion of the previous one. Or a function ``f(y)`` returning
+        the inlet conversion from the outlet state of the previous cycle.
+    x_int : array, shape(2), *optional*
+        Interval of integration. The default is the length of the reactor.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    acceleration : string, *default* ``anderson``
+        ``anderson`` (Anderson's mixing of the last ``memory`` cycles),
+        ``aitken`` (Aitken's extrapolation every two cycles) or ``None``
+        (plain cycling).
+    memory : int, *default* 3
+        Number of previous cycles used by Anderson's mixing.
+    tol : numeric, *default* 1e-8
+        Tolerance on the change of the inlet conversion over a cycle.
+    max_cycles : int, *default* 200
+        Maximum number of cycles.
+    method : string, *default* ``RK45``
+        Method of ``solve_ivp``.
+    rtol : numeric, *default* 0.5e-6
+        Relative tolerance of the passes.
+    **kwargs : dict, *optional*
+        Extra parameters of ``SimReacteur.calculConcentrationsIVP()``.
+
+    Returns
+    -------
+    dict
+        Returns a dict with:
+
+        - ``X``: the inlet conversion of the cyclic steady state;
+        - ``solution``: the pass of the reactor at that state (see
+          ``SimReacteur.Solution``);
+        - ``converged``: whether the tolerance was met;
+        - ``cycles``: the number of cycles (passes of the reactor) run;
+        - ``residuals``: the change of the inlet conversion over every
+          cycle, ``|G(X) - X|``;
+        - ``history``: the inlet conversion of every cycle.
+
+        Returns ``None`` if an incorrect acceleration is passed through or
+        if a pass fails.
+    """
+    if p is None:
+        p = c.DEFAULT
+    if x_int is None:
+        x_int = [0, p.length]
+    if acceleration not in (None, 'anderson', 'aitken'):
+        print("Error: acceleration '" + str(acceleration) + "' not found in "
+              "cyclicSteadyState().")
+        return None
+    y0 = np.array(y0, dtype=float)
+    if callable(regeneration):
+        regenerate = regeneration
+    else:
+        def regenerate(y):
+            return (1 - regeneration) * y[5]
+    # The sorbent can not be fed beyond its ultimate conversion at the
+    # inlet temperature, where the rate of carbonation is not defined.
+    upper = float(kc(y0, p) * b(y0, p)) * (1 - 1e-9)
+
+    history = []
+    residuals = []
+    G = []
+
+    def cycle(X):
+        # One pass of the reactor fed with the conversion X, and the
+        # conversion given back by the regeneration.
+        y = y0.copy()
+        y[5] = X
+        with np.errstate(all='ignore'):
+            sol = calculConcentrationsIVP(x_int, y, method=method, rtol=rtol,
+                                          p=p, **kwargs)
+        if sol.x[-1] != x_int[1] or not np.all(np.isfinite(sol.outlet)):
+            return None, sol
+        return float(regenerate(sol.outlet)), sol
+
+    X = y0[5]
+    converged = False
+    while len(history) < max_cycles:
+        GX, sol = cycle(X)
+        if GX is None:
+            print("Error: the pass of the cycle " + str(len(history) + 1)
+                  + " failed (inlet conversion " + str(X) + ").")
+            return None
+        history.append(X)
+        G.append(GX)
+        residuals.append(abs(GX - X))
+        if residuals[-1] <= tol:
+            converged = True
+            break
+        X = GX
+        if acceleration == 'anderson' and len(history) > 1:
+            X = _anderson(history[-memory - 1:], G[-memory - 1:])
+        elif acceleration == 'aitken' and len(history) % 2 == 0:
+            X = _aitken(history[-2:], GX)
+        if not np.isfinite(X):
+            X = GX
+        X = min(max(X, 0.0), upper)
+    return {'X': history[-1], 'solution': sol,
+            'converged': converged, 'cycles': len(history),
+            'residuals': np.array(residuals), 'history': np.array(history)}
+
+
+def _anderson(X, G):
+    # Anderson's mixing: combination of the last cycles whose residual
+    # G - X is the smallest (in the least-squares sense).
+    X = np.asarray(X)
+    G = np.asarray(G)
+    F = G - X
+    dF = np.diff(F)
+    if not np.any(dF):
+        return G[-1]
+    gamma = np.linalg.lstsq(dF[None, :], F[-1:], rcond=None)[0]
+    return G[-1] - np.diff(G) @ gamma
+
+
+def _aitken(X, GX):
+    # Aitken's extrapolation of three successive cycles X0, X1 = G(X0) and
+    # X2 = G(X1).
+    x0, x1, x2 = X[0], X[1], GX
+    den = (x2 - x1) - (x1 - x0)
+    if den == 0:
+        return x2
+    return x2 - (x2 - x1)**2 / den
@@ -0,0 +1,193 @@
+"""Module to estimate the constants of the reactor from measured profiles.
+
+This module contains the least-squares fit of constants of the reactor (see
+``constants.Parameters``: the rate constants ``vit_A`` and ``vit_E``, the
+adsorption constants ``ab_A`` and ``ab_E``, the carbonation constants
+``M_k``, ``N_k``, ``M_b`` and ``N_b``, ...) to measured axial profiles of
+the states. Every evaluation of the model is a single solution of
+``sensitivity.sensitivity()``, which gives the profiles and their
+derivatives with respect to all of the fitted constants (the Jacobian of
+the residuals), so that the fit converges in few solutions of the model.
+
++---------------+------------------------------------------------------------+
+| function      | description                                                |
++===============+============================================================+
+| ``fit()``     | Returns the estimates of the constants, their covariance   |
+|               | and the number of solutions of the model.                  |
++---------------+------------------------------------------------------------+
+
+Exemple
+-------
+::
+
+    >>> out = fit(z, data, ['vit_E', 'M_k'], y0, states=[2, 6])
+    >>> out['values'], out['std'], out['solves']
+
+Credits
+-------
+Created on Sun Oct 18 05:08:36 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+from scipy.optimize import least_squares
+
+# Local module imports
+import constants as c
+from sensitivity import expand, sensitivity
+
+
+# %% [1] Main Code
+def fit(z, data, names, y0, states=None, sigma=None, p=None, method='RK45',
+        rtol=1e-8, atol=1e-10, **kwargs):
+    """Least-squares estimates of constants of the reactor.
+
+    Parameters
+    ----------
+    z : array, shape(m)
+        Increasing positions of the measures, from the inlet (z = 0).
+    data : array, shape(k, m)
+        Measured states, ``data[i]`` being the profile of the state
+        ``states[i]``. Missing measures are ``nan``.
+    names : list
+        Names of the constants to fit, see ``sensitivity.expand()``.
+    y0 : array, shape(8)
+        Inlet state.
+    states : list, *optional*
+        Indices of the measured states (0 to 4 for the concentrations, 5
+        for the conversion, 6 for the temperature and 7 for the pressure).
+        The default is all of them.
+    sigma : numeric or array, shape(k) or shape(k, m), *optional*
+        Standard deviations of the measures. The default weights each state
+        by its largest measured value, the covariance being then scaled by
+        the variance of the residuals.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``), whose
+        values of the constants are the initial guess. The default is
+        ``constants.DEFAULT``.
+    method : string, *default* ``RK45``
+        Method of ``solve_ivp``, see ``sensitivity.sensitivity()``.
+    rtol, atol : numeric, *default* 1e-8 and 1e-10
+        Tolerances of the solutions of the model.
+    **kwargs : dict, *optional*
+        Extra parameters of ``scipy.optimize.least_squares`` (``bounds``,
+        ``max_nfev``, ``ftol``, ...). The constants are scaled by their
+        initial values: bounds are relative to them.
+
+    Returns
+    -------
+    dict
+        Returns a dict with:
+
+        - ``names``: the names of the fitted values (see
+          ``sensitivity.expand()``);
+        - ``values`` and ``initial``: their estimates and initial values;
+        - ``covariance``, ``std`` and ``correlation``: the covariance of
+          the estimates, their standard deviations and correlations;
+        - ``residuals``: the weighted residuals at the estimates, shape(k,
+          m) (``nan`` where a measure is missing);
+        - ``cost``: half the sum of the squared weighted residuals;
+        - ``solves``: the number of solutions of the model;
+        - ``success`` and ``message``: the status of the fit;
+        - ``p``: the parameters of the reactor with the estimates.
+
+        Returns ``None`` if an incorrect name or data is passed through, or
+        if the model can not be solved at the initial guess.
+    """
+    if p is None:
+        p = c.DEFAULT
+    expanded = expand(names, p)
+    if expanded is None:
+        return None
+    labels, initial = expanded
+    z = np.asarray(z, dtype=float)
+    data = np.atleast_2d(np.asarray(data, dtype=float))
+    states = np.arange(8) if states is None else np.atleast_1d(states)
+    if data.shape != (len(states), len(z)):
+        print("Error: data of shape " + str(data.shape) + " instead of "
+              + str((len(states), len(z))) + ".")
+        return None
+    if z[0] < 0 or np.any(np.diff(z) <= 0):
+        print("Error: the positions must be increasing from the inlet.")
+        return None
+    absolute = sigma is not None
+    if sigma is None:
+        sigma = np.nanmax(np.abs(data), axis=1)
+    sigma = np.asarray(sigma, dtype=float)
+    if sigma.ndim == 1:
+        sigma = sigma[:, None]
+    sigma = np.broadcast_to(sigma, data.shape)
+    measured = np.isfinite(data)
+    # The constants are fitted relative to their initial values (the
+    # energies and the pre-exponential factors differ by orders of
+    # magnitude).
+    scale = np.where(initial == 0, 1.0, initial)
+    solves = [0]
+    last = {}
+
+    def solve(theta):
+        # Residuals and Jacobian at theta, one solution of the model shared
+        # by fun() and jac().
+        key = theta.tobytes()
+        if key not in last:
+            last.clear()
+            solves[0] += 1
+            q = _replace(p, labels, theta * scale)
+            with np.errstate(all='ignore'):
+                sol = sensitivity([0, z[-1]], y0, labels, p=q, method=method,
+                                  rtol=rtol, atol=atol, t_eval=z)
+            if sol is None:
+                # The model can not be solved at theta (sensitivity() warns):
+                # infinite residuals make least_squares reduce its step.
+                last[key] = (np.full(measured.sum(), np.inf), None)
+            else:
+                _, y, S = sol
+                r = (y[states] - data) / sigma
+                J = (S[states] * scale[:, None]
+                     / sigma[:, None, :]).transpose(0, 2, 1)
+                last[key] = (r[measured], J[measured])
+        return last[key]
+
+    theta0 = initial / scale
+    if solve(theta0)[1] is None:
+        print("Error: the model can not be solved at the initial guess.")
+        return None
+    result = least_squares(lambda theta: solve(theta)[0], theta0,
+                           jac=lambda theta: solve(theta)[1], **kwargs)
+
+    # Covariance of the estimates, from the Jacobian at the solution.
+    r, J = solve(result.x)
+    dof = max(r.size - len(labels), 1)
+    variance = 1.0 if absolute else 2 * result.cost / dof
+    covariance = np.linalg.pinv(J.T @ J) * variance * np.outer(scale, scale)
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = covariance / np.outer(std, std)
+    residuals = np.full(data.shape, np.nan)
+    residuals[measured] = r
+    values = result.x * scale
+    return {'names': labels, 'values': values, 'initial': initial,
+            'covariance': covariance, 'std': std,
+            'correlation': correlation, 'residuals': residuals,
+            'cost': result.cost, 'solves': solves[0],
+            'success': result.success, 'message': result.message,
+            'p': _replace(p, labels, values)}
+
+
+def _replace(p, labels, values):
+    # Copy of p with the values of the columns labels (see
+    # sensitivity.expand()) replaced.
+    overrides = {}
+    for label, value in zip(labels, values):
+        base, _, index = label.partition('[')
+        if index:
+            if base not in overrides:
+                overrides[base] = np.array(getattr(p, base), dtype=float)
+            overrides[base][int(index.rstrip(']'))] = value
+        else:
+            overrides[base] = value
+    return p.replace(**overrides)
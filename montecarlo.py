@@ -0,0 +1,350 @@
+"""Module to propagate the uncertainty of the constants through the model.
+
+This module contains the functions needed to sample the constants of the
+reactor (see ``constants.Parameters``) from given distributions and to run
+the ensemble of reactors: the samples are integrated by chunks, each chunk
+as a single batched system (``odefunction`` evaluates all of the reactors
+of a chunk in one call), and the chunks are shared between a pool of
+processes. The distributions of the outlet are returned as quantiles.
+
++-----------------+----------------------------------------------------------+
+| function        | description                                              |
++=================+==========================================================+
+| ``kinetic()``   | Returns distributions of the kinetic and thermodynamic   |
+|                 | constants, relative to their values.                     |
++-----------------+----------------------------------------------------------+
+| ``sample()``    | Returns samples of the constants.                        |
++-----------------+----------------------------------------------------------+
+| ``monteCarlo()``| Runs the ensemble and returns the quantiles of the       |
+|                 | outlet.                                                  |
++-----------------+----------------------------------------------------------+
+
+As the chunks are run in other processes, scripts calling ``monteCarlo()``
+must protect their main code with ``if __name__ == '__main__':``.
+
+Exemple
+-------
+::
+
+    >>> out = monteCarlo(y0, kinetic(sigma_A=0.1, sigma_E=0.02), n=10000,
+    ...                  seed=0)
+    >>> out['quantiles'][:, 6]    # outlet temperature, 5 % to 95 %
+
+Credits
+-------
+Created on Sun Oct 18 04:54:47 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party librairy imports.
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import csr_matrix
+
+# Local module imports
+import constants as c
+from odefunction import odefunction, jacobian
+from SimReacteur import calculConcentrationsIVP
+
+
+# %% [1] Main Code
+def kinetic(sigma_A=0.1, sigma_E=0.02, names=None):
+    """Distributions of the kinetic and thermodynamic constants.
+
+    Parameters
+    ----------
+    sigma_A : numeric, *default* 0.1
+        Standard deviation of the logarithm of the pre-exponential factors
+        (``vit_A``, ``ab_A``, ``eq_A``, ``M_k`` and ``M_b``), which follow a
+        lognormal distribution around their value.
+    sigma_E : numeric, *default* 0.02
+        Relative standard deviation of the energies (``vit_E``, ``ab_E``,
+        ``eq_E``, ``N_k`` and ``N_b``), which follow a normal distribution
+        around their value.
+    names : list, *optional*
+        Names of the constants to sample. The default is all of the above.
+
+    Returns
+    -------
+    dict
+        Returns the distributions, see ``sample()``.
+    """
+    p = c.DEFAULT
+    distributions = {}
+    for name in ('vit_A', 'ab_A', 'eq_A', 'M_k', 'M_b'):
+        distributions[name] = ('lognormal', sigma_A)
+    for name in ('vit_E', 'ab_E', 'eq_E', 'N_k', 'N_b'):
+        distributions[name] = ('normal', sigma_E * np.abs(getattr(p, name)))
+    if names is not None:
+        distributions = {name: distributions[name] for name in names}
+    return distributions
+
+
+def sample(distributions, n, p=None, seed=None):
+    """Samples of the constants.
+
+    Parameters
+    ----------
+    distributions : dict
+        Distribution of each constant to sample (names of
+        ``constants.Parameters``), around its value in ``p``:
+
+        - ``('normal', sd)``: the value plus a normal deviation;
+        - ``('lognormal', sigma)``: the value times ``exp(sigma * N(0,
+          1))``;
+        - ``('uniform', half)``: the value plus a uniform deviation in
+          ``[-half, half]``;
+        - a function ``f(rng, shape)`` returning the samples, ``rng``
+          being a ``numpy.random.Generator``.
+
+        ``sd``, ``sigma`` and ``half`` can be arrays, one value per element
+        of the vector constants (``vit_A``, ...).
+    n : int
+        Number of samples.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    seed : int, *optional*
+        Seed of the random generator.
+
+    Returns
+    -------
+    dict
+        Returns the samples of each constant, shape(n) for a scalar one
+        and shape(k, n) for a vector of k values.
+        Returns ``None`` if an incorrect distribution is passed through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for name, distribution in distributions.items():
+        if name not in c.Parameters.INPUTS:
+            print("Error: value for '" + str(name) + "' not found in "
+                  "Parameters.")
+            return None
+        value = np.asarray(getattr(p, name), dtype=float)
+        shape = value.shape + (n,)
+        value = value[..., None]
+        if callable(distribution):
+            samples[name] = np.asarray(distribution(rng, shape), dtype=float)
+            continue
+        kind, scale = distribution[0], np.asarray(distribution[1])[..., None]
+        if kind == 'normal':
+            samples[name] = value + scale * rng.standard_normal(shape)
+        elif kind == 'lognormal':
+            samples[name] = value * np.exp(scale * rng.standard_normal(shape))
+        elif kind == 'uniform':
+            samples[name] = value + scale * rng.uniform(-1, 1, shape)
+        else:
+            print("Error: distribution '" + str(kind) + "' not found in "
+                  "sample().")
+            return None
+    return samples
+
+
+def monteCarlo(y0, distributions, n=1000, x_int=None, p=None, seed=None,
+               q=(0.05, 0.25, 0.5, 0.75, 0.95), chunk=256, max_workers=None,
+               method='RK45', rtol=0.5e-6, atol=1e-6, max_steps=10000,
+               **kwargs):
+    """Uncertainty of the outlet of the reactor.
+
+    Parameters
+    ----------
+    y0 : array, shape(8)
+        Initial state.
+    distributions : dict
+        Distributions of the constants, see ``sample()`` and ``kinetic()``.
+    n : int, *default* 1000
+        Number of samples.
+    x_int : array, shape(2), *optional*
+        Interval of integration. The default is the length of the reactor.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``) around
+        which the constants are sampled. The default is
+        ``constants.DEFAULT``.
+    seed : int, *optional*
+        Seed of the random generator. The results do not depend on the
+        number of processes.
+    q : array, *default* (0.05, 0.25, 0.5, 0.75, 0.95)
+        Quantiles to return.
+    chunk : int, *default* 256
+        Number of samples integrated together, as one system.
+    max_workers : int, *optional*
+        Number of processes. The default is the number of CPUs; with 1 the
+        chunks are run in this process.
+    method : string, *default* ``RK45``
+        Method of ``solve_ivp``.
+    rtol, atol : numeric, *default* 0.5e-6 and 1e-6
+        Tolerances of every sample. As ``solve_ivp`` controls the error of
+        a chunk in root mean square, they are divided by the square root
+        of the size of the chunk's system.
+    max_steps : int, *default* 10000
+        Maximum number of steps of a sample integrated on its own (when its
+        chunk fails). A sample which reaches it is counted as failed.
+    **kwargs : dict, *optional*
+        Extra parameters of ``solve_ivp``.
+
+    Returns
+    -------
+    dict
+        Returns a dict with:
+
+        - ``q``: the quantiles' levels;
+        - ``quantiles``: the quantiles of the outlet state, shape(nq, 8)
+          (concentrations, conversion, temperature and pressure);
+        - ``fractions``: the quantiles of the outlet mole fractions of
+          CH4, H2O, H2, CO and CO2, shape(nq, 5);
+        - ``mean`` and ``std``: the mean and standard deviation of the
+          outlet state, shape(8);
+        - ``outlet``: the outlet of every sample, shape(8, n);
+        - ``samples``: the samples of the constants (see ``sample()``);
+        - ``failed``: whether the integration of each sample failed,
+          shape(n). The statistics are computed without them (they are
+          nan if every sample failed).
+
+        Returns ``None`` if an incorrect distribution is passed through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    if x_int is None:
+        x_int = [0, p.length]
+    samples = sample(distributions, n, p, seed)
+    if samples is None:
+        return None
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    solver = dict(kwargs, method=method, rtol=rtol, atol=atol)
+    jobs = [(p.overrides, {name: value[..., i:i + chunk]
+                           for name, value in samples.items()},
+             np.asarray(y0, dtype=float), x_int, solver, max_steps)
+            for i in range(0, n, chunk)]
+    if max_workers == 1:
+        results = list(map(_run, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_run, jobs))
+    outlet = np.concatenate(results, axis=1)
+
+    failed = ~np.all(np.isfinite(outlet), axis=0)
+    q = np.asarray(q, dtype=float)
+    if failed.all():
+        # np.quantile() is not defined without any sample.
+        nan = np.full(q.shape + (8,), np.nan)
+        return {'q': q, 'quantiles': nan, 'fractions': nan[..., :5],
+                'mean': np.full(8, np.nan), 'std': np.full(8, np.nan),
+                'outlet': outlet, 'samples': samples, 'failed': failed}
+    valid = outlet[:, ~failed]
+    fractions = valid[:5] / valid[:5].sum(axis=0)
+    return {'q': q,
+            'quantiles': np.quantile(valid, q, axis=1),
+            'fractions': np.quantile(fractions, q, axis=1),
+            'mean': valid.mean(axis=1), 'std': valid.std(axis=1),
+            'outlet': outlet, 'samples': samples, 'failed': failed}
+
+
+def _run(job):
+    # Integrates a chunk of samples, in a process of the pool. Returns the
+    # outlet of every sample, shape(8, m), nan for the failed ones.
+    overrides, samples, y0, x_int, solver, max_steps = job
+    m = next(iter(samples.values())).shape[-1]
+    outlet = np.full((8, m), np.nan)
+    # The samples replace the overrides of the same constants (sample()
+    # draws them around the overridden values). Samples at which the
+    # equations are not defined would make the solver reduce its step
+    # endlessly.
+    p = c.Parameters(**{**overrides, **samples})
+    with np.errstate(all='ignore'):
+        Y0 = np.repeat(y0[:, None], m, axis=1)
+        valid = np.all(np.isfinite(odefunction(x_int[0], Y0, p)), axis=0)
+    index = np.nonzero(valid)[0]
+    if index.size == 0:
+        return outlet
+    if index.size < m:
+        p = c.Parameters(**{**overrides, **_subset(samples, index)})
+    outlet[:, index] = _solve(y0, index.size, x_int, p, solver)
+    if np.all(np.isfinite(outlet[:, index])):
+        return outlet
+    # The chunk failed: its samples are integrated one by one, so that a
+    # single failing sample does not fail the others. The number of steps
+    # is bounded, so that a sample which stalls the solver does not stall
+    # the process.
+    for j in index:
+        pj = c.Parameters(**{**overrides, **_subset(samples, j)})
+        try:
+            with np.errstate(all='ignore'):
+                x, y = calculConcentrationsIVP(
+                    x_int, y0, p=pj, dense_output=False,
+                    events=_limit(max_steps, x_int), **solver)
+        except Exception:
+            continue
+        if x[-1] == x_int[1]:
+            outlet[:, j] = y[:, -1]
+    return outlet
+
+
+def _limit(max_steps, x_int):
+    # Terminal event stopping the integration after max_steps steps (the
+    # events are evaluated once per step). Its value is -1 until then, and
+    # the distance to the position of the last step afterwards, so that the
+    # solver locates it at that step.
+    sign = 1 if x_int[1] >= x_int[0] else -1
+    state = {'steps': 0, 'stop': None}
+
+    def event(z, y, p=None):
+        if state['stop'] is None:
+            state['steps'] += 1
+            if state['steps'] <= max_steps:
+                return -1.0
+            state['stop'] = z
+        return sign * (z - state['stop'])
+
+    event.terminal = True
+    event.direction = 1
+    return event
+
+
+def _solve(y0, m, x_int, p, solver):
+    # Outlet of m reactors integrated together as a system of 8*m equations
+    # (the state of the reactor k being y[k::m]), nan if the integration
+    # fails.
+    solver = dict(solver)
+    scale = np.sqrt(8 * m)
+    solver['rtol'] = solver['rtol'] / scale
+    solver['atol'] = solver['atol'] / scale
+
+    def fun(z, y):
+        return odefunction(z, y.reshape(8, m), p).ravel()
+
+    if solver['method'] in ('Radau', 'BDF', 'LSODA'):
+        # Block diagonal Jacobian: J[i*m + k, j*m + k] = J_k[i, j].
+        i, j, k = np.meshgrid(np.arange(8), np.arange(8), np.arange(m),
+                              indexing='ij')
+        rows = (i*m + k).ravel()
+        cols = (j*m + k).ravel()
+
+        def jac(z, y):
+            J = jacobian(z, y.reshape(8, m), p)
+            return csr_matrix((J.ravel(), (rows, cols)), shape=(8*m, 8*m))
+        solver.setdefault('jac', jac)
+    y0 = np.repeat(y0[:, None], m, axis=1).ravel()
+    try:
+        with np.errstate(all='ignore'):
+            sol = solve_ivp(fun, x_int, y0, **solver)
+    except Exception:
+        return np.nan
+    if sol.status != 0:
+        return np.nan
+    return sol.y[:, -1].reshape(8, m)
+
+
+def _subset(samples, index):
+    # Samples of some of the reactors of a chunk.
+    return {name: value[..., index] for name, value in samples.items()}
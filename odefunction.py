@@ -14,6 +14,9 @@ Created on Fri Feb 16 15:55:14 2024
 """
 
 # %% [0] Imports
+# First-party imports
+from collections import namedtuple
+
 # Third-party librairy imports.
 import numpy as np
 
@@ -22,58 +25,253 @@ import constants as c
 
 
 # %% [1] Main Code
-def odefunction(z, C):
+# Stoichiometric coefficients of CH4, H2O, H2, CO and CO2 (rows) in the
+# reactions 1, 2 and 3 (columns), see r().
+NU = np.array([[-1, -1, 0], [-1, -2, -1], [3, 4, 1], [1, 0, -1], [0, 1, 1]])
+
+# Values returned by kinetics().
+Kinetics = namedtuple('Kinetics', ['P', 'ab', 'eq', 'vit', 'DEN', 'R', 'r',
+                                   'kc', 'Xu', 'rcbn', 'rhog', 'hW'])
+
+
+def odefunction(z, C, p=None):
     """Values of the differential equation.
 
     Parameters
     ----------
     z : numeric
         Value of the axial distance.
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+        Each column of a 2D array is an independent state, so that N reactors
+        can be evaluated in a single call (``solve_ivp(...,
+        vectorized=True)``).
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
-    dC : array, shape(8)
+    dC : array, shape(8) or shape(8, N)
         Returns the values of the 8 differential equations: [dC/dz, dC/dz,
         dC/dz, dC/dz, dC/dz, dX/dz, dT/dz, dP/dz].
     """
+    if p is None:
+        p = c.DEFAULT
     # Creates all of the necessary arrays to be used in the equations below.
-    dC = np.zeros(8)
-    r_ = np.array([r('CH4', C), r('H2O', C), r('H2', C),
-                   r('CO', C), r('CO2', C)])
-    R_ = np.array([R(1, C), R(2, C), R(3, C)])
-    H_ = np.array([c.H(1), c.H(2), c.H(3)])
+    # The arrays have the same shape as C so that every column is treated as
+    # an independent state.
+    C = np.asarray(C, dtype=float)
+    dC = np.zeros(C.shape)
+    # All of the sub-equations are evaluated once, in a single pass.
+    kin = kinetics(C, p)
+    rcbn_ = kin.rcbn
+    rhog_ = kin.rhog
 
     # Equation (16): dC/dz of the different elements (CH4, H2O, H2, CO and CO2)
-    dC[:5] = ((c.eta() * (1 - c.ep()) * c.rho('cat') * r_ - (1 - c.ep())
-               * c.rho('CaO') * rcbn(C)) / c.u('g'))
+    dC[:5] = ((p.eta * p.ep_s * p.rho_cat * kin.r - p.ep_s
+               * p.rho_CaO * rcbn_) / p.u_g)
     # Equation (17): dX/dz
-    dC[5] = c.MM('CaO') / c.u('s') * rcbn(C)
+    dC[5] = p.MM_CaO / p.u_s * rcbn_
     # Equation (19): dT/dz
-    dC[6] = ((-(1 - c.ep()) * c.rho('cat') * c.eta() * sum(R_ * H_)
-             - (1 - c.ep()) * c.rho('CaO') * rcbn(C) * c.H('cbn') + hW(C)
-             * (c.TW() - C[6]) * 4 / c.dim('r')) / ((1 - c.ep()) * c.rho('s')
-             * c.u('s') * c.Cp('s') + rhog(C) * c.u('g') * c.Cp('g')))
+    dC[6] = ((-p.ep_s * p.rho_cat * p.eta * np.einsum('i...,i...', p.H, kin.R)
+             - p.ep_s * p.rho_CaO * rcbn_ * p.H_cbn + kin.hW
+             * (p.TW - C[6]) * p.wall) / (p.ep_s * p.rho_s
+             * p.u_s * p.Cp_s + rhog_ * p.u_g * p.Cp_g))
     # Equation (20): dP/dz
-    dC[7] = (-(rhog(C) * c.u('g')**2 * (1 - c.ep())) / (c.dp() * c.ep())
-             * ((150 * (1 - c.ep()) * c.mu()) / (c.dp() * rhog(C) * c.u('g'))
+    dC[7] = (-(rhog_ * p.u_g**2 * p.ep_s) / (p.dp * p.ep)
+             * ((150 * p.ep_s * p.mu) / (p.dp * rhog_ * p.u_g)
              + 1.75) * 1e-5)
     return dC
 
 
+def kinetics(C, p=None):
+    """Values of all of the sub-equations of a state.
+
+    Single pass over the sub-equations below: the partial pressures, the
+    temperature dependent constants, the denominator, the reactions' speeds,
+    the formation/consomation rates, the rate of carbonation, the gas
+    density and the wall heat transfer coefficient are each computed once
+    and shared by the equations that need them.
+
+    Parameters
+    ----------
+    C : array, shape(8) or shape(8, N)
+        Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
+        fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+
+    Returns
+    -------
+    Kinetics
+        Returns a named tuple with the values of: ``P`` the partial
+        pressures of CH4, H2O, H2, CO and CO2, ``ab``, ``eq`` and ``vit``
+        the temperature dependent constants (see ``constants.Parameters``),
+        ``DEN`` (see ``DEN()``), ``R`` the speeds of the reactions 1, 2 and
+        3, ``r`` the formation/consomation rates of CH4, H2O, H2, CO and CO2,
+        ``kc``, ``Xu``, ``rcbn``, ``rhog`` and ``hW`` (see the functions of
+        the same name).
+    """
+    if p is None:
+        p = c.DEFAULT
+    C = np.asarray(C, dtype=float)
+    T = C[6]
+    # Partial pressures of CH4, H2O, H2, CO and CO2 (see constants.P()).
+    P_ = C[7] * C[:5] / C[:5].sum(axis=0)
+    # Temperature dependent constants, including kc and b.
+    co = p.coefficients(T)
+    ab_ = co.ab
+    eq_ = co.eq
+    vit_ = co.vit
+    DEN_, R_ = _R(P_, ab_, eq_, vit_)
+    # Equations (8), (9), (10), (11) and (12)
+    r_ = np.einsum('ij,j...->i...', NU, R_)
+    kc_, Xu_, rcbn_ = _rcbn(C, co.kc, co.b, p)
+    rhog_ = _rhog(P_, T, p)
+    return Kinetics(P_, ab_, eq_, vit_, DEN_, R_, r_, kc_, Xu_, rcbn_, rhog_,
+                    _hW(rhog_, C, p))
+
+
+def jacobian(z, C, p=None):
+    """Values of the Jacobian of the differential equation.
+
+    Analytic derivative of ``odefunction(z, C)`` with respect to the state
+    ``C``, obtained by applying the chain rule to the sub-equations below.
+
+    Parameters
+    ----------
+    z : numeric
+        Value of the axial distance.
+    C : array, shape(8) or shape(8, N)
+        Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
+        fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+
+    Returns
+    -------
+    J : array, shape(8, 8) or shape(8, 8, N)
+        Returns the Jacobian matrix, ``J[i, j]`` being the derivative of the
+        i-th differential equation with respect to ``C[j]``.
+    """
+    if p is None:
+        p = c.DEFAULT
+    C = np.asarray(C, dtype=float)
+    T = C[6]
+    kin = kinetics(C, p)
+    # Partial pressures (pp) and their derivatives with respect to the state
+    # (dp[i, j] = dp_i/dC_j).
+    S = C[:5].sum(axis=0)
+    pp = kin.P
+    pCH4, pH2O, pH2, pCO, pCO2 = pp
+    dp = np.zeros((5, 8) + C.shape[1:])
+    for i in range(5):
+        dp[i, :5] = -pp[i] / S
+        dp[i, i] += C[7] / S
+        dp[i, 7] = C[i] / S
+
+    # Equation (7): DEN and its derivatives with respect to p and T.
+    DEN_ = kin.DEN
+    aCH4, aH2O, aH2, aCO = kin.ab
+    daCH4, daH2O, daH2, daCO = p.dab(T)
+    dDENdp = np.array([aCH4 * np.ones_like(pH2), aH2O / pH2,
+                       aH2 - aH2O * pH2O / pH2**2, aCO * np.ones_like(pH2),
+                       np.zeros_like(pH2)])
+    dDENdT = daCO*pCO + daH2*pH2 + daCH4*pCH4 + daH2O*pH2O/pH2
+
+    # Equations (4), (5) and (6): R = vit * F / DEN**2, with F the driving
+    # force. dFdp and dFdK are the derivatives of F with respect to p and to
+    # the equilibrium constant.
+    K = kin.eq
+    dKdT = p.deq(T)
+    k_ = kin.vit
+    dkdT = p.dvit(T)
+    zero = np.zeros_like(pH2)
+    F = np.array([pCH4*pH2O*pH2**-2.5 - pH2**0.5*pCO/K[0],
+                  pCH4*pH2O**2*pH2**-3.5 - pH2**0.5*pCO2/K[1],
+                  pCO*pH2O/pH2 - pCO2/K[2]])
+    dFdp = np.array([[pH2O*pH2**-2.5, pCH4*pH2**-2.5,
+                      -2.5*pCH4*pH2O*pH2**-3.5 - 0.5*pH2**-0.5*pCO/K[0],
+                      -pH2**0.5/K[0], zero],
+                     [pH2O**2*pH2**-3.5, 2*pCH4*pH2O*pH2**-3.5,
+                      -3.5*pCH4*pH2O**2*pH2**-4.5 - 0.5*pH2**-0.5*pCO2/K[1],
+                      zero, -pH2**0.5/K[1]],
+                     [zero, pCO/pH2, -pCO*pH2O/pH2**2, pH2O/pH2,
+                      -1/K[2] + zero]])
+    dFdK = np.array([pH2**0.5*pCO/K[0]**2, pH2**0.5*pCO2/K[1]**2,
+                     pCO2/K[2]**2])
+    R_ = kin.R
+    dRdp = k_[:, None] * dFdp / DEN_**2 - 2 * R_[:, None] * dDENdp / DEN_
+    dRdT = (dkdT * F + k_ * dFdK * dKdT) / DEN_**2 - 2 * R_ * dDENdT / DEN_
+    dR = np.einsum('ij...,jk...->ik...', dRdp, dp)
+    dR[:, 6] += dRdT
+
+    # Equations (8), (9), (10), (11) and (12): stoichiometry of r.
+    dr = np.einsum('ij,jk...->ik...', NU, dR)
+
+    # Equations (14), (15), (18) and (18) bis: derivatives of rcbn with
+    # respect to X and T.
+    kc_ = kin.kc
+    Xu_ = kin.Xu
+    dkcdT = -p.N_k * kc_ / T**2
+    dXudT = -(p.N_k + p.N_b) * Xu_ / T**2
+    drcbn = np.zeros((8,) + C.shape[1:])
+    drcbn[5] = -2 * kc_ / p.MM_CaO * (1 - C[5]/Xu_) / Xu_
+    drcbn[6] = (dkcdT / p.MM_CaO * (1 - C[5]/Xu_)**2 + 2 * kc_
+                / p.MM_CaO * (1 - C[5]/Xu_) * C[5] * dXudT / Xu_**2)
+
+    # Equation (19) bis bis: derivatives of rhog.
+    rhog_ = kin.rhog
+    drhog = np.einsum('i...,ij...->j...', p.MM_g, dp) * 100000 / (p.R * T)
+    drhog[6] -= rhog_ / T
+
+    # Wall heat transfer coefficient: only the correlation used for
+    # Rep > 20 depends on the state (through rhog).
+    hW_ = kin.hW
+    dhW = np.where(p.Rep_g * rhog_ > 20, 0.8 * hW_ / rhog_, 0) * drhog
+
+    J = np.zeros((8, 8) + C.shape[1:])
+    # Equation (16)
+    J[:5] = ((p.eta * p.ep_s * p.rho_cat * dr - p.ep_s
+              * p.rho_CaO * drcbn) / p.u_g)
+    # Equation (17)
+    J[5] = p.MM_CaO / p.u_s * drcbn
+    # Equation (19)
+    num = (-p.ep_s * p.rho_cat * p.eta * np.einsum('i...,i...', p.H, R_)
+           - p.ep_s * p.rho_CaO * kin.rcbn * p.H_cbn + hW_
+           * (p.TW - T) * p.wall)
+    dnum = (-p.ep_s * p.rho_cat * p.eta
+            * np.einsum('i...,ij...->j...', p.H, dR) - p.ep_s
+            * p.rho_CaO * drcbn * p.H_cbn + dhW * (p.TW - T) * p.wall)
+    dnum[6] -= hW_ * p.wall
+    den = (p.ep_s * p.rho_s * p.u_s * p.Cp_s + rhog_
+           * p.u_g * p.Cp_g)
+    dden = drhog * p.u_g * p.Cp_g
+    J[6] = (dnum * den - num * dden) / den**2
+    # Equation (20)
+    J[7] = (-(p.u_g**2 * p.ep_s) / (p.dp * p.ep) * 1.75 * 1e-5
+            * drhog)
+    return J
+
+
 # Equations (4), (5) and (6)
-def R(name, C):
+def R(name, C, p=None):
     """Values of the reactions' speed.
 
     Parameters
     ----------
     name : string
         ``1``, ``2`` or ``3``.
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
@@ -81,20 +279,11 @@ def R(name, C):
         Returns the value of the ``name`` equation's reaction speed.
         Returns ``None`` if an incorrect parameter is passed through.
     """
-    if str(name) == '1':
-        # Equation (4)
-        return (c.vit(1, C[6]) / c.P('H2', C)**2.5 * (c.P('CH4', C) *
-                c.P('H2O', C) - c.P('H2', C)**3 * c.P('CO', C) / c.eq(1, C[6]))
-                / DEN(C)**2)
-    elif str(name) == '2':
-        # Equation (5)
-        return (c.vit(2, C[6]) / c.P('H2', C)**3.5 * (c.P('CH4', C) *
-                c.P('H2O', C)**2 - c.P('H2', C)**4 * c.P('CO2', C)
-                / c.eq(2, C[6])) / DEN(C)**2)
-    elif str(name) == '3':
-        # Equation (6)
-        return (c.vit(3, C[6]) / c.P('H2', C) * (c.P('CO', C) * c.P('H2O', C)
-                - c.P('H2', C)*c.P('CO2', C)/c.eq(3, C[6])) / DEN(C)**2)
+    if p is None:
+        p = c.DEFAULT
+    # Equations (4), (5) and (6), see kinetics().
+    if str(name) in ('1', '2', '3'):
+        return kinetics(C, p).R[int(name) - 1]
     else:
         print("Error: value for '" + str(name) + "' not found in R().")
         print("The input values were '" + str(C) + "'.")
@@ -102,36 +291,42 @@ def R(name, C):
 
 
 # Equation (7)
-def DEN(C):
+def DEN(C, p=None):
     """Value of the denominator for R().
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
     numeric
         Returns the value of the denominator used in the equations in R().
     """
-    return (1 + c.ab('CO', C[6])*c.P('CO', C) + c.ab('H2', C[6])*c.P('H2', C)
-            + c.ab('CH4', C[6])*c.P('CH4', C)
-            + c.ab('H2O', C[6])*c.P('H2O', C)/c.P('H2', C))
+    if p is None:
+        p = c.DEFAULT
+    return kinetics(C, p).DEN
 
 
 # Equations (8), (9), (10), (11) and (12)
-def r(name, C):
+def r(name, C, p=None):
     """Values of the formation/consomation rates.
 
     Parameters
     ----------
     name : string
         ``CH4``, ``H2O``, ``H2``, ``CO`` or ``CO2``
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
@@ -139,21 +334,12 @@ def r(name, C):
         Returns the values of ``name``'s formation/consomation rate.
         Returns ``None`` if an incorrect parameter is passed through.
     """
-    if str(name) == 'CH4':
-        # Equation (8)
-        return -R(1, C) - R(2, C)
-    elif str(name) == 'H2O':
-        # Equation (9)
-        return -R(1, C) - 2*R(2, C) - R(3, C)
-    elif str(name) == 'H2':
-        # Equation (10)
-        return 3*R(1, C) + 4*R(2, C) + R(3, C)
-    elif str(name) == 'CO':
-        # Equation (11)
-        return R(1, C) - R(3, C)
-    elif str(name) == 'CO2':
-        # Equation (12)
-        return R(2, C) + R(3, C)
+    if p is None:
+        p = c.DEFAULT
+    # Equations (8), (9), (10), (11) and (12), see NU and kinetics().
+    species = ['CH4', 'H2O', 'H2', 'CO', 'CO2']
+    if str(name) in species:
+        return kinetics(C, p).r[species.index(str(name))]
     else:
         print("Error: value for '" + str(name) + "' not found in r().")
         print("The input values were '" + str(C) + "'.")
@@ -161,32 +347,40 @@ def r(name, C):
 
 
 # Equation (14)
-def kc(C):
+def kc(C, p=None):
     """Value of the apparent rate of carbonation.
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
     numeric
         Returns the value of the apparent rate of carbonation.
     """
-    return c.M('k') * np.exp(c.N('k') / C[6])
+    if p is None:
+        p = c.DEFAULT
+    return p.M_k * np.exp(p.N_k / C[6])
 
 
 # Equation (15)
-def b(C):
+def b(C, p=None):
     """Value of the time to get halfway to Xu.
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
@@ -194,91 +388,146 @@ def b(C):
         Returns the value of the time to get halfway to the ultimate
         fractional conversion of CaO, Xu.
     """
-    return c.M('b') * np.exp(c.N('b') / C[6])
+    if p is None:
+        p = c.DEFAULT
+    return p.M_b * np.exp(p.N_b / C[6])
 
 
 # Equation (18)
-def rcbn(C):
+def rcbn(C, p=None):
     """Value of the rate of consomation of CO2 by carbonation.
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
     numeric
         Returns the value of the rate of consomation of CO2 by carbonation.
     """
-    return (kc(C) / c.MM('CaO')) * (1 - C[5]/Xu(C))**2
+    if p is None:
+        p = c.DEFAULT
+    return kinetics(C, p).rcbn
 
 
 # Equation (18) bis
-def Xu(C):
+def Xu(C, p=None):
     """Value of the ultimate fractional conversion of CaO.
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
     numeric
         Returns the value of the ultimate fractional conversion of CaO.
     """
-    return kc(C) * b(C)
+    if p is None:
+        p = c.DEFAULT
+    return kc(C, p) * b(C, p)
 
 
 # Equation (19) bis bis
-def rhog(C):
+def rhog(C, p=None):
     """Value of the gas phase's density.
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
     numeric
         Returns the value of the gas phase's density.
     """
-    MM = np.array([c.MM('CH4'), c.MM('H2O'), c.MM('H2'),
-                   c.MM('CO'), c.MM('CO2')])
-    P = np.array([c.P('CH4', C), c.P('H2O', C), c.P('H2', C),
-                  c.P('CO', C), c.P('CO2', C), ])
-    return 1 / (c.R() * C[6]) * sum(MM * P * 100000)
+    if p is None:
+        p = c.DEFAULT
+    # Only the partial pressures are needed, not the whole of kinetics().
+    C = np.asarray(C, dtype=float)
+    return _rhog(C[7] * C[:5] / C[:5].sum(axis=0), C[6], p)
 
 
 # Equation of the reactor's energy balance
-def hW(C):
+def hW(C, p=None):
     """Value of the reactor's wall heat transfer coefficient.
 
     Parameters
     ----------
-    C : array, shape(8)
+    C : array, shape(8) or shape(8, N)
         Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
         fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
 
     Returns
     -------
     numeric
         Returns the value of the reactor's wall heat transfer coefficient.
     """
-    Rep = c.u('g') * c.ep() * rhog(C) * c.dp() / c.mu()
-    if Rep > 20 and 0.05 < c.dp()/c.dim('r') < 0.3:
-        return (2.03 * c.k('g') / c.dim('r') * Rep**0.8 * np.exp(-6 * c.dp()
-                / c.dim('r')))
-    elif Rep <= 20:
-        kz0 = (c.k('g') * (c.ep() + (1 - c.ep())/(0.139*c.ep() - 0.0339
-               + 2/3*(c.k('g') / c.k('s')))))
-        return 6.15 * (kz0 / c.dim('r'))
-    else:
+    if p is None:
+        p = c.DEFAULT
+    C = np.asarray(C, dtype=float)
+    return _hW(rhog(C, p), C, p)
+
+
+# The sub-equations of kinetics() are kept in separate functions so that
+# profiling.Profiler can time each of them.
+def _R(P_, ab_, eq_, vit_):
+    # Denominator and reactions' speeds from the partial pressures and the
+    # temperature dependent constants.
+    pCH4, pH2O, pH2, pCO, pCO2 = P_
+    # Equation (7)
+    DEN_ = 1 + ab_[3]*pCO + ab_[2]*pH2 + ab_[0]*pCH4 + ab_[1]*pH2O/pH2
+    DEN2 = DEN_**2
+    # Equations (4), (5) and (6)
+    R_ = np.array([vit_[0] / pH2**2.5 * (pCH4*pH2O - pH2**3*pCO/eq_[0])
+                   / DEN2,
+                   vit_[1] / pH2**3.5 * (pCH4*pH2O**2 - pH2**4*pCO2/eq_[1])
+                   / DEN2,
+                   vit_[2] / pH2 * (pCO*pH2O - pH2*pCO2/eq_[2]) / DEN2])
+    return DEN_, R_
+
+
+def _rcbn(C, kc_, b_, p):
+    # Equations (18) bis and (18): Xu and rcbn from kc and b (equations
+    # (14) and (15)).
+    Xu_ = kc_ * b_
+    return kc_, Xu_, (kc_ / p.MM_CaO) * (1 - C[5]/Xu_)**2
+
+
+def _rhog(P_, T, p):
+    # Equation (19) bis bis
+    return 1 / (p.R * T) * np.einsum('i...,i...', p.MM_g, P_) * 100000
+
+
+def _hW(rhog_, C, p):
+    # Wall heat transfer coefficient from the gas density, see hW().
+    Rep = p.Rep_g * rhog_
+    # The correlation is chosen column-wise, depending on the particle
+    # Reynolds number of each state.
+    turbulent = Rep > 20
+    if np.any(turbulent & ((p.dp/p.radius <= 0.05) | (p.dp/p.radius >= 0.3))):
         print("Error in hW().")
         print("The input values were '" + str(C) + "'.")
         return None
+    with np.errstate(invalid='ignore'):
+        hW_turbulent = p.hW_turb * Rep**0.8
+    return np.where(turbulent, hW_turbulent, p.hW_lam)[()]
@@ -0,0 +1,339 @@
+"""Module containing the compiled version of odefunction.
+
+This module contains the same equations as ``odefunction.py`` (with the
+values of ``constants.Parameters``) compiled with Numba, together with
+compiled loops of fixed-step integrators. It is used by the integrators of
+``SimReacteur.py`` when they are called with ``backend='numba'``.
+
+Numba is optional: if it is not installed, ``AVAILABLE`` is ``False`` and the
+integrators fall back to the NumPy version of ``odefunction``.
+
++------------------+---------------------------------------------------------+
+| function         | description                                             |
++==================+=========================================================+
+| ``odefunction()``| Same as ``odefunction.odefunction()``, compiled.        |
++------------------+---------------------------------------------------------+
+| ``march()``      | Compiled fixed-step integration (explicit Euler or      |
+|                  | RK4), recording one step every ``every`` steps.         |
++------------------+---------------------------------------------------------+
+| ``stream()``     | Same as ``march()``, by chunks of constant size.        |
++------------------+---------------------------------------------------------+
+| ``pack()``       | Returns the values of a ``Parameters`` object as the    |
+|                  | flat array used by the compiled functions.              |
++------------------+---------------------------------------------------------+
+
+Credits
+-------
+Created on Sun Oct 18 04:42:05 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Local module imports
+import constants as c
+
+
+# %% [1] Main Code
+# Whether Numba is installed.
+AVAILABLE = numba is not None
+
+# Layout of the array of parameters (see pack()): the scalar values first,
+# then the vectors, with their sizes.
+SCALARS = ('TW', 'u_g', 'u_s', 'rho_CaO', 'rho_cat', 'Cp_g', 'Cp_s', 'ep',
+           'eta', 'dp', 'mu', 'R', 'radius', 'H_cbn', 'MM_CaO', 'M_k', 'N_k',
+           'M_b', 'N_b', 'rho_s', 'ep_s', 'wall', 'Rep_g', 'hW_lam',
+           'hW_turb')
+VECTORS = (('H', 3), ('MM_g', 5), ('vit_A', 3), ('vit_E', 3), ('vit_T', 3),
+           ('ab_A', 4), ('ab_E', 4), ('ab_T', 4), ('eq_A', 2), ('eq_E', 2))
+(TW, U_G, U_S, RHO_CAO, RHO_CAT, CP_G, CP_S, EP, ETA, DP, MU, R, RADIUS,
+ H_CBN, MM_CAO, M_K, N_K, M_B, N_B, RHO_S, EP_S, WALL, REP_G, HW_LAM,
+ HW_TURB) = range(len(SCALARS))
+(H, MM_G, VIT_A, VIT_E, VIT_T, AB_A, AB_E, AB_T, EQ_A, EQ_E) = np.cumsum(
+    [len(SCALARS)] + [size for _, size in VECTORS[:-1]]).tolist()
+
+
+def _jit(function):
+    # Compiles a function with Numba, if it is installed.
+    if AVAILABLE:
+        return numba.njit(cache=True)(function)
+    return function
+
+
+def pack(p=None):
+    """Values of the parameters, as a flat array.
+
+    Parameters
+    ----------
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``. Its values must all be scalars (or the
+        vectors of a single reactor).
+
+    Returns
+    -------
+    array
+        Returns the values of ``SCALARS`` followed by the ones of
+        ``VECTORS``.
+
+    Raises
+    ------
+    ValueError
+        If ``p`` is a batch of parameters (array overrides), which the
+        compiled functions do not support.
+    """
+    if p is None:
+        p = c.DEFAULT
+    values = [np.asarray(getattr(p, name), dtype=float)
+              for name in SCALARS]
+    values += [np.asarray(getattr(p, name), dtype=float)
+               for name, _ in VECTORS]
+    shapes = [()] * len(SCALARS) + [(size,) for _, size in VECTORS]
+    for name, value, shape in zip(SCALARS + tuple(name for name, _ in VECTORS),
+                                  values, shapes):
+        if value.shape != shape:
+            raise ValueError("the numba backend needs a single reactor: '"
+                             + name + "' has the shape " + str(value.shape)
+                             + " instead of " + str(shape) + ".")
+    return np.concatenate([value.ravel() for value in values])
+
+
+@_jit
+def _rhs(C, P, dC):
+    # Equations of odefunction.odefunction() for a single state C, written
+    # into dC.
+    T = C[6]
+    # Partial pressures of CH4, H2O, H2, CO and CO2.
+    S = C[0] + C[1] + C[2] + C[3] + C[4]
+    pCH4 = C[7] * C[0] / S
+    pH2O = C[7] * C[1] / S
+    pH2 = C[7] * C[2] / S
+    pCO = C[7] * C[3] / S
+    pCO2 = C[7] * C[4] / S
+    # Temperature dependent constants (constants.Parameters.vit(), ab() and
+    # eq()).
+    vit1 = P[VIT_A] * np.exp((-P[VIT_E] / P[R]) * (1/T - 1/P[VIT_T]))
+    vit2 = P[VIT_A + 1] * np.exp((-P[VIT_E + 1] / P[R])
+                                 * (1/T - 1/P[VIT_T + 1]))
+    vit3 = P[VIT_A + 2] * np.exp((-P[VIT_E + 2] / P[R])
+                                 * (1/T - 1/P[VIT_T + 2]))
+    aCH4 = P[AB_A] * np.exp((P[AB_E] / P[R]) * (1/T - 1/P[AB_T]))
+    aH2O = P[AB_A + 1] * np.exp((P[AB_E + 1] / P[R]) * (1/T - 1/P[AB_T + 1]))
+    aH2 = P[AB_A + 2] * np.exp((P[AB_E + 2] / P[R]) * (1/T - 1/P[AB_T + 2]))
+    aCO = P[AB_A + 3] * np.exp((P[AB_E + 3] / P[R]) * (1/T - 1/P[AB_T + 3]))
+    K1 = P[EQ_A] * np.exp(-P[EQ_E] / (P[R] * T))
+    K3 = P[EQ_A + 1] * np.exp(-P[EQ_E + 1] / (P[R] * T))
+    K2 = K1 * K3
+    # Equation (7)
+    DEN2 = (1 + aCO*pCO + aH2*pH2 + aCH4*pCH4 + aH2O*pH2O/pH2)**2
+    # Equations (4), (5) and (6)
+    R1 = vit1 / pH2**2.5 * (pCH4*pH2O - pH2**3*pCO/K1) / DEN2
+    R2 = vit2 / pH2**3.5 * (pCH4*pH2O**2 - pH2**4*pCO2/K2) / DEN2
+    R3 = vit3 / pH2 * (pCO*pH2O - pH2*pCO2/K3) / DEN2
+    # Equations (14), (15), (18) bis and (18)
+    kc = P[M_K] * np.exp(P[N_K] / T)
+    Xu = kc * P[M_B] * np.exp(P[N_B] / T)
+    rcbn = (kc / P[MM_CAO]) * (1 - C[5]/Xu)**2
+    # Equation (19) bis bis
+    rhog = (P[MM_G]*pCH4 + P[MM_G + 1]*pH2O + P[MM_G + 2]*pH2
+            + P[MM_G + 3]*pCO + P[MM_G + 4]*pCO2) * 100000 / (P[R] * T)
+    # Wall heat transfer coefficient (nan where odefunction.hW() fails).
+    Rep = P[REP_G] * rhog
+    if Rep > 20:
+        if 0.05 < P[DP]/P[RADIUS] < 0.3:
+            hW = P[HW_TURB] * Rep**0.8
+        else:
+            hW = np.nan
+    else:
+        hW = P[HW_LAM]
+    # Equations (8) to (12) and (16): dC/dz of CH4, H2O, H2, CO and CO2.
+    a = P[ETA] * P[EP_S] * P[RHO_CAT] / P[U_G]
+    b = P[EP_S] * P[RHO_CAO] * rcbn / P[U_G]
+    dC[0] = a * (-R1 - R2) - b
+    dC[1] = a * (-R1 - 2*R2 - R3) - b
+    dC[2] = a * (3*R1 + 4*R2 + R3) - b
+    dC[3] = a * (R1 - R3) - b
+    dC[4] = a * (R2 + R3) - b
+    # Equation (17): dX/dz
+    dC[5] = P[MM_CAO] / P[U_S] * rcbn
+    # Equation (19): dT/dz
+    dC[6] = ((-P[EP_S] * P[RHO_CAT] * P[ETA] * (R1*P[H] + R2*P[H + 1]
+              + R3*P[H + 2]) - P[EP_S] * P[RHO_CAO] * rcbn * P[H_CBN]
+              + hW * (P[TW] - T) * P[WALL])
+             / (P[EP_S] * P[RHO_S] * P[U_S] * P[CP_S]
+                + rhog * P[U_G] * P[CP_G]))
+    # Equation (20): dP/dz
+    dC[7] = (-(rhog * P[U_G]**2 * P[EP_S]) / (P[DP] * P[EP])
+             * ((150 * P[EP_S] * P[MU]) / (P[DP] * rhog * P[U_G]) + 1.75)
+             * 1e-5)
+
+
+@_jit
+def _rhsColumns(C, P):
+    # _rhs() for every column of a batch of states C, shape(8, N).
+    dC = np.empty(C.shape)
+    y = np.empty(8)
+    dy = np.empty(8)
+    for j in range(C.shape[1]):
+        for i in range(8):
+            y[i] = C[i, j]
+        _rhs(y, P, dy)
+        for i in range(8):
+            dC[i, j] = dy[i]
+    return dC
+
+
+@_jit
+def _march(x0, step, start, n, every, y0, P, rk4, size):
+    # Fixed-step integration (explicit Euler, or RK4 if rk4 is True) from
+    # the point start, of state y0, recording one point every `every` and
+    # the last one (the point n - 1), until `size` points are recorded.
+    # Returns the recorded points, the index of the next point and its
+    # state, so that the integration can be continued by chunks.
+    xs = np.empty(size)
+    ys = np.empty((size, 8))
+    y = y0.copy()
+    k1 = np.empty(8)
+    k2 = np.empty(8)
+    k3 = np.empty(8)
+    k4 = np.empty(8)
+    yi = np.empty(8)
+    i = start
+    j = 0
+    while i < n and j < size:
+        if i % every == 0 or i == n - 1:
+            xs[j] = x0 + i*step
+            ys[j] = y
+            j += 1
+        if i == n - 1:
+            i += 1
+            break
+        _rhs(y, P, k1)
+        if rk4:
+            for k in range(8):
+                yi[k] = y[k] + step/2*k1[k]
+            _rhs(yi, P, k2)
+            for k in range(8):
+                yi[k] = y[k] + step/2*k2[k]
+            _rhs(yi, P, k3)
+            for k in range(8):
+                yi[k] = y[k] + step*k3[k]
+            _rhs(yi, P, k4)
+            for k in range(8):
+                y[k] = y[k] + step*(k1[k]/6 + k2[k]/3 + k3[k]/3 + k4[k]/6)
+        else:
+            for k in range(8):
+                y[k] = y[k] + step*k1[k]
+        i += 1
+    return xs[:j], ys[:j], i, y
+
+
+# The last parameters packed by odefunction(), kept to avoid packing the same
+# Parameters object at every call.
+_last = [None, None]
+
+
+def odefunction(z, C, p=None):
+    """Values of the differential equation, compiled.
+
+    Same as ``odefunction.odefunction()``, for a single state or a batch of
+    states. Where ``odefunction.hW()`` fails, the derivatives are ``nan``.
+
+    Parameters
+    ----------
+    z : numeric
+        Value of the axial distance.
+    C : array, shape(8) or shape(8, N)
+        Array of the concentrations of CH4, H2O, H2, CO and CO2, the conversion
+        fraction, the temperature and the pressure: [C, C, C, C, C, X, T, P].
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+
+    Returns
+    -------
+    dC : array, shape(8) or shape(8, N)
+        Returns the values of the 8 differential equations.
+    """
+    if p is None:
+        p = c.DEFAULT
+    if _last[0] is not p:
+        _last[:] = [p, pack(p)]
+    C = np.asarray(C, dtype=float)
+    if C.ndim == 1:
+        dC = np.empty(8)
+        _rhs(C, _last[1], dC)
+        return dC
+    return _rhsColumns(np.ascontiguousarray(C), _last[1])
+
+
+def march(x_int, y0, step, every=1, method='euler', p=None):
+    """Compiled fixed-step integration.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration, on the grid of
+        ``np.arange(x_int[0], x_int[1], step)``.
+    y0 : array, shape(8)
+        Initial state.
+    step : numeric
+        Size of the steps.
+    every : int, *default* 1
+        Records one step every ``every`` steps (and the last one).
+    method : string, *default* ``euler``
+        ``euler`` or ``rk4``.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+
+    Returns
+    -------
+    array
+        First value is the array of the recorded positions, shape(n).
+        Second value is the array of the recorded states, shape(8, n).
+    """
+    n = max(int(np.ceil((x_int[1] - x_int[0]) / step)), 1)
+    size = (n - 1) // every + 1 + (1 if (n - 1) % every else 0)
+    return next(stream(x_int, y0, step, every, method, p, size))
+
+
+def stream(x_int, y0, step, every=1, method='euler', p=None, chunk=4096):
+    """Compiled fixed-step integration, by chunks.
+
+    Generator version of ``march()``: the compiled loop stops every
+    ``chunk`` recorded points, so that the memory used does not depend on
+    the number of steps.
+
+    Parameters
+    ----------
+    x_int, y0, step, every, method, p
+        See ``march()``.
+    chunk : int, *default* 4096
+        Maximum number of points in a chunk.
+
+    Yields
+    ------
+    array
+        First value is the array of the positions of the chunk, shape(m).
+        Second value is the array of the states of the chunk, shape(8, m).
+    """
+    n = max(int(np.ceil((x_int[1] - x_int[0]) / step)), 1)
+    x0 = float(x_int[0])
+    step = float(step)
+    every = int(every)
+    P = pack(p)
+    rk4 = str(method).lower() == 'rk4'
+    y = np.asarray(y0, dtype=float).reshape(8)
+    i = 0
+    while i < n:
+        xs, ys, i, y = _march(x0, step, i, n, every, y, P, rk4, int(chunk))
+        yield [xs, ys.T]
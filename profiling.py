@@ -0,0 +1,291 @@
+"""Module to profile the simulations.
+
+This module contains the class ``Profiler``, a context in which the calls to
+odefunction and to its sub-equations are counted and timed, and the
+statistics of the integrators of ``SimReacteur.py`` are recorded. Outside of
+a profiler, the functions are the original ones: profiling costs nothing
+when it is not used.
+
+Exemple
+-------
+::
+
+    >>> with Profiler() as prof:
+    ...     x, y = calculConcentrationsIVP([0, 0.29], y0)
+    >>> prof.report()['calls']['odefunction']
+    {'count': 236, 'time': 0.0534}
+    >>> prof.to_json('profile.json')
+
+Credits
+-------
+Created on Sun Oct 18 04:43:40 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import functools
+import json
+import sys
+import time
+
+# Third-party librairy imports.
+import numpy as np
+import scipy.integrate
+from scipy.integrate._ivp.rk import RungeKutta
+
+# Local module imports
+import constants as c
+import odefunction
+import odejit
+import SimReacteur
+
+
+# %% [1] Main Code
+# Functions counted and timed by a profiler: name in the report, module or
+# class and attribute. The times are cumulative (the time of kinetics
+# includes the one of R, rcbn, ...).
+TIMED = (('odefunction', odefunction, 'odefunction'),
+         ('jacobian', odefunction, 'jacobian'),
+         ('kinetics', odefunction, 'kinetics'),
+         ('coefficients', c.Parameters, 'coefficients'),
+         ('R', odefunction, '_R'),
+         ('rcbn', odefunction, '_rcbn'),
+         ('rhog', odefunction, '_rhog'),
+         ('hW', odefunction, '_hW'),
+         ('odejit.odefunction', odejit, 'odefunction'))
+
+# Solvers of solve_ivp whose rejected steps can be counted: the explicit
+# Runge-Kutta methods, which evaluate odefunction n_stages times per attempt.
+SOLVERS = {'RK23': scipy.integrate.RK23, 'RK45': scipy.integrate.RK45,
+           'DOP853': scipy.integrate.DOP853, 'Radau': scipy.integrate.Radau,
+           'BDF': scipy.integrate.BDF, 'LSODA': scipy.integrate.LSODA}
+
+# Profiler currently active, there can only be one at a time.
+_active = [None]
+
+
+class Profiler:
+    """Context profiling the simulations run in it.
+
+    While it is active (``with Profiler() as prof:`` or between
+    ``start()`` and ``stop()``), the functions of ``TIMED`` are replaced by
+    versions counting and timing their calls, and every run of
+    ``calculConcentrationsIVP`` (through ``solve_ivp``) and of the
+    fixed-step integrators records its statistics. Simulations run in
+    other processes (see ``sweep.py``) are not profiled.
+
+    Attributes
+    ----------
+    calls : dict
+        Number of calls (``count``) and cumulative time in seconds
+        (``time``) of every function of ``TIMED``.
+    runs : list
+        Statistics of every integration, see ``report()``.
+    """
+
+    def __init__(self):
+        self.calls = {name: {'count': 0, 'time': 0.0}
+                      for name, _, _ in TIMED}
+        self.runs = []
+        self.time = 0.0
+        self._patches = []
+        self._start = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def start(self):
+        """Starts profiling.
+
+        Returns
+        -------
+        bool
+            Returns ``False`` if another profiler is already active.
+        """
+        if _active[0] is not None:
+            print("Error: a Profiler is already active.")
+            return False
+        _active[0] = self
+        for name, owner, attribute in TIMED:
+            self._patch(owner, attribute, self._timed(
+                name, getattr(owner, attribute)))
+        self._patch(SimReacteur, 'solve_ivp', self._solveIVP(
+            SimReacteur.solve_ivp))
+        self._patch(SimReacteur, '_march', self._march(SimReacteur._march))
+        self._patch(odejit, 'stream', self._streamJIT(odejit.stream))
+        self._start = time.perf_counter()
+        return True
+
+    def stop(self):
+        """Stops profiling and restores the original functions."""
+        if _active[0] is not self:
+            return
+        self.time += time.perf_counter() - self._start
+        for namespace, attribute, original in reversed(self._patches):
+            setattr(namespace, attribute, original)
+        self._patches = []
+        _active[0] = None
+
+    def report(self):
+        """Report of the profiling.
+
+        Returns
+        -------
+        dict
+            Returns a dict with:
+
+            - ``time``: the time profiled, in seconds;
+            - ``calls``: see ``calls``;
+            - ``runs``: one dict per integration, with the ``solver``, its
+              duration (``time``) and, for ``solve_ivp``, ``status``,
+              ``nfev``, ``njev``, ``nlu``, the number of ``accepted``
+              steps and of ``rejected`` ones (``None`` for the implicit
+              methods, which do not expose it), for the fixed-step
+              integrators, the number of ``steps``.
+        """
+        return {'time': self.time,
+                'calls': {name: dict(value)
+                          for name, value in self.calls.items()},
+                'runs': [dict(run) for run in self.runs]}
+
+    def to_json(self, path=None):
+        """Report of the profiling, in JSON.
+
+        Parameters
+        ----------
+        path : string, *optional*
+            File to write the report to.
+
+        Returns
+        -------
+        string
+            Returns the report (see ``report()``) in JSON.
+        """
+        text = json.dumps(self.report(), indent=2)
+        if path is not None:
+            with open(path, 'w') as file:
+                file.write(text)
+        return text
+
+    def _patch(self, owner, attribute, function):
+        # Replaces owner.attribute by function, and so in every module that
+        # imported it with "from module import attribute".
+        original = getattr(owner, attribute)
+        namespaces = [owner]
+        if not isinstance(owner, type):
+            namespaces += [module for module in list(sys.modules.values())
+                           if module is not owner and getattr(
+                               module, '__dict__', {}).get(attribute)
+                           is original]
+        for namespace in namespaces:
+            setattr(namespace, attribute, function)
+            self._patches.append((namespace, attribute, original))
+
+    def _timed(self, name, function):
+        # Version of function counting and timing its calls.
+        record = self.calls[name]
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record['count'] += 1
+                record['time'] += time.perf_counter() - start
+        return timed
+
+    def _solveIVP(self, solve_ivp):
+        # Version of solve_ivp recording the statistics of its runs.
+        runs = self.runs
+
+        @functools.wraps(solve_ivp)
+        def profiled(fun, t_span, y0, method='RK45', **kwargs):
+            run = {'solver': getattr(method, '__name__', str(method))}
+            counts = {'accepted': 0, 'attempts': 0}
+            solver = SOLVERS.get(method, method)
+            if isinstance(solver, type):
+                method = _counted(solver, counts)
+            start = time.perf_counter()
+            sol = solve_ivp(fun, t_span, y0, method=method, **kwargs)
+            run['time'] = time.perf_counter() - start
+            run['status'] = int(sol.status)
+            for stat in ('nfev', 'njev', 'nlu'):
+                run[stat] = int(getattr(sol, stat))
+            run['accepted'] = counts['accepted']
+            if isinstance(solver, type) and issubclass(solver, RungeKutta):
+                run['rejected'] = counts['attempts'] - counts['accepted']
+            else:
+                run['rejected'] = None
+            runs.append(run)
+            return sol
+        return profiled
+
+    def _march(self, march):
+        # Version of SimReacteur._march() counting the steps of a fixed-step
+        # integration.
+        runs = self.runs
+
+        @functools.wraps(march)
+        def profiled(advance, *args, **kwargs):
+            run = {'solver': getattr(advance, '__name__', 'march'),
+                   'steps': 0, 'time': 0.0}
+            runs.append(run)
+
+            def counted(x, y, h):
+                run['steps'] += 1
+                return advance(x, y, h)
+
+            start = time.perf_counter()
+            for chunk in march(counted, *args, **kwargs):
+                run['time'] += time.perf_counter() - start
+                yield chunk
+                start = time.perf_counter()
+            run['time'] += time.perf_counter() - start
+        return profiled
+
+    def _streamJIT(self, stream):
+        # Version of odejit.stream() (used by odejit.march()) counting the
+        # steps of a compiled integration.
+        runs = self.runs
+
+        @functools.wraps(stream)
+        def profiled(x_int, y0, step, every=1, method='euler', p=None,
+                     chunk=4096):
+            run = {'solver': 'odejit.' + str(method).lower(), 'steps': 0,
+                   'time': 0.0}
+            runs.append(run)
+            start = time.perf_counter()
+            for xs, ys in stream(x_int, y0, step, every, method, p, chunk):
+                run['time'] += time.perf_counter() - start
+                yield [xs, ys]
+                start = time.perf_counter()
+            run['time'] += time.perf_counter() - start
+            run['steps'] = max(int(np.ceil((x_int[1] - x_int[0]) / step)),
+                               1) - 1
+        return profiled
+
+
+def _counted(solver, counts):
+    # Subclass of a solver of solve_ivp counting its accepted steps and, for
+    # the Runge-Kutta methods, its attempted ones.
+    class Counted(solver):
+        def _step_impl(self):
+            nfev = self.nfev
+            result = solver._step_impl(self)
+            if result[0]:
+                counts['accepted'] += 1
+            if isinstance(self, RungeKutta):
+                counts['attempts'] += (self.nfev - nfev) // self.n_stages
+            return result
+
+    Counted.__name__ = solver.__name__
+    return Counted
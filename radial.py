@@ -0,0 +1,190 @@
+"""Module for the axial-radial (2D) model of the reactor.
+
+This module contains the two-dimensional model of the reactor: the radius
+is divided into N rings of equal width, each ring being a plug flow with
+the kinetics of ``odefunction`` (the N rings are evaluated together as a
+batch of states), and the rings exchange heat by radial conduction (and the
+gas species by radial dispersion). Only the outer ring exchanges heat with
+the wall, with the coefficient ``odefunction.hW()``. With N = 1 the model is
+the one-dimensional model of ``odefunction``.
+
+The method of lines gives a system of 8 N equations whose Jacobian is block
+tridiagonal (each ring only depends on its two neighbours): the stiff
+solvers are given its sparsity (or its band for ``LSODA``), so that the
+cost of an evaluation of the Jacobian does not grow with N.
+
++-------------------------------+--------------------------------------------+
+| function                      | description                                |
++===============================+============================================+
+| ``calculConcentrations2D()``  | Returns the states of the rings along the  |
+|                               | reactor.                                   |
++-------------------------------+--------------------------------------------+
+| ``average()``                 | Returns the mean of the states over the    |
+|                               | cross-section.                             |
++-------------------------------+--------------------------------------------+
+
+Exemple
+-------
+::
+
+    >>> x, y = calculConcentrations2D([0, 0.29], y0, N=50)
+    >>> y[6, :, -1]           # radial profile of the outlet temperature
+    >>> average(y)[6, -1]     # mean outlet temperature
+
+Credits
+-------
+Created on Sun Oct 18 05:12:08 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import csr_matrix, kron
+
+# Local module imports
+import constants as c
+from odefunction import odefunction, rhog, hW
+from SimReacteur import Solution
+
+
+# %% [1] Main Code
+def calculConcentrations2D(x_int, y0, N=10, method='BDF', rtol=0.5e-6,
+                           atol=1e-6, p=None, k_r=None, D_r=None,
+                           dense_output=True, **kwargs):
+    """Integration of the axial-radial model with a solver of solve_ivp.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : array, shape(8) or shape(8, N)
+        Initial state, the same in every ring or one per ring (from the
+        centre to the wall).
+    N : int, *default* 10
+        Number of rings.
+    method : string, *default* ``BDF``
+        Method of ``solve_ivp``. ``Radau`` and ``BDF`` are given the
+        sparsity of the Jacobian, ``LSODA`` its band.
+    rtol, atol : numeric, *default* 0.5e-6 and 1e-6
+        Tolerances.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    k_r : numeric, *optional*
+        Effective radial conductivity of the bed. The default is the
+        stagnant conductivity ``p.kz0`` plus the dispersion by the gas flow,
+        ``0.1 rhog u_g Cp_g dp``.
+    D_r : numeric, *optional*
+        Radial dispersion coefficient of the gas species. The default is
+        ``u_g dp / 10`` (radial Peclet number of 10); 0 for none.
+    dense_output : bool, *default* True
+        Whether the solution keeps the dense interpolant of ``solve_ivp``.
+    **kwargs : dict, *optional*
+        Extra parameters of ``solve_ivp``.
+
+    Returns
+    -------
+    Solution
+        Returns the solution (see ``SimReacteur.Solution``), which unpacks
+        as: first value the array of the positions, second value the array
+        of the states, shape(8, N, n), ``y[:, j]`` being the states of the
+        ring j (from the centre to the wall).
+        Returns ``None`` if an incorrect initial state is passed through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    y0 = np.asarray(y0, dtype=float)
+    if y0.ndim == 1:
+        y0 = np.repeat(y0[:, None], N, axis=1)
+    if y0.shape != (8, N):
+        print("Error: initial state of shape " + str(y0.shape) + " instead "
+              "of (8,) or " + str((8, N)) + ".")
+        return None
+    if D_r is None:
+        D_r = p.u_g * p.dp / 10
+    # Geometry of the rings, divided by pi: width, cross-section areas and
+    # perimeters of the faces between two rings.
+    dr = p.radius / N
+    area = dr**2 * (2*np.arange(N) + 1)
+    perimeter = 2 * dr * np.arange(1, N)
+
+    def fun(z, u):
+        # The states are stored ring by ring: u[8*j + i] is the state i of
+        # the ring j.
+        C = u.reshape(N, 8).T
+        dC = odefunction(z, C, p)
+        T = C[6]
+        rhog_ = rhog(C, p)
+        hW_ = hW(C, p)
+        # The exchange with the wall of odefunction (every ring) is replaced
+        # by the radial conduction and the exchange of the outer ring.
+        heat = -hW_ * (p.TW - T) * p.wall
+        heat[-1] += hW_[-1] * (p.TW - T[-1]) * p.wall * p.radius**2 / area[-1]
+        if N > 1:
+            if k_r is None:
+                rhof = (rhog_[1:] + rhog_[:-1]) / 2
+                k = p.kz0 + 0.1 * rhof * p.u_g * p.Cp_g * p.dp
+            else:
+                k = k_r
+            q = k * perimeter * np.diff(T) / dr
+            heat[:-1] += q / area[:-1]
+            heat[1:] -= q / area[1:]
+            if D_r:
+                q = D_r * perimeter * np.diff(C[:5], axis=1) / dr
+                dC[:5, :-1] += q / area[:-1] / p.u_g
+                dC[:5, 1:] -= q / area[1:] / p.u_g
+        dC[6] += heat / (p.ep_s * p.rho_s * p.u_s * p.Cp_s
+                         + rhog_ * p.u_g * p.Cp_g)
+        return dC.T.ravel()
+
+    if method in ('Radau', 'BDF'):
+        # Block tridiagonal: a ring depends on itself and its neighbours.
+        rings = csr_matrix(np.eye(N, k=-1) + np.eye(N) + np.eye(N, k=1))
+        kwargs.setdefault('jac_sparsity', kron(rings, np.ones((8, 8)),
+                                               format='csr'))
+    elif method == 'LSODA':
+        kwargs.setdefault('lband', 15)
+        kwargs.setdefault('uband', 15)
+    sol = solve_ivp(fun, x_int, y0.T.ravel(), method=method, rtol=rtol,
+                    atol=atol, dense_output=dense_output, **kwargs)
+    interpolant = _Rings(sol.sol, N) if sol.sol is not None else None
+    return Solution(sol.t, sol.y.reshape(N, 8, -1).swapaxes(0, 1),
+                    interpolant, p)
+
+
+def average(y):
+    """Mean of the states over the cross-section.
+
+    Parameters
+    ----------
+    y : array, shape(8, N) or shape(8, N, n)
+        States of the N rings, see ``calculConcentrations2D()``.
+
+    Returns
+    -------
+    array, shape(8) or shape(8, n)
+        Returns the mean of the states of the rings weighted by their areas
+        (as the gas velocity is uniform, the mixing-cup mean of the
+        concentrations).
+    """
+    y = np.asarray(y, dtype=float)
+    N = y.shape[1]
+    weights = (2*np.arange(N) + 1) / N**2
+    return np.einsum('j,ij...->i...', weights, y)
+
+
+class _Rings:
+    # Dense interpolant of the rings, the states of solve_ivp reshaped to
+    # shape(8, N) or shape(8, N, m).
+    def __init__(self, interpolant, N):
+        self.interpolant = interpolant
+        self.N = N
+        self.ts = interpolant.ts
+
+    def __call__(self, z):
+        u = self.interpolant(z)
+        return u.reshape((self.N, 8) + u.shape[1:]).swapaxes(0, 1)
@@ -14,6 +14,7 @@ Created on Mon Feb 12 21:51:24 2024
 # %% [0] Imports
 # First-party imports
 import math
+from collections import OrderedDict
 
 # Third-party imports
 import numpy as np
@@ -52,6 +53,9 @@ def secant(fun, x0, x1, tol=0.5e-03, **kwargs):
     |            | secant method or use a hybrid of the secante and          |
     |            | bisection method.                                         |
     +------------+-----------------------------------------------------------+
+    | ``full_``  | ``True`` or ``False``. Whether to return a ``RootResult`` |
+    | ``output`` | (with the number of evaluations of ``fun``) instead.      |
+    +------------+-----------------------------------------------------------+
 
     Returns
     -------
@@ -65,8 +69,10 @@ def secant(fun, x0, x1, tol=0.5e-03, **kwargs):
     If the function ``fun(x)`` is defined as x**2 - 4::
 
         >>> secant(fun, 1, 3)
-        [1.9999525931544515, 0]
+        [0, 1.9999525931544515]
     """
+    if kwargs.pop('full_output', False):
+        return _result(secant, fun, x0, x1, tol, **kwargs)
     i = 0
     # Checks that the inputs x0 and x1 have different values.
     # (Within a certain tolerance.)
@@ -87,12 +93,12 @@ def secant(fun, x0, x1, tol=0.5e-03, **kwargs):
         return [1]
     # Default value for max_i.
     if 'max_i' in kwargs:
-        max_i = kwargs.max_i
+        max_i = kwargs['max_i']
     else:
         max_i = 1/tol
     # Default value for hybrid.
     if 'hybrid' in kwargs:
-        hybrid = kwargs.hybrid
+        hybrid = kwargs['hybrid']
     else:
         hybrid = False
 
@@ -146,7 +152,7 @@ def secant(fun, x0, x1, tol=0.5e-03, **kwargs):
     return [0, x1]
 
 
-def bisection(fun, x0, x1, tol=0.5e-03):
+def bisection(fun, x0, x1, tol=0.5e-03, full_output=False):
     """The root of a function.
 
     Implementation of the bisection method for approximating the root of
@@ -161,6 +167,9 @@ def bisection(fun, x0, x1, tol=0.5e-03):
         different signs.
     tol : numeric, *default* 0.5e-3
         Tolerance for the value of the root.
+    full_output : bool, *default* False
+        Whether to return a ``RootResult`` (with the number of evaluations
+        of ``fun``) instead.
 
     Returns
     -------
@@ -174,9 +183,11 @@ def bisection(fun, x0, x1, tol=0.5e-03):
     If the function ``fun(x)`` is defined as x**2 - 4::
 
         >>> bisection(fun, 1, 3)
-        [2.00048828125, 0]
+        [0, 2.00048828125]
 
     """
+    if full_output:
+        return _result(bisection, fun, x0, x1, tol)
     # Checks that fun(x0) exists.
     try:
         y0 = fun(x0)
@@ -227,3 +238,555 @@ def bisection(fun, x0, x1, tol=0.5e-03):
         else:
             x0 = xi
     return [0, xi]
+
+
+def brent(fun, x0, x1, tol=0.5e-03, ftol=0, max_i=100):
+    """The root of a function.
+
+    Implementation of Brent's method for approximating the root of a
+    function: inverse quadratic interpolation or secant steps when they
+    make enough progress, bisection steps otherwise. The root stays
+    bracketed, as with ``bisection()``, while converging superlinearly, as
+    with ``secant()``, which saves evaluations of expensive functions.
+
+    Parameters
+    ----------
+    fun : function
+        Function to find the root from.
+    x0, x1 : numeric
+        Values around the root. ``fun(x0)`` and ``fun(x1)`` must have
+        different signs.
+    tol : numeric, *default* 0.5e-3
+        Tolerance for the value of the root.
+    ftol : numeric, *default* 0
+        Tolerance for the value of ``fun`` at the root.
+    max_i : int, *default* 100
+        Maximum number of itirations before exiting.
+
+    Returns
+    -------
+    RootResult
+        Returns the root approximation, the exit state (0 for successfull,
+        1 if there is an error with the inputs, -1 if it does not converge),
+        the number of itirations and of evaluations of ``fun``.
+
+    Exemple
+    -------
+    If the function ``fun(x)`` is defined as x**2 - 4::
+
+        >>> brent(fun, 1, 3)
+        RootResult(root=1.9999775020927033, status=0, iterations=5, nfev=7)
+    """
+    nfev = 0
+    # Checks that fun(x0) and fun(x1) exist.
+    try:
+        a, fa = x0, fun(x0)
+        nfev += 1
+        b, fb = x1, fun(x1)
+        nfev += 1
+    except ZeroDivisionError:
+        return RootResult(np.nan, 1, 0, nfev,
+                          'fun(' + str(x1 if nfev else x0) + ') n\'existe pas')
+    # Checks if fa or fb is the solution within a certain tolerance.
+    if fa == 0 or abs(fa) <= ftol:
+        return RootResult(a, 0, 0, nfev)
+    if fb == 0 or abs(fb) <= ftol:
+        return RootResult(b, 0, 0, nfev)
+    # Checks that fa and fb have a different sign.
+    if fa * fb > 0:
+        return RootResult(np.nan, 1, 0, nfev,
+                          'fun(x0) et fun(x1) sont du même signe.')
+    # c is the other end of the bracket [b, c], a the previous value of b.
+    c, fc = a, fa
+    d = e = b - a
+    for i in range(1, max_i + 1):
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+        # b must be the best approximation.
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol1 = 2 * np.finfo(float).eps * abs(b) + 0.5 * tol
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or fb == 0 or abs(fb) <= ftol:
+            return RootResult(b, 0, i - 1, nfev)
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation, or secant if a == c.
+            s = fb / fa
+            if a == c:
+                p = 2 * xm * s
+                q = 1 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            # The interpolation is only accepted if it falls inside of the
+            # bracket and converges fast enough.
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = e = xm
+        else:
+            # Bisection.
+            d = e = xm
+        a, fa = b, fb
+        b += d if abs(d) > tol1 else math.copysign(tol1, xm)
+        try:
+            fb = fun(b)
+        except ZeroDivisionError:
+            return RootResult(b, -1, i, nfev, 'fun(' + str(b)
+                              + ') n\'existe pas')
+        nfev += 1
+    return RootResult(b, -1, max_i, nfev, 'La fonction n\'a pas convergé '
+                      'après ' + str(max_i) + ' itérations.')
+
+
+class RootResult:
+    """Result of a root finding method.
+
+    Attributes
+    ----------
+    root : numeric
+        Root approximation, ``nan`` if there is an error with the inputs.
+    status : int
+        Exit state of the method: 0 for successfull, 1 if there is an error
+        with the inputs and -1 if it does not converge.
+    iterations : int
+        Number of itirations.
+    nfev : int
+        Number of evaluations of the function.
+    message : string
+        Description of the error, empty if successfull.
+    """
+
+    __slots__ = ('root', 'status', 'iterations', 'nfev', 'message')
+
+    def __init__(self, root, status, iterations, nfev, message=''):
+        self.root = root
+        self.status = status
+        self.iterations = iterations
+        self.nfev = nfev
+        self.message = message
+
+    def __repr__(self):
+        return ('RootResult(root=' + repr(float(self.root)) + ', status='
+                + str(self.status) + ', iterations=' + str(self.iterations)
+                + ', nfev=' + str(self.nfev) + ')')
+
+    @property
+    def converged(self):
+        """``True`` if the method was successfull."""
+        return self.status == 0
+
+
+class Memoize:
+    """Memoizing wrapper of an objective function.
+
+    Wraps a function so that the values already computed are not evaluated
+    again, for example when a search is restarted, a bracket widened or
+    several methods are run on the same expensive function. The wrapper
+    can be passed to every method of this module in place of the function.
+
+    Parameters
+    ----------
+    fun : function
+        Function to memoize, scalar (``secant()``, ``bisection()``,
+        ``brent()``) or vectorized (``secantArray()``, ``bisectionArray()``,
+        also with ``masked=True``).
+    xtol : numeric, *default* 0
+        Values of x closer than ``xtol`` share the same key (x is rounded to
+        a multiple of ``xtol``). With 0, only identical values do.
+    maxsize : int, *default* 1024
+        Maximum number of values kept; the least recently used ones are
+        removed first.
+
+    Attributes
+    ----------
+    hits, misses : int
+        Number of values found and not found in the memory.
+
+    Exemple
+    -------
+    ::
+
+        >>> f = Memoize(fun, xtol=1e-9)
+        >>> result = secant(f, 1, 3)
+        >>> result = brent(f, 1, 3)
+        >>> f.stats()
+        {'hits': 3, 'misses': 10, 'size': 10, 'maxsize': 1024}
+    """
+
+    def __init__(self, fun, xtol=0, maxsize=1024):
+        self.fun = fun
+        self.xtol = xtol
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+
+    def __call__(self, x, mask=None):
+        if np.ndim(x) == 0:
+            return self._scalar(x)
+        return self._array(np.asarray(x, dtype=float), mask)
+
+    def clear(self):
+        """Forgets all of the values and resets the statistics."""
+        self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Statistics of the memory.
+
+        Returns
+        -------
+        dict
+            Returns the number of ``hits`` and ``misses``, the number of
+            values kept (``size``) and ``maxsize``.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'size': len(self._memory), 'maxsize': self.maxsize}
+
+    def _key(self, x):
+        if self.xtol:
+            return int(np.rint(x / self.xtol))
+        return float(x)
+
+    def _get(self, key):
+        # Value of key (and marks it as recently used), or None.
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        self.misses += 1
+        return None
+
+    def _put(self, key, value):
+        self._memory[key] = value
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _scalar(self, x):
+        key = ('scalar', self._key(x))
+        value = self._get(key)
+        if value is None:
+            # The errors (for example a ZeroDivisionError, which tells the
+            # methods that fun(x) does not exist) are remembered as well.
+            try:
+                value = (True, self.fun(x))
+            except ZeroDivisionError as error:
+                value = (False, error)
+            self._put(key, value)
+        if not value[0]:
+            raise value[1]
+        return value[1]
+
+    def _array(self, x, mask):
+        # Each element of a vectorized function is an independent problem,
+        # so the keys also hold the index of the problem.
+        if mask is None:
+            index = np.arange(x.size)
+        else:
+            index = np.nonzero(mask)[0]
+        keys = [('array', int(i), self._key(xi))
+                for i, xi in zip(index, x.ravel())]
+        values = np.empty(x.size)
+        missing = []
+        for j, key in enumerate(keys):
+            value = self._get(key)
+            if value is None:
+                missing.append(j)
+            else:
+                values[j] = value
+        if missing:
+            if mask is None:
+                # The function must be evaluated on the whole array.
+                computed = np.asarray(self.fun(x), dtype=float).ravel()
+                for j in range(x.size):
+                    self._put(keys[j], computed[j])
+                values[missing] = computed[missing]
+            else:
+                submask = np.zeros(mask.shape, dtype=bool)
+                submask[index[missing]] = True
+                computed = np.asarray(self.fun(x.ravel()[missing], submask),
+                                      dtype=float).ravel()
+                for j, value in zip(missing, computed):
+                    self._put(keys[j], value)
+                    values[j] = value
+        return values.reshape(x.shape)
+
+
+def _result(method, fun, *args, **kwargs):
+    # Runs secant() or bisection() while counting the evaluations of fun, and
+    # returns a RootResult instead of their list. Each of their itirations
+    # evaluates fun once, after the two evaluations of x0 and x1.
+    nfev = [0]
+
+    def counted(x):
+        nfev[0] += 1
+        return fun(x)
+
+    out = method(counted, *args, **kwargs)
+    root = out[1] if len(out) > 1 else np.nan
+    return RootResult(root, out[0], max(nfev[0] - 2, 0), nfev[0])
+
+
+def secantArray(fun, x0, x1, tol=0.5e-03, max_i=None, hybrid=False,
+                masked=False):
+    """The roots of many independent problems.
+
+    Vectorized version of ``secant()``: every element of ``x0`` and ``x1``
+    is an independent problem, and all of them are iterated together until
+    each one has converged or failed.
+
+    Parameters
+    ----------
+    fun : function
+        Vectorized function to find the roots from: ``fun(x)`` returns the
+        array of the values of every problem at the array ``x``. Values that
+        are not finite are treated as not existing.
+    x0, x1 : array
+        Values close to the roots.
+    tol : numeric, *default* 0.5e-3
+        Tolerance for the values of the roots.
+    max_i : int, *optional*
+        Maximum number of itirations before exiting. The default is
+        1 / ``tol``.
+    hybrid : bool, *default* False
+        Whether to strictly use the secant method or use a hybrid of the
+        secante and bisection method.
+    masked : bool, *default* False
+        If ``True``, ``fun`` is only evaluated on the problems that are not
+        finished, as ``fun(x, mask)`` with ``x`` the values of these problems
+        and ``mask`` the boolean array selecting them.
+
+    Returns
+    -------
+    array
+        First value is the array of the exit states of each problem: 0 for
+        successfull, 1 if there is an error with the inputs and -1 if it
+        does not converge.
+        Second value is the array of the root approximations (``nan`` where
+        the exit state is not 0).
+
+    Exemple
+    -------
+    If the function ``fun(x)`` is defined as x**2 - a, with a = [4, 9]::
+
+        >>> secantArray(fun, [1, 1], [3, 4])
+        [array([0, 0]), array([1.99995259, 2.99995538])]
+    """
+    x0, x1 = np.broadcast_arrays(np.asarray(x0, dtype=float),
+                                 np.asarray(x1, dtype=float))
+    x0 = x0.copy()
+    x1 = x1.copy()
+    if max_i is None:
+        max_i = 1/tol
+    status = np.full(x0.shape, -1)
+    roots = np.full(x0.shape, np.nan)
+    everywhere = np.ones(x0.shape, dtype=bool)
+    y0 = _evaluate(fun, x0, everywhere, masked)
+    y1 = _evaluate(fun, x1, everywhere, masked)
+    # Checks that the inputs x0 and x1 have different values (within a
+    # certain tolerance) and that fun(x0) and fun(x1) exist.
+    status[(np.abs(x0 - x1) <= tol) | ~np.isfinite(y0) | ~np.isfinite(y1)] = 1
+    active = status == -1
+    i = 0
+    while True:
+        # Problems whose approximation is almost equal to zero.
+        done = active & (np.abs(y1) < tol)
+        status[done] = 0
+        roots[done] = x1[done]
+        active &= ~done
+        if not active.any():
+            break
+        # We stop the problems that reach the maximum number of itirations.
+        i += 1
+        if i > max_i:
+            break
+        num = y1 * (x1 - x0)
+        den = y1 - y0
+        # num == 0: x0 and x1 have the same value, the problem does not
+        # converge. den == 0: the secant is horizontal, the problem does not
+        # converge unless the bisection method is used.
+        stop = active & ((num == 0) | ((den == 0) & (not hybrid)))
+        active &= ~stop
+        xi = x1.copy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xi[active] = np.where(den[active] == 0,
+                                  (x0[active] + x1[active])/2,
+                                  x1[active] - num[active]/den[active])
+        # We swap the values around.
+        x0[active] = x1[active]
+        y0[active] = y1[active]
+        x1[active] = xi[active]
+        if not active.any():
+            break
+        y1[active] = _evaluate(fun, x1, active, masked)
+        # We check that fun(xi) exists.
+        active &= np.isfinite(y1)
+    return [status, roots]
+
+
+def bisectionArray(fun, x0, x1, tol=0.5e-03, masked=False):
+    """The roots of many independent problems.
+
+    Vectorized version of ``bisection()``: every element of ``x0`` and
+    ``x1`` is an independent problem, and all of them are iterated together
+    until each one has done the number of itirations it needs.
+
+    Parameters
+    ----------
+    fun : function
+        Vectorized function to find the roots from: ``fun(x)`` returns the
+        array of the values of every problem at the array ``x``. Values that
+        are not finite are treated as not existing.
+    x0, x1 : array
+        Values around the roots. ``fun(x0)`` and ``fun(x1)`` must have
+        different signs.
+    tol : numeric, *default* 0.5e-3
+        Tolerance for the values of the roots.
+    masked : bool, *default* False
+        If ``True``, ``fun`` is only evaluated on the problems that are not
+        finished, as ``fun(x, mask)`` with ``x`` the values of these problems
+        and ``mask`` the boolean array selecting them.
+
+    Returns
+    -------
+    array
+        First value is the array of the exit states of each problem: 0 for
+        successfull, 1 if there is an error with the inputs and -1 if
+        ``fun`` does not exist at one of the approximations.
+        Second value is the array of the root approximations (``nan`` where
+        the exit state is not 0).
+
+    Exemple
+    -------
+    If the function ``fun(x)`` is defined as x**2 - a, with a = [4, 9]::
+
+        >>> bisectionArray(fun, [1, 1], [3, 4])
+        [array([0, 0]), array([2.00048828, 2.99987793])]
+    """
+    x0, x1 = np.broadcast_arrays(np.asarray(x0, dtype=float),
+                                 np.asarray(x1, dtype=float))
+    x0 = x0.copy()
+    x1 = x1.copy()
+    status = np.full(x0.shape, 1)
+    roots = np.full(x0.shape, np.nan)
+    everywhere = np.ones(x0.shape, dtype=bool)
+    y0 = _evaluate(fun, x0, everywhere, masked)
+    y1 = _evaluate(fun, x1, everywhere, masked)
+    # Checks that fun(x0) and fun(x1) exist.
+    valid = np.isfinite(y0) & np.isfinite(y1)
+    # Checks if y0 or y1 is the solution within a certain tolerance.
+    for x, y in ((x1, y1), (x0, y0)):
+        found = valid & (np.abs(y) < tol)
+        status[found] = 0
+        roots[found] = x[found]
+    # Checks that y0 and y1 have a different sign (to satisfy the requirements
+    # of the method).
+    active = valid & (status == 1) & (y0 * y1 < 0)
+    # Makes sure that y0 is the negative value.
+    swap = active & (y0 > y1)
+    x0[swap], x1[swap] = x1[swap], x0[swap]
+    # Number of itirations needed by each problem to find an approximation
+    # good enough (to a tolerance). Formula from the cours.
+    k = np.zeros(x0.shape, dtype=int)
+    with np.errstate(divide='ignore'):
+        k[active] = np.ceil(np.log2(np.abs(x1 - x0)[active]/(2*tol))) + 1
+    k = np.maximum(k, 1)
+    status[active] = 0
+    xi = (x0 + x1)/2
+    i = 0
+    while active.any():
+        # Calculates the next approximation of the roots.
+        xi[active] = (x0[active] + x1[active])/2
+        yi = np.zeros(x0.shape)
+        yi[active] = _evaluate(fun, xi, active, masked)
+        # Checks that fun(xi) exists.
+        missing = active & ~np.isfinite(yi)
+        status[missing] = -1
+        active &= ~missing
+        # If yi is positif, then replace the previous positive value (x1).
+        # Else, replace the previous negative value (x0).
+        positive = active & (yi > 0)
+        x1[positive] = xi[positive]
+        negative = active & (yi <= 0)
+        x0[negative] = xi[negative]
+        i += 1
+        active &= i < k
+    roots[status == 0] = np.where(np.isnan(roots), xi, roots)[status == 0]
+    return [status, roots]
+
+
+def _evaluate(fun, x, mask, masked):
+    # Values of a vectorized function on the problems selected by mask.
+    with np.errstate(all='ignore'):
+        if masked:
+            return np.asarray(fun(x[mask], mask), dtype=float)
+        return np.asarray(fun(x), dtype=float)[mask]
+
+
+def denseRoots(sol, fun, x0=None, x1=None, tol=1e-10, n=8):
+    """The roots of a function along a dense solution.
+
+    Finds every root of ``fun(z, y(z))`` along the dense interpolant ``y``
+    of a solution of ``solve_ivp`` (see ``calculConcentrationsIVP(...,
+    full_output=True)``), without solving the differential equation again.
+    The sign changes are looked for on ``n`` points per step of the solver
+    and then refined all together with ``bisectionArray()``.
+
+    Parameters
+    ----------
+    sol : OdeSolution or OdeResult
+        Dense interpolant (``sol.sol``) or the result of ``solve_ivp``.
+    fun : function
+        Function ``fun(z, y)`` of the positions, shape(m), and of the
+        states, shape(8, m), for example an event of ``threshold()``.
+    x0, x1 : numeric, *optional*
+        Interval in which to look for the roots. The default is the whole
+        solution.
+    tol : numeric, *default* 1e-10
+        Tolerance for the values of the roots.
+    n : int, *default* 8
+        Number of points per step of the solver.
+
+    Returns
+    -------
+    array
+        First value is the array of the exit states of each root (see
+        ``bisectionArray()``).
+        Second value is the array of the root approximations, in
+        increasing order. Both are empty if ``fun`` has no root.
+    """
+    if hasattr(sol, 'sol'):
+        sol = sol.sol
+    ts = np.sort(np.asarray(sol.ts, dtype=float))
+    x0 = ts[0] if x0 is None else x0
+    x1 = ts[-1] if x1 is None else x1
+    # Points on which to look for the sign changes.
+    ts = ts[(ts > x0) & (ts < x1)]
+    ts = np.concatenate([[x0], ts, [x1]])
+    z = np.concatenate([np.linspace(a, b, n, endpoint=False)
+                        for a, b in zip(ts[:-1], ts[1:])] + [[x1]])
+
+    def values(z):
+        return np.asarray(fun(z, sol(z)), dtype=float)
+
+    y = values(z)
+    # Exact zeros on the points and brackets of the sign changes.
+    zeros = z[y == 0]
+    change = np.nonzero(y[:-1] * y[1:] < 0)[0]
+    if change.size == 0:
+        # No bracket to refine (bisectionArray() needs at least one).
+        return [np.zeros(zeros.size, dtype=int), zeros]
+    status, roots = bisectionArray(values, z[change], z[change + 1], tol)
+    order = np.argsort(np.concatenate([zeros, roots]))
+    return [np.concatenate([np.zeros(zeros.size, dtype=int), status])[order],
+            np.concatenate([zeros, roots])[order]]
@@ -0,0 +1,227 @@
+"""Module for the sensitivity of the reactor to its parameters.
+
+This module contains the forward sensitivity analysis of the reactor model:
+the derivatives S = dC/dp of the state with respect to some parameters
+(see ``constants.Parameters``) are integrated together with the state, in a
+single solution of the augmented system
+
+    dC/dz = f(C, p)
+    dS/dz = J(C, p) S + df/dp(C, p)
+
+``J`` being the analytic Jacobian ``odefunction.jacobian``, and ``df/dp``
+being computed by central differences, all of the parameters at once with a
+batch of parameters.
+
++---------------------+------------------------------------------------------+
+| function            | description                                          |
++=====================+======================================================+
+| ``sensitivity()``   | Returns the states and their sensitivities along z.  |
++---------------------+------------------------------------------------------+
+| ``expand()``        | Returns the names and values of the parameters of    |
+|                     | the columns of the sensitivities.                    |
++---------------------+------------------------------------------------------+
+| ``relative()``      | Returns the relative sensitivities, d ln(C) / d      |
+|                     | ln(p).                                               |
++---------------------+------------------------------------------------------+
+
+Exemple
+-------
+::
+
+    >>> x, y, S = sensitivity([0, 0.29], y0, ['TW', 'u_g', 'vit_E'])
+    >>> S[2, :, -1]    # d C_H2 / dp at the outlet, for TW, u_g, vit_E[0],
+    ...                # vit_E[1] and vit_E[2]
+
+Credits
+-------
+Created on Sun Oct 18 05:07:29 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import warnings
+
+# Third-party librairy imports.
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import csr_matrix
+
+# Local module imports
+import constants as c
+from odefunction import odefunction, jacobian
+from SimReacteur import Solution
+
+
+# %% [1] Main Code
+def expand(names, p=None):
+    """Parameters of the columns of the sensitivities.
+
+    Parameters
+    ----------
+    names : list
+        Names of the parameters (see ``constants.Parameters``). The name of
+        a vector (``vit_E``, ...) stands for all of its values, a single
+        value is given with its index (``vit_E[0]``).
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+
+    Returns
+    -------
+    array
+        First value is the list of the names of the columns, ``name`` or
+        ``name[i]``.
+        Second value is the array of their values.
+        Returns ``None`` if an incorrect name is passed through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    labels = []
+    values = []
+    for name in names:
+        base, _, index = str(name).partition('[')
+        if base not in c.Parameters.INPUTS:
+            print("Error: value for '" + str(name) + "' not found in "
+                  "Parameters.")
+            return None
+        value = np.asarray(getattr(p, base), dtype=float)
+        if index:
+            i = int(index.rstrip(']'))
+            labels.append(base + '[' + str(i) + ']')
+            values.append(value[i])
+        elif value.ndim:
+            labels += [base + '[' + str(i) + ']' for i in range(value.size)]
+            values += list(value)
+        else:
+            labels.append(base)
+            values.append(float(value))
+    return [labels, np.array(values, dtype=float)]
+
+
+def sensitivity(x_int, y0, names, p=None, method='RK45', rtol=0.5e-6,
+                atol=1e-6, **kwargs):
+    """States and their sensitivities to parameters along the reactor.
+
+    Parameters
+    ----------
+    x_int : array, shape(2)
+        Interval of integration.
+    y0 : array, shape(8)
+        Initial state (which does not depend on the parameters).
+    names : list
+        Names of the parameters, see ``expand()``.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    method : string, *default* ``RK45``
+        Method of ``solve_ivp``. ``Radau`` and ``BDF`` are given the
+        sparsity of the Jacobian of the augmented system.
+    rtol, atol : numeric, *default* 0.5e-6 and 1e-6
+        Tolerances, on the states and on the sensitivities.
+    **kwargs : dict, *optional*
+        Extra parameters of ``solve_ivp`` (``t_eval``, ...).
+
+    Returns
+    -------
+    Solution
+        Returns the solution (without dense interpolant, see
+        ``SimReacteur.Solution``), which unpacks as: first value the array
+        of the positions, second value the array of the states, shape(8,
+        n), third value the array of the sensitivities, shape(8, np, n),
+        ``S[i, k, m]`` being the derivative of ``C[i]`` with respect to the
+        k-th parameter of ``expand(names)`` at the m-th position.
+        Returns ``None`` if an incorrect name is passed through, or, with a
+        ``RuntimeWarning``, if the equations are not defined at ``y0`` or
+        if the integration fails.
+    """
+    if p is None:
+        p = c.DEFAULT
+    expanded = expand(names, p)
+    if expanded is None:
+        return None
+    labels, values = expanded
+    n = len(labels)
+    # Batch of 2n parameter sets, the parameter k being increased in the
+    # column k and decreased in the column n + k.
+    h = np.finfo(float).eps**(1/3) * np.maximum(np.abs(values), 1e-8)
+    overrides = {}
+    for k, label in enumerate(labels):
+        base, _, index = label.partition('[')
+        if base not in overrides:
+            value = np.asarray(getattr(p, base), dtype=float)
+            overrides[base] = np.repeat(value[..., None], 2*n, axis=-1)
+        column = overrides[base][int(index.rstrip(']'))] if index else (
+            overrides[base])
+        column[k] += h[k]
+        column[n + k] -= h[k]
+    batch = p.replace(**overrides)
+
+    def fun(z, u):
+        C = u[:8]
+        S = u[8:].reshape(8, n)
+        f = odefunction(z, C, p)
+        F = odefunction(z, np.repeat(C[:, None], 2*n, axis=1), batch)
+        dfdp = (F[:, :n] - F[:, n:]) / (2*h)
+        return np.concatenate([f, (jacobian(z, C, p) @ S + dfdp).ravel()])
+
+    if method in ('Radau', 'BDF'):
+        # Sparsity of the Jacobian of the augmented system: the states only
+        # depend on the states, and every column of S on the states and on
+        # itself (S is stored by rows, S[i, k] being u[8 + i*n + k]).
+        pattern = np.zeros((8 + 8*n, 8 + 8*n), dtype=bool)
+        pattern[:, :8] = True
+        i, j, k = np.meshgrid(np.arange(8), np.arange(8), np.arange(n),
+                              indexing='ij')
+        pattern[8 + i*n + k, 8 + j*n + k] = True
+        kwargs.setdefault('jac_sparsity', csr_matrix(pattern))
+
+    u0 = np.concatenate([np.asarray(y0, dtype=float), np.zeros(8*n)])
+    # A state at which the equations are not defined (no H2 for example)
+    # would make the solver reduce its step endlessly.
+    with np.errstate(all='ignore'):
+        defined = np.all(np.isfinite(fun(x_int[0], u0)))
+    if not defined:
+        warnings.warn("odefunction is not defined at y0 in sensitivity().",
+                      RuntimeWarning, stacklevel=2)
+        return None
+    sol = solve_ivp(fun, x_int, u0, method=method, rtol=rtol, atol=atol,
+                    **kwargs)
+    if sol.status < 0:
+        # The results would stop where the solver failed.
+        warnings.warn("the integration failed in sensitivity() at z = "
+                      + str(sol.t[-1]) + ": " + sol.message, RuntimeWarning,
+                      stacklevel=2)
+        return None
+    return Solution(sol.t, sol.y[:8], p=p,
+                    extra=(sol.y[8:].reshape(8, n, -1),))
+
+
+def relative(y, S, names, p=None):
+    """Relative sensitivities.
+
+    Parameters
+    ----------
+    y : array, shape(8, ...)
+        States.
+    S : array, shape(8, np, ...)
+        Sensitivities, see ``sensitivity()``.
+    names : list
+        Names of the parameters, see ``expand()``.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+
+    Returns
+    -------
+    array, shape(8, np, ...)
+        Returns ``d ln(C) / d ln(p) = S * p / C``, the relative change of
+        the states for a relative change of the parameters (``nan`` where a
+        state is 0).
+    """
+    _, values = expand(names, p)
+    values = values.reshape((-1,) + (1,) * (np.ndim(S) - 2))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return S * values / np.where(y == 0, np.nan, y)[:, None]
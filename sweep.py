@@ -0,0 +1,178 @@
+"""Module to run the reactor model over many sets of parameters.
+
+This module contains the functions needed to run ``calculConcentrationsIVP``
+for a grid or a list of parameter sets (see ``constants.Parameters``) over a
+pool of processes, and to collect the results in a structured array.
+
++--------------+-------------------------------------------------------------+
+| function     | description                                                 |
++==============+=============================================================+
+| ``grid()``   | Returns the list of the parameter sets of a cartesian grid. |
++--------------+-------------------------------------------------------------+
+| ``sweep()``  | Runs the reactor model for every parameter set and returns  |
+|              | the outlet values (and profiles) in a structured array.     |
++--------------+-------------------------------------------------------------+
+
+As the cases are run in other processes, scripts calling ``sweep()`` must
+protect their main code with ``if __name__ == '__main__':``.
+
+Credits
+-------
+Created on Sat Oct 17 09:12:41 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+import constants as c
+from odefunction import odefunction
+from SimReacteur import calculConcentrationsIVP
+
+
+# %% [1] Main Code
+def grid(**values):
+    """Parameter sets of a cartesian grid.
+
+    Parameters
+    ----------
+    **values : dict
+        Values to take by each parameter, for example ``grid(TW=[900,
+        1000], u_g=[1, 2])``. The names are the ones of
+        ``constants.Parameters`` and ``y0``.
+
+    Returns
+    -------
+    list
+        Returns the list of the dicts of every combination of the values.
+    """
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values.values())]
+
+
+def sweep(cases, x_int=None, y0=None, z=None, max_workers=None,
+          chunksize=None, **kwargs):
+    """Reactor model run for many parameter sets.
+
+    Parameters
+    ----------
+    cases : list
+        List of dicts of the parameters of each case (see ``grid()``). The
+        keys are the names of ``constants.Parameters`` and ``y0`` for the
+        initial state of the case.
+    x_int : array, shape(2), *optional*
+        Interval of integration. The default is the length of the reactor.
+    y0 : array, shape(8), *optional*
+        Initial state of the cases that do not give one.
+    z : array, *optional*
+        Positions at which to record the profiles. If not given, only the
+        outlet values are recorded.
+    max_workers : int, *optional*
+        Number of processes. The default is the number of CPUs; with 1 the
+        cases are run in this process.
+    chunksize : int, *optional*
+        Number of cases sent to a process at a time. The default splits the
+        cases in about 4 chunks per process.
+    **kwargs : dict, *optional*
+        Extra parameters of ``calculConcentrationsIVP()`` (``method``,
+        ``rtol``, ...).
+
+    Returns
+    -------
+    array
+        Returns a structured array with one element per case, with fields:
+        one per parameter of the cases, ``y0``, ``status`` (0 for
+        successfull, 1 if the case failed), ``message`` (the error of a
+        failed case), ``outlet`` (the state at ``x_int[1]``, shape(8)) and,
+        if ``z`` is given, ``profile`` (the states at ``z``, shape(8, nz)).
+        The values of a failed case are ``nan``.
+    """
+    cases = [dict(case) for case in cases]
+    if x_int is None:
+        x_int = [0, c.DEFAULT.length]
+    if y0 is not None:
+        for case in cases:
+            case.setdefault('y0', y0)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(cases) // (4 * max_workers))
+    jobs = [(case, x_int, z, kwargs) for case in cases]
+    if max_workers == 1:
+        results = list(map(_run, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_run, jobs, chunksize=chunksize))
+
+    # Structured array of the results.
+    names = sorted({name for case in cases for name in case} - {'y0'})
+    dtype = [(name, float if all(isinstance(case.get(name, np.nan),
+                                            (int, float, np.number))
+                                 for case in cases) else 'O')
+             for name in names]
+    dtype += [('y0', float, (8,)), ('status', np.int8), ('message', 'U200'),
+              ('outlet', float, (8,))]
+    if z is not None:
+        dtype.append(('profile', float, (8, len(z))))
+    out = np.zeros(len(cases), dtype=dtype)
+    for i, (case, result) in enumerate(zip(cases, results)):
+        for name in names:
+            out[name][i] = case.get(name, np.nan)
+        out['status'][i], out['message'][i] = result[:2]
+        out['y0'][i] = result[4]
+        out['outlet'][i] = result[2]
+        if z is not None:
+            out['profile'][i] = result[3]
+    return out
+
+
+def _run(job):
+    # Runs a single case, in a process of the pool. Returns [status, message,
+    # outlet, profile, y0], the errors being caught so that a failed case
+    # does not stop the others (its y0 is nan if it is missing or invalid).
+    case, x_int, z, kwargs = job
+    case = dict(case)
+    # Only the outlet and the positions z are needed, not the interpolant.
+    kwargs = dict({'dense_output': False}, **kwargs)
+    nz = 0 if z is None else len(z)
+    y0 = np.full(8, np.nan)
+    try:
+        if 'y0' not in case:
+            raise KeyError('the case has no y0.')
+        value = np.asarray(case.pop('y0'), dtype=float)
+        if value.shape != (8,):
+            raise ValueError('y0 of shape ' + str(value.shape)
+                             + ' instead of (8,).')
+        y0 = value
+        p = c.Parameters(**case)
+        # A state at which the equations are not defined (no H2 for example)
+        # would make the solver reduce its step endlessly.
+        with np.errstate(all='ignore'):
+            if not np.all(np.isfinite(odefunction(x_int[0], y0, p))):
+                raise ValueError('odefunction is not defined at y0.')
+        if z is None:
+            x, y = calculConcentrationsIVP(x_int, y0, p=p, **kwargs)
+            profile = None
+        else:
+            # The outlet is added to the positions of the profile.
+            t_eval = np.union1d(z, x_int[1])
+            x, y = calculConcentrationsIVP(x_int, y0, p=p, t_eval=t_eval,
+                                           **kwargs)
+            profile = y[:, np.searchsorted(x, z)]
+        if x[-1] != x_int[1] or not np.all(np.isfinite(y[:, -1])):
+            raise ArithmeticError('the integration stopped at z = '
+                                  + str(x[-1]) + '.')
+        return [0, '', y[:, -1], profile, y0]
+    except Exception as error:
+        return [1, type(error).__name__ + ': ' + str(error),
+                np.full(8, np.nan), np.full((8, nz), np.nan), y0]
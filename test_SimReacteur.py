@@ -0,0 +1,45 @@
+"""Tests of the integrators of the reactor.
+
+Credits
+-------
+Created on Sun Oct 18 05:46:10 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+from SimReacteur import calculConcentrationsImplicit, calculConcentrationsIVP
+
+
+# %% [1] Main Code
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+
+
+def test_implicit_outlet():
+    x, y, stats = calculConcentrationsImplicit([0, 0.29], Y0, 1e-3)
+    reference = calculConcentrationsIVP([0, 0.29], Y0, rtol=1e-10)
+    np.testing.assert_allclose(y[:, -1], reference(x[-1]), rtol=2e-2)
+    assert stats['failures'] == 0
+    assert stats['histogram'].sum() == stats['steps'] == x.size - 1
+    assert stats['iterations'] == (
+        np.arange(stats['histogram'].size) @ stats['histogram'])
+
+
+def test_implicit_singular_jacobian():
+    # Newton's matrix I - beta J is zero on the first step (backward Euler).
+    def jac(x, y, p):
+        return np.eye(8) / 1e-3
+
+    x, y, stats = calculConcentrationsImplicit([0, 0.01], Y0, 1e-3,
+                                               method='euler', jac=jac)
+    assert stats['failures'] == stats['steps']
+    assert np.all(np.isfinite(y))
+
+
+def test_implicit_max_i():
+    assert calculConcentrationsImplicit([0, 0.01], Y0, 1e-3, max_i=0) is None
@@ -0,0 +1,52 @@
+"""Tests of the checkpoints of long integrations.
+
+Credits
+-------
+Created on Sun Oct 18 05:47:48 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+import pytest
+
+# Local module imports
+import checkpoint
+import SimReacteur
+
+
+# %% [1] Main Code
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+
+
+def test_fixed_step_resume(tmp_path, monkeypatch):
+    path = str(tmp_path / 'run.ckpt')
+    args = dict(step=1e-6, every=3, interval=0, segment=100)
+    full = checkpoint.fixedStep([0, 0.002], Y0, path, **args)
+    assert not list(tmp_path.iterdir())
+
+    # Interrupted after 7 segments, each one checkpointed.
+    march = SimReacteur._march
+    calls = []
+
+    def interrupted(*args, **kwargs):
+        calls.append(None)
+        if len(calls) == 8:
+            raise KeyboardInterrupt
+        return march(*args, **kwargs)
+
+    monkeypatch.setattr(SimReacteur, '_march', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        checkpoint.fixedStep([0, 0.002], Y0, path, **args)
+    monkeypatch.setattr(SimReacteur, '_march', march)
+    # The recorded points are in the chunk files, not in the checkpoint.
+    assert len(list(tmp_path.glob('run.ckpt.*.npz'))) == 7
+    assert (tmp_path / 'run.ckpt').stat().st_size < 2000
+
+    resumed = checkpoint.resume(path)
+    np.testing.assert_array_equal(resumed.x, full.x)
+    np.testing.assert_array_equal(resumed.y, full.y)
+    assert not list(tmp_path.iterdir())
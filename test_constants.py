@@ -0,0 +1,45 @@
+"""Tests of the parameters of the reactor.
+
+Credits
+-------
+Created on Sun Oct 18 05:45:12 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# First-party imports
+import pickle
+
+# Third-party librairy imports.
+import numpy as np
+import pytest
+
+# Local module imports
+import constants as c
+
+
+# %% [1] Main Code
+@pytest.mark.parametrize('rtol', [1e-4, 1e-7])
+def test_table_accuracy(rtol):
+    p = c.DEFAULT.tabulate(800, 1100, rtol)
+    T = np.random.default_rng(0).uniform(800, 1100, 10000)
+    exact = c.Parameters().coefficients(T)
+    for approx, value in zip(p.coefficients(T), exact):
+        np.testing.assert_allclose(approx, value, rtol=rtol, atol=0)
+
+
+def test_table_outside_range():
+    p = c.DEFAULT.tabulate(800, 1100)
+    T = np.array([700.0, 1200.0])
+    exact = c.Parameters().coefficients(T)
+    for approx, value in zip(p.coefficients(T), exact):
+        np.testing.assert_array_equal(approx, value)
+
+
+def test_table_kept():
+    p = c.DEFAULT.tabulate(850, 1000, 1e-5)
+    assert pickle.loads(pickle.dumps(p)).table == (850, 1000, 1e-5)
+    assert p.replace(TW=1000).table == (850, 1000, 1e-5)
+    assert c.DEFAULT.table is None
@@ -0,0 +1,46 @@
+"""Tests of the estimation of the constants from measured profiles.
+
+Credits
+-------
+Created on Sun Oct 18 05:43:12 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+import pytest
+
+# Local module imports
+import constants as c
+from estimation import fit
+from SimReacteur import calculConcentrationsIVP
+
+
+# %% [1] Main Code
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+Z = np.linspace(0.02, 0.29, 8)
+
+
+def _data(p):
+    x, y = calculConcentrationsIVP([0, Z[-1]], Y0, p=p, rtol=1e-10,
+                                   atol=1e-12, t_eval=Z)
+    return y[[2, 6]]
+
+
+def test_recovers_constant():
+    true = c.DEFAULT.replace(M_k=1.1 * c.DEFAULT.M_k)
+    out = fit(Z, _data(true), ['M_k'], Y0, states=[2, 6])
+    assert out['success']
+    np.testing.assert_allclose(out['values'], [true.M_k], rtol=1e-4)
+
+
+def test_initial_guess_fails():
+    # No H2 at the inlet: the equations are not defined at y0.
+    y0 = Y0.copy()
+    y0[2] = 0
+    with pytest.warns(RuntimeWarning):
+        out = fit(Z, _data(c.DEFAULT), ['M_k'], y0, states=[2, 6])
+    assert out is None
@@ -0,0 +1,52 @@
+"""Tests of the Monte Carlo propagation of the constants' uncertainty.
+
+Credits
+-------
+Created on Sun Oct 18 05:42:26 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+import constants as c
+import montecarlo
+from montecarlo import kinetic, monteCarlo
+
+
+# %% [1] Main Code
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+
+
+def test_sampled_override():
+    # A constant overridden in p and sampled around its new value.
+    p = c.DEFAULT.replace(vit_A=1.5 * np.asarray(c.DEFAULT.vit_A))
+    out = monteCarlo(Y0, kinetic(names=['vit_A']), n=8, p=p, seed=0,
+                     chunk=4, max_workers=1)
+    assert not out['failed'].any()
+    ratio = out['samples']['vit_A'] / np.asarray(p.vit_A)[:, None]
+    assert np.all(np.abs(np.log(ratio)) < 1)
+
+
+def test_sampled_override_one_by_one(monkeypatch):
+    # The same, with the chunks failing so that the samples are integrated
+    # one by one.
+    monkeypatch.setattr(montecarlo, '_solve', lambda *args: np.nan)
+    p = c.DEFAULT.replace(vit_A=1.5 * np.asarray(c.DEFAULT.vit_A))
+    out = monteCarlo(Y0, kinetic(names=['vit_A']), n=4, p=p, seed=0,
+                     max_workers=1)
+    assert not out['failed'].any()
+    assert np.all(np.isfinite(out['quantiles']))
+
+
+def test_every_sample_failed(monkeypatch):
+    monkeypatch.setattr(montecarlo, '_solve', lambda *args: np.nan)
+    out = monteCarlo(Y0, kinetic(), n=4, seed=0, max_workers=1, max_steps=3)
+    assert out['failed'].all()
+    assert out['quantiles'].shape == (5, 8)
+    assert np.all(np.isnan(out['quantiles']))
+    assert np.all(np.isnan(out['mean']))
@@ -0,0 +1,49 @@
+"""Tests of the differential equation and of its Jacobian.
+
+Credits
+-------
+Created on Sun Oct 18 05:48:52 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+from odefunction import jacobian, odefunction
+
+
+# %% [1] Main Code
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+# A state further along the reactor, with some conversion of the sorbent.
+Y1 = np.array([0.17, 0.54, 0.11, 0.004, 0.038, 0.002, 800.0, 2.9])
+
+
+def _central(C):
+    # Jacobian of odefunction by central differences, shape(8, 8).
+    J = np.empty((8, 8))
+    for j in range(8):
+        h = 1e-6 * max(abs(C[j]), 1e-3)
+        dC = np.zeros(8)
+        dC[j] = h
+        J[:, j] = (odefunction(0, C + dC) - odefunction(0, C - dC)) / (2*h)
+    return J
+
+
+def test_jacobian_single():
+    for C in (Y0, Y1):
+        J = jacobian(0, C)
+        scale = np.abs(J).max(axis=1, keepdims=True)
+        np.testing.assert_allclose(J / scale, _central(C) / scale,
+                                   atol=1e-6)
+
+
+def test_jacobian_batch():
+    C = np.stack([Y0, Y1], axis=1)
+    J = jacobian(0, C)
+    assert J.shape == (8, 8, 2)
+    np.testing.assert_allclose(J[..., 0], jacobian(0, Y0), rtol=1e-12)
+    np.testing.assert_allclose(J[..., 1], jacobian(0, Y1), rtol=1e-12)
@@ -0,0 +1,66 @@
+"""Tests of the agreement of the numpy and numba backends.
+
+The compiled functions of ``odejit.py`` must give the same results as the
+numpy ones of ``odefunction.py`` and ``SimReacteur.py``, to the accuracy of
+floating point arithmetic. The tests are skipped if Numba is not installed.
+
+Credits
+-------
+Created on Sun Oct 18 05:31:37 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+import pytest
+
+# Local module imports
+import constants as c
+import odejit
+from odefunction import odefunction
+from SimReacteur import (calculConcentrationsEuler, calculConcentrationsIVP,
+                         calculConcentrationsRK4)
+
+
+# %% [1] Main Code
+pytestmark = pytest.mark.skipif(not odejit.AVAILABLE,
+                                reason='Numba is not installed.')
+
+Y0 = np.array([0.2, 0.6, 0.01, 0.01, 0.01, 0, 973.15, 3.0])
+
+
+def test_odefunction_single():
+    np.testing.assert_allclose(odejit.odefunction(0, Y0), odefunction(0, Y0),
+                               rtol=1e-12)
+
+
+def test_odefunction_batch():
+    Y = Y0[:, None] * np.linspace(0.9, 1.1, 50)
+    np.testing.assert_allclose(odejit.odefunction(0, Y), odefunction(0, Y),
+                               rtol=1e-12)
+
+
+@pytest.mark.parametrize('integrator, step', [
+    (calculConcentrationsEuler, 1e-6), (calculConcentrationsRK4, 1e-5)])
+def test_fixed_step(integrator, step):
+    x, y = integrator([0, 0.01], Y0, step, every=7)
+    xj, yj = integrator([0, 0.01], Y0, step, every=7, chunk=50,
+                        backend='numba')
+    np.testing.assert_array_equal(xj, x)
+    np.testing.assert_allclose(yj, y, rtol=1e-10)
+
+
+def test_ivp_outlet():
+    sol = calculConcentrationsIVP([0, 0.29], Y0)
+    solj = calculConcentrationsIVP([0, 0.29], Y0, backend='numba')
+    np.testing.assert_allclose(solj.outlet, sol.outlet, rtol=1e-8)
+
+
+def test_pack_batch():
+    # The compiled functions only take the parameters of a single reactor.
+    p = c.DEFAULT.replace(TW=np.array([950.0, 1000.0]))
+    with pytest.raises(ValueError):
+        odejit.pack(p)
@@ -0,0 +1,138 @@
+"""Tests of the root finding methods.
+
+Credits
+-------
+Created on Sun Oct 18 05:49:00 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+
+# Local module imports
+from root import Memoize, brent
+
+
+# %% [1] Main Code
+def _fun(x):
+    return x**2 - 4
+
+
+def test_brent_root():
+    result = brent(_fun, 1, 3, tol=1e-10)
+    assert result.converged
+    assert abs(result.root - 2) <= 1e-10
+    assert result.nfev == result.iterations + 2
+
+
+def test_brent_fewer_evaluations():
+    # The bisection would need 40 evaluations for this tolerance.
+    calls = []
+
+    def fun(x):
+        calls.append(x)
+        return np.cos(x) - x
+
+    result = brent(fun, 0, 1, tol=1e-12)
+    assert result.converged
+    assert abs(np.cos(result.root) - result.root) < 1e-11
+    assert result.nfev == len(calls) < 20
+
+
+def test_brent_no_sign_change():
+    result = brent(_fun, 3, 5)
+    assert result.status == 1
+    assert np.isnan(result.root)
+    assert result.message
+
+
+def test_brent_max_i():
+    result = brent(_fun, 1, 3, tol=1e-15, max_i=2)
+    assert result.status == -1
+    assert result.iterations == 2
+
+
+def test_brent_root_at_bound():
+    result = brent(_fun, 2, 5)
+    assert result.converged
+    assert result.root == 2
+    assert result.iterations == 0
+
+
+def _counted(calls):
+    # x**2 - 4, recording its evaluations.
+    def fun(x):
+        calls.append(x)
+        return _fun(x)
+    return fun
+
+
+def test_memoize_hits_misses():
+    calls = []
+    f = Memoize(_counted(calls))
+    assert f(3.0) == 5 and f(3.0) == 5 and f(1.0) == -3
+    assert calls == [3.0, 1.0]
+    assert f.stats() == {'hits': 1, 'misses': 2, 'size': 2,
+                         'maxsize': 1024}
+
+
+def test_memoize_restart():
+    # A second run on the same function evaluates nothing new.
+    calls = []
+    f = Memoize(_counted(calls))
+    first = brent(f, 1, 3, tol=1e-10)
+    n = len(calls)
+    second = brent(f, 1, 3, tol=1e-10)
+    assert second.root == first.root
+    assert len(calls) == n
+    assert f.hits == second.nfev
+
+
+def test_memoize_xtol_maxsize():
+    calls = []
+    f = Memoize(_counted(calls), xtol=1e-6, maxsize=2)
+    f(1.0)
+    f(1.0 + 1e-8)
+    assert len(calls) == 1
+    f(2.0)
+    f(3.0)
+    # 1.0 is the least recently used value, removed first.
+    f(1.0)
+    assert len(calls) == 4
+    assert f.stats()['size'] == 2
+
+
+def test_memoize_errors():
+    # fun(x) raising ZeroDivisionError is remembered as well.
+    calls = []
+
+    def fun(x):
+        calls.append(x)
+        return 1 / x
+
+    f = Memoize(fun)
+    for _ in range(2):
+        try:
+            f(0.0)
+        except ZeroDivisionError:
+            pass
+    assert calls == [0.0]
+
+
+def test_memoize_array():
+    calls = []
+
+    def fun(x):
+        calls.append(np.array(x))
+        return _fun(x)
+
+    f = Memoize(fun)
+    np.testing.assert_array_equal(f(np.array([1.0, 2.0])), [-3, 0])
+    np.testing.assert_array_equal(f(np.array([1.0, 2.0])), [-3, 0])
+    assert len(calls) == 1
+    # The same value of x for another problem is another key.
+    f(np.array([2.0, 1.0]))
+    assert len(calls) == 2
@@ -0,0 +1,203 @@
+"""Module for the transient (time-dependent) model of the reactor.
+
+This module contains the dynamic model of the moving bed: every state is
+carried along the reactor with its own velocity and relaxes towards the
+steady equations of ``odefunction``,
+
+    dy/dt = v * (f(y) - dy/dz)
+
+``f`` being ``odefunction`` (unchanged) and ``v`` the velocity of each
+state, the ratio of its flux and of its hold-up in the steady equations:
+``u_g / ep`` for the gas species, ``u_s`` for the conversion of the
+sorbent, the ratio of the heat fluxes and of the heat capacities of the
+bed for the temperature. The pressure is relaxed with the gas (its much
+faster transient is not resolved). At steady state the model is the one of
+``odefunction``.
+
+The reactor is discretised in M cells along z with a first order upwind
+scheme (the gas and the sorbent flow towards z > 0), and the 8 M equations
+are integrated in time with a stiff solver given the sparsity of their
+Jacobian. The inlet and the wall temperature can depend on time (start-up,
+feed switching, ramps of ``TW``).
+
++------------------------------------+---------------------------------------+
+| function                           | description                           |
++====================================+=======================================+
+| ``calculConcentrationsTransient()``| Returns the profiles of the states    |
+|                                    | along the reactor in time.            |
++------------------------------------+---------------------------------------+
+
+Exemple
+-------
+::
+
+    >>> steady = calculConcentrationsIVP([0, 0.29], y0)
+    >>> t, y, z = calculConcentrationsTransient(
+    ...     [0, 60], y0, initial=steady, TW=lambda t: 973.15 + 0.5*t)
+    >>> y[6, -1]    # outlet temperature in time
+
+Credits
+-------
+Created on Sun Oct 18 05:13:31 2026
+
+@author: Lindsey Alexandre S2302371
+@credits: Luca Odding S2303933, Raffaele Moreci S2304531
+"""
+
+# %% [0] Imports
+# Third-party librairy imports.
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import diags, eye, kron
+
+# Local module imports
+import constants as c
+from odefunction import odefunction, rhog
+from SimReacteur import Solution, calculConcentrationsIVP
+
+
+# %% [1] Main Code
+def calculConcentrationsTransient(t_int, inlet, M=100, initial=None, TW=None,
+                                  p=None, method='BDF', rtol=1e-4,
+                                  atol=1e-6, dense_output=False, **kwargs):
+    """Integration in time of the transient model with a solver of
+    solve_ivp.
+
+    Parameters
+    ----------
+    t_int : array, shape(2)
+        Interval of time, in s.
+    inlet : array, shape(8), or function
+        State of the inlet, or a function ``inlet(t)`` returning it.
+    M : int, *default* 100
+        Number of cells along the reactor.
+    initial : Solution, function or array, *optional*
+        Initial profile: a solution of the steady model (see
+        ``SimReacteur.calculConcentrationsIVP()``) or a function of z
+        returning the states, shape(8, M), an array, shape(8, M), or a
+        state, shape(8), the same in every cell. The default is the steady
+        profile of ``calculConcentrationsIVP`` for the inlet at the first
+        time (the steady state of the upwind scheme only differs from it by
+        the error of the discretisation).
+    TW : numeric or function, *optional*
+        Wall temperature, or a function ``TW(t)`` returning it. The default
+        is ``p.TW``.
+    p : Parameters, *optional*
+        Parameters of the reactor (see ``constants.Parameters``). The default
+        is ``constants.DEFAULT``.
+    method : string, *default* ``BDF``
+        Method of ``solve_ivp``. ``Radau`` and ``BDF`` are given the
+        sparsity of the Jacobian.
+    rtol, atol : numeric, *default* 1e-4 and 1e-6
+        Tolerances.
+    dense_output : bool, *default* False
+        Whether the solution keeps the dense interpolant of ``solve_ivp``.
+    **kwargs : dict, *optional*
+        Extra parameters of ``solve_ivp`` (``t_eval``, ``max_step``, ...).
+
+    Returns
+    -------
+    Solution
+        Returns the solution (see ``SimReacteur.Solution``), which unpacks
+        as: first value the array of the times, second value the array of
+        the profiles, shape(8, M + 1, n), ``y[:, k, m]`` being the state at
+        the position ``z[k]`` and the m-th time (``y[:, 0]`` is the inlet),
+        third value the array of the positions, shape(M + 1). Calling it
+        with times returns the profiles at these times.
+        Returns ``None`` if an incorrect initial profile is passed through.
+    """
+    if p is None:
+        p = c.DEFAULT
+    inlet_ = inlet if callable(inlet) else (
+        lambda t, y=np.asarray(inlet, dtype=float): y)
+    z = np.linspace(0, p.length, M + 1)
+    dz = z[1] - z[0]
+    # Parameters at the last wall temperature, so that a constant one does
+    # not build a new set of parameters at each evaluation.
+    last = [None, p]
+
+    def parameters(t):
+        if TW is None:
+            return p
+        value = TW(t) if callable(TW) else TW
+        if value != last[0]:
+            last[0] = value
+            last[1] = p.replace(TW=value)
+        return last[1]
+
+    y0 = _initial(initial, inlet_(t_int[0]), z, parameters(t_int[0]))
+    if y0 is None:
+        return None
+
+    def fun(t, u):
+        # The states are stored cell by cell: u[8*k + i] is the state i at
+        # z[k + 1].
+        q = parameters(t)
+        C = u.reshape(M, 8).T
+        upstream = np.concatenate([np.asarray(inlet_(t), float)[:, None],
+                                   C[:, :-1]], axis=1)
+        return (_velocities(C, q) * (odefunction(z[1:], C, q)
+                                     - (C - upstream) / dz)).T.ravel()
+
+    if method in ('Radau', 'BDF'):
+        # A cell depends on its own states and on the same state upstream.
+        kwargs.setdefault('jac_sparsity', kron(eye(M), np.ones((8, 8)))
+                          + kron(diags([1.0], [-1], shape=(M, M)), eye(8)))
+    sol = solve_ivp(fun, t_int, y0.T.ravel(), method=method, rtol=rtol,
+                    atol=atol, dense_output=dense_output, **kwargs)
+    interpolant = (_Profiles(sol.sol, inlet_, M) if sol.sol is not None
+                   else None)
+    return Solution(sol.t, _profiles(sol.t, sol.y, inlet_, M), interpolant,
+                    p, extra=(z,))
+
+
+def _velocities(C, p):
+    # Velocities at which the states are carried along the reactor, shape(8,
+    # M): the ratio of their fluxes and of their hold-ups in the steady
+    # equations (16), (17), (19) and (20).
+    rhog_ = rhog(C, p)
+    v = np.empty(C.shape)
+    v[:5] = p.u_g / p.ep
+    v[5] = p.u_s
+    v[6] = ((p.ep_s * p.rho_s * p.u_s * p.Cp_s + rhog_ * p.u_g * p.Cp_g)
+            / (p.ep_s * p.rho_s * p.Cp_s + p.ep * rhog_ * p.Cp_g))
+    v[7] = p.u_g / p.ep
+    return v
+
+
+def _initial(initial, inlet, z, p):
+    # Initial profile at the cells z[1:], shape(8, M).
+    M = z.size - 1
+    if initial is None:
+        initial = calculConcentrationsIVP([0, p.length], inlet, p=p)
+    if callable(initial):
+        y0 = np.asarray(initial(z[1:]), dtype=float)
+    else:
+        y0 = np.asarray(initial, dtype=float)
+        if y0.ndim == 1:
+            y0 = np.repeat(y0[:, None], M, axis=1)
+    if y0.shape != (8, M):
+        print("Error: initial profile of shape " + str(y0.shape)
+              + " instead of (8,) or " + str((8, M)) + ".")
+        return None
+    return y0
+
+
+def _profiles(t, u, inlet, M):
+    # Profiles at the times t, shape(8, M + 1, n), with the inlet.
+    y = u.reshape((M, 8) + u.shape[1:]).swapaxes(0, 1)
+    y0 = np.stack([np.asarray(inlet(ti), float) for ti in np.atleast_1d(t)],
+                  axis=-1)
+    return np.concatenate([y0.reshape((8, 1) + y.shape[2:]), y], axis=1)
+
+
+class _Profiles:
+    # Dense interpolant of the profiles, with the inlet.
+    def __init__(self, interpolant, inlet, M):
+        self.interpolant = interpolant
+        self.inlet = inlet
+        self.M = M
+        self.ts = interpolant.ts
+
+    def __call__(self, t):
+        return _profiles(t, self.interpolant(t), self.inlet, self.M)